@@ -0,0 +1,93 @@
+"""
+Stateless JWT authentication.
+
+JWTAuthentication loads the User row on every authenticated request. With
+StatelessJWTAuthentication the request user is a ClaimsUser built from the
+signed claims of the access token (id, is_active, is_admin, see
+accounts.views.get_tokens_for_user), so views filter by `request.user.id`
+instead of a model instance.
+
+Deactivated or deleted accounts are still refused: whether a user id is
+allowed is checked against the database at most once per
+JWT_REVOCATION_CHECK_TTL seconds per process, and forgotten by this process
+as soon as the user is saved or deleted (see accounts/signals.py).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+
+# user id -> (checked at, allowed)
+_checked = {}
+_lock = threading.Lock()
+
+
+class ClaimsUser(TokenUser):
+    """A request user backed by the claims of a validated access token."""
+
+    @cached_property
+    def id(self):
+        # The claim holds the id as a string; keys and lookups expect the int
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def is_admin(self):
+        return self.token.get("is_admin", False)
+
+    @cached_property
+    def is_staff(self):
+        return self.is_admin
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+
+def user_allowed(user_id):
+    """
+    True if `user_id` names an active user, from the in-process revocation
+    cache while its entry is younger than JWT_REVOCATION_CHECK_TTL.
+    """
+    now = time.monotonic()
+    entry = _checked.get(user_id)
+    if entry is not None and now - entry[0] < settings.JWT_REVOCATION_CHECK_TTL:
+        return entry[1]
+    allowed = User.objects.filter(pk=user_id, is_active=True).exists()
+    with _lock:
+        _checked[user_id] = (now, allowed)
+    return allowed
+
+
+def forget_user(user_id):
+    """Drop the revocation entry of `user_id`, checked again on next use."""
+    with _lock:
+        _checked.pop(user_id, None)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication returning a ClaimsUser instead of a User row."""
+
+    def get_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+        try:
+            user_id = user.id
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        if not user.is_active or not user_allowed(user_id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
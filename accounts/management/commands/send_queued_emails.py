@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Send the emails that are due in the outbox (e.g. after a restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        sent, failed = drain_outbox(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Sent {sent} email(s), {failed} failed attempt(s)")
+        )
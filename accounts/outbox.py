@@ -0,0 +1,185 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from accounts.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# Seconds a sender holds the emails it claimed; an interrupted send is
+# picked up again once they are past
+CLAIM_LEASE = 300
+
+_executor = None
+_retry_timer = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EMAIL_OUTBOX_WORKERS,
+                thread_name_prefix="email-outbox",
+            )
+        return _executor
+
+
+def queue_email(subject, body, to_email, from_email=None):
+    """
+    Put an email in the outbox and wake the sender once the current
+    transaction commits. The request never talks to the mail server.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        to_email=to_email,
+        from_email=from_email or "Django App <{}>".format(settings.EMAIL_HOST_USER),
+    )
+    if settings.EMAIL_OUTBOX_WORKERS <= 0:
+        drain_outbox()
+    else:
+        transaction.on_commit(wake_sender)
+    return email
+
+
+def wake_sender():
+    """Have a background thread drain the outbox."""
+    _get_executor().submit(_run_in_worker)
+
+
+def _run_in_worker():
+    close_old_connections()
+    try:
+        drain_outbox()
+        _schedule_retry()
+    except Exception:
+        logger.exception("Email outbox sender failed")
+    finally:
+        close_old_connections()
+
+
+def _schedule_retry():
+    """Wake the sender again when the earliest queued retry is due."""
+    global _retry_timer
+    due = OutboxEmail.objects.filter(status=OutboxEmail.QUEUED).aggregate(
+        due=Min("next_attempt_at")
+    )["due"]
+    if due is None:
+        return
+    delay = max((due - timezone.now()).total_seconds(), 0)
+    with _lock:
+        if _retry_timer is not None:
+            _retry_timer.cancel()
+        _retry_timer = threading.Timer(delay, wake_sender)
+        _retry_timer.daemon = True
+        _retry_timer.start()
+
+
+def _claim_batch(batch_size):
+    """
+    Claim up to `batch_size` due emails by pushing their next attempt past
+    the lease. The update is conditional on the value that was read, so an
+    email is only ever claimed by one sender.
+    """
+    now = timezone.now()
+    due = list(
+        OutboxEmail.objects.filter(
+            status=OutboxEmail.QUEUED, next_attempt_at__lte=now
+        ).values_list("id", "next_attempt_at")[:batch_size]
+    )
+    lease_until = now + timedelta(seconds=CLAIM_LEASE)
+    with transaction.atomic():
+        claimed = [
+            pk
+            for pk, next_attempt_at in due
+            if OutboxEmail.objects.filter(
+                pk=pk, status=OutboxEmail.QUEUED, next_attempt_at=next_attempt_at
+            ).update(next_attempt_at=lease_until)
+        ]
+    return list(OutboxEmail.objects.filter(pk__in=claimed))
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the `attempts`-th failed send: doubled each time."""
+    return settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def _send_batch(emails):
+    """Send claimed emails over one connection. Returns (sent, failed)."""
+    sent, failed = [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning("Could not connect to the mail server: %s", e)
+        return sent, [(email, e) for email in emails]
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=[email.to_email],
+                connection=connection,
+            )
+            try:
+                message.send()
+                sent.append(email)
+            except Exception as e:
+                logger.warning("Failed to send email to %s: %s", email.to_email, e)
+                failed.append((email, e))
+                # The connection may be broken; carry on over a new one
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record(sent, failed):
+    now = timezone.now()
+    OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+        status=OutboxEmail.SENT, sent_at=now, attempts=F("attempts") + 1
+    )
+    for email, error in failed:
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmail.FAILED
+        else:
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+    OutboxEmail.objects.bulk_update(
+        [email for email, _ in failed],
+        ["attempts", "last_error", "status", "next_attempt_at"],
+    )
+
+
+def drain_outbox(batch_size=None):
+    """
+    Send every due email in the outbox, a batch per connection. Returns the
+    number of emails sent and the number of failed attempts.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent_count = failed_count = 0
+    while True:
+        emails = _claim_batch(batch_size)
+        if not emails:
+            break
+        sent, failed = _send_batch(emails)
+        _record(sent, failed)
+        sent_count += len(sent)
+        failed_count += len(failed)
+    return sent_count, failed_count
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from accounts.utils import Util
+from accounts.outbox import queue_email
 from accounts.models import User
 
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -97,12 +97,7 @@ class SendPasswordResetEmailSerializer(serializers.Serializer):
             print("Password Reset Link", link)
             # Send Email
             body = "Click Following Link to Reset Your Password " + link
-            data = {
-                "subject": "Reset Your Password",
-                "body": body,
-                "to_email": user.email,
-            }
-            Util.send_email(data)
+            queue_email("Reset Your Password", body, user.email)
             return attrs
         else:
             raise serializers.ValidationError("User with this email does not exist")
@@ -1,3 +1,186 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from accounts import authentication
+from accounts.authentication import ClaimsUser, StatelessJWTAuthentication
+from accounts import outbox
+from accounts.models import OutboxEmail, User
+from accounts.views import get_tokens_for_user
+from school.models import School
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email="token@example.com", name="Token", tc=True, password="pass"
+        )
+        cls.school = School.objects.create(name="Token School", owner=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        authentication._checked.clear()
+        # Views without their own authentication classes use the stateless one
+        patcher = mock.patch.object(
+            APIView, "authentication_classes", [StatelessJWTAuthentication]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.login(self.owner)
+
+    def login(self, user):
+        access = get_tokens_for_user(user)["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_user_comes_from_claims(self):
+        access = get_tokens_for_user(self.owner)["access"]
+        auth = StatelessJWTAuthentication()
+        user = auth.get_user(auth.get_validated_token(access))
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.owner.id)
+        self.assertTrue(user.is_active)
+        self.assertFalse(user.is_staff)
+
+    def test_read_endpoints_need_no_authentication_query(self):
+        first = self.client.get("/schools/list/")
+        self.assertEqual(first.status_code, 200)
+        self.client.get(f"/exams/terms/{self.school.id}/")
+        with self.assertNumQueries(0):
+            again = self.client.get("/schools/list/")
+            terms = self.client.get(f"/exams/terms/{self.school.id}/")
+        self.assertEqual(first.data, again.data)
+        self.assertEqual(terms.status_code, 200)
+
+    def test_writes_use_the_user_id(self):
+        response = self.client.post(
+            "/schools/create/", {"name": "Claims School"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["school"]["owner"], self.owner.id)
+        self.assertEqual(len(self.client.get("/schools/list/").data["schools"]), 2)
+
+    def test_deactivated_user_is_refused(self):
+        self.assertEqual(self.client.get("/schools/list/").status_code, 200)
+        self.owner.is_active = False
+        self.owner.save()
+        self.assertEqual(self.client.get("/schools/list/").status_code, 401)
+
+    def test_revocation_is_rechecked_after_ttl(self):
+        self.client.get("/schools/list/")
+        User.objects.filter(pk=self.owner.pk).update(is_active=False)
+        # No signal for a queryset update: the cached answer holds until the TTL
+        self.assertEqual(self.client.get("/schools/list/").status_code, 200)
+        with self.settings(JWT_REVOCATION_CHECK_TTL=0):
+            self.assertEqual(self.client.get("/schools/list/").status_code, 401)
+
+    def test_profile_loads_the_user(self):
+        response = self.client.get("/api/user/profile/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["email"], self.owner.email)
+
+
+class FlakyBackend(EmailBackend):
+    """Local memory backend refusing recipients at bounce.example.com."""
+
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(to.endswith("@bounce.example.com") for to in message.to):
+                raise ConnectionError("recipient refused")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="accounts.tests.FlakyBackend",
+    EMAIL_OUTBOX_BATCH_SIZE=10,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_DELAY=30,
+)
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        FlakyBackend.opened = 0
+
+    def test_reset_request_only_enqueues(self):
+        User.objects.create_user(
+            email="reset@example.com", name="Reset", tc=True, password="pass"
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = APIClient().post(
+                "/api/user/send-reset-password-email/",
+                {"email": "reset@example.com"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(callbacks, [outbox.wake_sender])
+
+        self.assertEqual(outbox.drain_outbox(), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ["reset@example.com"])
+        self.assertIn("/api/user/reset/", mail.outbox[0].body)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.SENT)
+        self.assertEqual(email.attempts, 1)
+
+    def test_batches_reuse_one_connection(self):
+        for n in range(25):
+            outbox.queue_email("Notice", "Body", f"user{n}@example.com")
+        self.assertEqual(outbox.drain_outbox(), (25, 0))
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(FlakyBackend.opened, 3)
+        self.assertEqual(outbox.drain_outbox(), (0, 0))
+
+    def test_failures_back_off_then_give_up(self):
+        with self.assertLogs("accounts.outbox", "WARNING"):
+            outbox.queue_email("Notice", "Body", "ok@example.com")
+            outbox.queue_email("Notice", "Body", "gone@bounce.example.com")
+
+            before = timezone.now()
+            self.assertEqual(outbox.drain_outbox(), (1, 1))
+            failed = OutboxEmail.objects.get(to_email="gone@bounce.example.com")
+            self.assertEqual(failed.status, OutboxEmail.QUEUED)
+            self.assertEqual(failed.last_error, "recipient refused")
+            self.assertGreaterEqual(failed.next_attempt_at, before + timedelta(seconds=30))
+            # Not due yet
+            self.assertEqual(outbox.drain_outbox(), (0, 0))
+
+            delays = []
+            for _ in range(2):
+                failed.refresh_from_db()
+                delays.append(failed.next_attempt_at - timezone.now())
+                OutboxEmail.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+                self.assertEqual(outbox.drain_outbox(), (0, 1))
+            self.assertGreater(delays[1], delays[0] + timedelta(seconds=25))
+            failed.refresh_from_db()
+            self.assertEqual(failed.status, OutboxEmail.FAILED)
+            self.assertEqual(failed.attempts, 3)
+            self.assertEqual(len(mail.outbox), 1)
+
+    def test_claimed_emails_are_not_sent_twice(self):
+        email = outbox.queue_email("Notice", "Body", "once@example.com")
+        self.assertEqual([e.pk for e in outbox._claim_batch(10)], [email.pk])
+        self.assertEqual(outbox._claim_batch(10), [])
+
+    @override_settings(EMAIL_OUTBOX_WORKERS=0)
+    def test_inline_mode_and_command(self):
+        outbox.queue_email("Notice", "Body", "now@example.com")
+        self.assertEqual(len(mail.outbox), 1)
+
+        with override_settings(EMAIL_OUTBOX_WORKERS=1):
+            outbox.queue_email("Notice", "Body", "later@example.com")
+        call_command("send_queued_emails", stdout=mock.MagicMock())
+        self.assertEqual([m.to for m in mail.outbox], [["now@example.com"], ["later@example.com"]])
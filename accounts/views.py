@@ -12,6 +12,7 @@ from accounts.serializers import (
     SendPasswordResetEmailSerializer,
 )
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated as isAuthenticated
@@ -22,6 +23,9 @@ def get_tokens_for_user(user):
         raise AuthenticationFailed("User is not active")
 
     refresh = RefreshToken.for_user(user)
+    # Claims of the stateless authentication, copied to the access token
+    refresh["is_active"] = user.is_active
+    refresh["is_admin"] = user.is_admin
 
     return {
         "refresh": str(refresh),
@@ -66,6 +70,8 @@ class UserLoginView(APIView):
 
 class UserProfileView(APIView):
     renderer_classes = [UserRenderer]
+    # Needs the User row, whichever authentication is the default
+    authentication_classes = [JWTAuthentication]
     permission_classes = [isAuthenticated]
 
     def get(self, request, format=None):
@@ -76,6 +82,7 @@ class UserProfileView(APIView):
 
 class UserChangePasswordView(APIView):
     renderer_classes = [UserRenderer]
+    authentication_classes = [JWTAuthentication]
     permission_classes = [isAuthenticated]
 
     def post(self, request, format=None):
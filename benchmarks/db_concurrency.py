@@ -0,0 +1,136 @@
+"""
+Concurrent throughput of result lookups (reads) alongside marksheet-style
+write transactions, on the default SQLite settings and on the production
+profile (DB_PROFILE=production: WAL, tuned pragmas, busy timeout, immediate
+write transactions, persistent connections).
+
+    python -m benchmarks.db_concurrency [--schools 50] [--seconds 5] [--readers 8] [--writers 2]
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.result_lookup import seed
+from benchmarks.utils import setup_django, summarize, temporary_database, timed
+
+
+def profiles():
+    from django.conf import settings
+
+    return [
+        (
+            "default",
+            {"OPTIONS": {"init_command": "PRAGMA journal_mode=DELETE"}, "CONN_MAX_AGE": 0},
+        ),
+        (
+            "production",
+            {
+                "OPTIONS": {
+                    "timeout": 20,
+                    "transaction_mode": "IMMEDIATE",
+                    "init_command": ";".join(settings.SQLITE_PRODUCTION_PRAGMAS),
+                },
+                "CONN_MAX_AGE": 600,
+            },
+        ),
+    ]
+
+
+def use_profile(profile):
+    """Apply a profile to the settings every thread's connection is built from."""
+    from django.db import connection, connections
+
+    connections.close_all()
+    connection.settings_dict.update(profile)
+
+
+def write_group(mark_ids):
+    """An import-style transaction: read the current marks, then rewrite them."""
+    from django.db import transaction
+    from django.db.models import F
+
+    from students.models import StudentMarks, StudentSubjectMarks
+
+    with transaction.atomic():
+        list(StudentMarks.objects.filter(pk__in=mark_ids).values_list("id", "total_marks"))
+        StudentMarks.objects.filter(pk__in=mark_ids).update(total_marks=F("total_marks"))
+        StudentSubjectMarks.objects.filter(student_marks__in=mark_ids).update(
+            marks_obtained=F("marks_obtained")
+        )
+
+
+def run(seconds, readers, writers, keys, mark_ids):
+    from django.db import OperationalError, close_old_connections, connections
+
+    from exam.utils.result_lookup import lookup_student_result
+
+    deadline = time.monotonic() + seconds
+    results = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def worker(kind, seed_value):
+        rng = random.Random(seed_value)
+        samples, failed = [], 0
+        while time.monotonic() < deadline:
+            try:
+                if kind == "read":
+                    samples.append(timed(lookup_student_result, *rng.choice(keys))[1])
+                else:
+                    start = rng.randrange(max(len(mark_ids) - 40, 1))
+                    samples.append(timed(write_group, mark_ids[start : start + 40])[1])
+            except OperationalError:
+                failed += 1
+            finally:
+                # End of "request": the connection is closed or kept per CONN_MAX_AGE
+                close_old_connections()
+        with lock:
+            results[kind] += samples
+            errors[kind] += failed
+
+    def thread_main(kind, seed_value):
+        try:
+            worker(kind, seed_value)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=readers + writers) as pool:
+        jobs = [("read", n) for n in range(readers)] + [("write", n) for n in range(writers)]
+        list(pool.map(lambda job: thread_main(*job), jobs))
+    return results, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schools", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    setup_django()
+    from students.models import StudentMarks
+
+    with temporary_database():
+        keys = seed(args.schools)
+        mark_ids = list(StudentMarks.objects.order_by("id").values_list("id", flat=True))
+        print(
+            f"{len(keys)} students, {args.readers} reader and {args.writers} writer "
+            f"threads for {args.seconds}s per profile"
+        )
+        for label, profile in profiles():
+            use_profile(profile)
+            results, errors = run(args.seconds, args.readers, args.writers, keys, mark_ids)
+            for kind in ("read", "write"):
+                samples = results[kind] or [0.0]
+                summarize(f"{label} {kind}s", samples)
+                print(
+                    f"{'':<28} ops/s={len(results[kind]) / args.seconds:8.1f} "
+                    f"locked={errors[kind]}"
+                )
+
+
+if __name__ == "__main__":
+    main()
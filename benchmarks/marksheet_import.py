@@ -0,0 +1,120 @@
+"""
+Throughput of marksheet uploads read as XLSX versus CSV, parsing alone and
+the full import (parse, score, save).
+
+    python -m benchmarks.marksheet_import [--rows 1000 10000 100000] [--parse-only]
+"""
+import argparse
+import csv
+import io
+import random
+import tempfile
+
+from benchmarks.utils import setup_django, temporary_database, timed
+
+SUBJECTS = ["English", "Nepali", "Math", "Science", "Social", "Computer"]
+HEADERS = ["S.N.", "Student Name", "Roll No.", "OTP"] + SUBJECTS
+
+
+def sheet_rows(count, section):
+    rng = random.Random(count)
+    yield ["School: Bench School"]
+    yield [f"Class: 10 | Section: {section} | Term: Final"]
+    yield []
+    yield HEADERS
+    for r in range(1, count + 1):
+        yield [r, f"Student {r}", r, str(1000 + r)] + [
+            rng.randint(20, 100) for _ in SUBJECTS
+        ]
+
+
+def build_xlsx(count, section):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Marksheet")
+    for row in sheet_rows(count, section):
+        ws.append(row)
+    stream = io.BytesIO()
+    wb.save(stream)
+    stream.name = "marksheet.xlsx"
+    return stream
+
+
+def build_csv(count, section):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    for row in sheet_rows(count, section):
+        writer.writerow(row)
+    stream = io.BytesIO(text.getvalue().encode())
+    stream.name = "marksheet.csv"
+    return stream
+
+
+def seed(sections):
+    from accounts.models import User
+    from classes.models import Class
+    from exam.models import ExamTerm
+    from school.models import School
+    from section.models import Section
+    from subject.models import Subject
+
+    owner = User.objects.create_user(
+        email="bench@example.com", name="Bench", tc=True, password="bench"
+    )
+    school = School.objects.create(name="Bench School", owner=owner)
+    class_obj = Class.objects.create(school=school, grade=10)
+    ExamTerm.objects.create(school=school, name="Final")
+    for name in sections:
+        section = Section.objects.create(name=name, class_obj=class_obj, school=school)
+        Subject.objects.bulk_create(
+            Subject(name=n, class_obj=class_obj, section=section) for n in SUBJECTS
+        )
+
+
+def report(label, count, file, ms):
+    size = len(file.getvalue()) / 2**20
+    print(
+        f"{label:<22} rows={count:<7} size={size:7.2f}MiB "
+        f"time={ms:9.1f}ms rows/s={count / ms * 1000:10.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--parse-only", action="store_true")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+
+    from exam.utils.marksheet_importer import import_marksheet
+    from exam.utils.sheet_reader import read_marksheet
+
+    builders = [("xlsx", build_xlsx), ("csv", build_csv)]
+    for count in args.rows:
+        for label, build in builders:
+            file = build(count, "A")
+            # Best of three, the first run warms up the imports
+            ms = min(timed(read_marksheet, file)[1] for _ in range(3))
+            report(f"parse {label}", count, file, ms)
+
+    if args.parse_only:
+        return
+
+    # Result workbooks go to a throwaway MEDIA_ROOT as well
+    with temporary_database(), tempfile.TemporaryDirectory() as media_root, override_settings(
+        MEDIA_ROOT=media_root
+    ):
+        sections = [f"{label}{count}" for count in args.rows for label, _ in builders]
+        seed(sections)
+        for count in args.rows:
+            for label, build in builders:
+                file = build(count, f"{label}{count}")
+                ms = timed(import_marksheet, file, 100, 33)[1]
+                report(f"import {label}", count, file, ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Render time of large class, subject and student list responses with the
+shared UserRenderer, compared with the per-app renderer it replaced
+(`"ErrorDetail" in str(data)` on every response).
+
+    python -m benchmarks.renderers [--rows 20000] [--repeat 5]
+"""
+import argparse
+
+from benchmarks.utils import setup_django, summarize, timed
+
+
+def class_payload(rows):
+    return {
+        "msg": "Classes retrieved successfully",
+        "classes": [
+            {
+                "id": i,
+                "school": 1,
+                "school_name": "Bench School",
+                "grade": i % 10 + 1,
+                "sections": [
+                    {"id": i * 4 + s, "name": name} for s, name in enumerate("ABCD")
+                ],
+                "created_at": "2025-01-02T03:04:05.678Z",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def subject_payload(rows):
+    return {
+        "msg": "Subjects retrieved successfully",
+        "subjects": [
+            {
+                "id": i,
+                "name": f"Subject {i % 8}",
+                "class_obj": i // 8,
+                "class_grade": i % 10 + 1,
+                "section": i // 32,
+                "section_name": "A",
+                "created_at": "2025-01-02T03:04:05.678Z",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def student_payload(rows):
+    return {
+        "count": None,
+        "next": "http://testserver/students/list/?cursor=WzEwLCA0LCA0MF0%3D",
+        "students": [
+            {
+                "id": i,
+                "school": 1,
+                "school_name": "Bench School",
+                "class_obj": i // 40,
+                "class_grade": i % 10 + 1,
+                "section": i // 40,
+                "section_name": "A",
+                "name": f"Student {i}",
+                "roll_no": i % 40 + 1,
+                "otp": str(1000 + i),
+                "marks": [
+                    {
+                        "id": i,
+                        "student": i,
+                        "student_name": f"Student {i}",
+                        "term": 1,
+                        "total_marks": 412.5,
+                        "percentage": 68.75,
+                        "grade": "B",
+                        "result": "Pass",
+                        "rank": i % 40 + 1,
+                        "subject_marks": [
+                            {
+                                "id": i * 6 + s,
+                                "student_marks": i,
+                                "student_name": f"Student {i}",
+                                "subject": s,
+                                "subject_name": f"Subject {s}",
+                                "marks_obtained": 68.75,
+                            }
+                            for s in range(6)
+                        ],
+                        "created_at": "2025-01-02T03:04:05.678Z",
+                        "updated_at": "2025-01-02T03:04:05.678Z",
+                    }
+                ],
+                "created_at": "2025-01-02T03:04:05.678Z",
+                "updated_at": "2025-01-02T03:04:05.678Z",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.response import Response
+
+    from djangoauthapi import renderers
+    from djangoauthapi.renderers import UserRenderer
+
+    class LegacyRenderer(JSONRenderer):
+        def render(self, data, accepted_media_type=None, renderer_context=None):
+            if "ErrorDetail" in str(data):
+                data = {"errors": data}
+            return super().render(data, accepted_media_type, renderer_context)
+
+    context = {"response": Response(status=200)}
+    orjson = renderers.orjson
+    print(f"{args.rows} rows per payload, orjson {'on' if orjson else 'not installed'}")
+    for name, build in [
+        ("classes", class_payload),
+        ("subjects", subject_payload),
+        ("students", student_payload),
+    ]:
+        data = build(args.rows)
+        for label, renderer in [
+            ("legacy", LegacyRenderer()),
+            ("shared/json", UserRenderer()),
+            ("shared/orjson", UserRenderer()),
+        ]:
+            if label == "shared/json":
+                renderers.orjson = None
+            elif label == "shared/orjson":
+                if orjson is None:
+                    continue
+                renderers.orjson = orjson
+            samples = [
+                timed(renderer.render, data, "application/json", context)[1]
+                for _ in range(args.repeat)
+            ]
+            summarize(f"{name} {label}", samples)
+        renderers.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Peak memory and time of the streamed results export against building the
+whole result list first, for a small and a large school.
+
+    python -m benchmarks.result_export [--small 200] [--large 20000]
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.utils import setup_django, temporary_database, timed
+
+
+def measure(label, consume):
+    tracemalloc.start()
+    try:
+        count, elapsed = timed(consume)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f"{label:<28} rows={count:<7} time={elapsed:9.1f}ms peak={peak / 2**20:8.2f}MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--small", type=int, default=200)
+    parser.add_argument("--large", type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+    from benchmarks.result_lookup import seed
+    from exam.models import ExamTerm
+    from school.models import School
+    from exam.utils.result_export import iter_results, ndjson_lines
+
+    with temporary_database():
+        for students in (args.small, args.large):
+            School.objects.all().delete()
+            # One school, eight sections of one class
+            seed(1, sections=8, students=max(1, students // 8))
+            term = ExamTerm.objects.get()
+
+            def streamed():
+                return sum(1 for _ in ndjson_lines(iter_results(term)))
+
+            def buffered():
+                return len(list(ndjson_lines(list(iter_results(term)))))
+
+            measure(f"{students} streamed", streamed)
+            measure(f"{students} full list", buffered)
+
+
+if __name__ == "__main__":
+    main()
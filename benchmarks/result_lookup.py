@@ -0,0 +1,155 @@
+"""
+Latency of the public single-result lookup (POST exams/marksheet/single/)
+under concurrent load, compared with the old lookup it replaced.
+
+    python -m benchmarks.result_lookup [--schools 200] [--requests 4000] [--threads 16]
+"""
+import argparse
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import setup_django, summarize, temporary_database, timed
+
+SUBJECTS = ["English", "Nepali", "Math", "Science", "Social", "Computer"]
+
+
+def seed(schools, sections=2, students=40):
+    from accounts.models import User
+    from classes.models import Class
+    from exam.models import ExamTerm
+    from school.models import School
+    from section.models import Section
+    from students.models import Student, StudentMarks, StudentSubjectMarks
+    from students.ranking import refresh_group_ranks
+    from subject.models import Subject
+
+    owner = User.objects.filter(email="bench@example.com").first()
+    if owner is None:
+        owner = User.objects.create_user(
+            email="bench@example.com", name="Bench", tc=True, password="bench"
+        )
+    rng = random.Random(1)
+    keys = []
+    for s in range(schools):
+        school = School.objects.create(name=f"Bench School {s}", owner=owner)
+        class_obj = Class.objects.create(school=school, grade=10)
+        term = ExamTerm.objects.create(school=school, name="Final")
+        for sec in "ABCDEFGH"[:sections]:
+            section = Section.objects.create(
+                name=sec, class_obj=class_obj, school=school
+            )
+            subjects = [
+                Subject.objects.create(name=n, class_obj=class_obj, section=section)
+                for n in SUBJECTS
+            ]
+            group = Student.objects.bulk_create(
+                Student(
+                    school=school,
+                    class_obj=class_obj,
+                    section=section,
+                    name=f"Student {r}",
+                    roll_no=r,
+                    otp=str(1000 + r),
+                )
+                for r in range(1, students + 1)
+            )
+            marks = StudentMarks.objects.bulk_create(
+                StudentMarks(student=st, term=term, result="Pass", grade="B")
+                for st in group
+            )
+            subject_marks = []
+            for sm in marks:
+                obtained = [rng.randint(20, 100) for _ in subjects]
+                sm.total_marks = sum(obtained)
+                sm.percentage = sm.total_marks / len(subjects)
+                subject_marks += [
+                    StudentSubjectMarks(student_marks=sm, subject=subj, marks_obtained=m)
+                    for subj, m in zip(subjects, obtained)
+                ]
+            StudentMarks.objects.bulk_update(marks, ["total_marks", "percentage"])
+            StudentSubjectMarks.objects.bulk_create(subject_marks)
+            refresh_group_ranks(term, class_obj, section)
+            keys += [
+                (school.name.upper(), 10, sec.lower(), st.roll_no, st.otp)
+                for st in group
+            ]
+    return keys
+
+
+def legacy_lookup(school_name, grade, section_name, roll_no, otp):
+    """The lookup as it was before the indexed path, kept for comparison."""
+    from school.models import School
+    from students.models import Student, StudentMarks
+
+    school = School.objects.get(name__iexact=school_name.strip())
+    student = Student.objects.get(
+        school=school,
+        class_obj__grade=grade,
+        section__name__iexact=section_name.strip(),
+        roll_no=roll_no,
+        otp=otp,
+    )
+    student_marks = StudentMarks.objects.filter(student=student).first()
+    peer_marks = StudentMarks.objects.filter(
+        student__school=school,
+        student__class_obj=student.class_obj,
+        student__section=student.section,
+        term=student_marks.term,
+    ).order_by("-total_marks")
+    rank = {sm.student_id: i + 1 for i, sm in enumerate(peer_marks)}[student.id]
+    subjects = {
+        sm.subject.name: sm.marks_obtained for sm in student_marks.subject_marks.all()
+    }
+    return {
+        "student": student.name,
+        "school": student.school.name,
+        "class_name": student.class_obj.grade,
+        "section": student.section.name,
+        "term": student_marks.term.name,
+        "rank": rank,
+        "subjects": subjects,
+    }
+
+
+def run(lookup, keys, requests, threads):
+    from django.db import close_old_connections
+
+    rng = random.Random(2)
+    picks = [rng.choice(keys) for _ in range(requests)]
+
+    def one(key):
+        try:
+            return timed(lookup, *key)[1]
+        finally:
+            close_old_connections()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(one, picks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schools", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    setup_django()
+    from exam.utils.result_lookup import lookup_student_result
+
+    with temporary_database():
+        keys = seed(args.schools)
+        print(
+            f"{len(keys)} students in {args.schools} schools, "
+            f"{args.requests} lookups on {args.threads} threads"
+        )
+        for label, lookup in [
+            ("legacy lookup", legacy_lookup),
+            ("indexed lookup", lookup_student_result),
+        ]:
+            run(lookup, keys, min(200, args.requests), args.threads)  # warm up
+            summarize(label, run(lookup, keys, args.requests, args.threads))
+
+
+if __name__ == "__main__":
+    main()
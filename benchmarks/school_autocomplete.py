@@ -0,0 +1,71 @@
+"""
+Latency of the public school autocomplete (GET schools/school-list/?q=) over
+a large number of schools: the indexed prefix lookup against the
+unbounded name__icontains scan it replaced.
+
+    python -m benchmarks.school_autocomplete [--schools 100000] [--queries 300]
+"""
+import argparse
+import random
+
+from benchmarks.utils import setup_django, summarize, temporary_database, timed
+
+WORDS = [
+    "Everest", "Himalayan", "Shree", "Janata", "Kathmandu", "Pokhara", "Saraswati",
+    "Bright", "Future", "Model", "Secondary", "Public", "Academy", "English",
+    "Boarding", "National", "Global", "Little", "Angels", "Valley", "Sunrise",
+]
+
+
+def seed(count):
+    from accounts.models import User
+    from school.models import School, normalize_school_name
+
+    owner = User.objects.create_user(
+        email="bench@example.com", name="Bench", tc=True, password="bench"
+    )
+    rng = random.Random(count)
+    schools = []
+    for n in range(count):
+        name = f"{' '.join(rng.sample(WORDS, 3))} School {n}"
+        # bulk_create skips School.save(), which fills name_key
+        schools.append(School(name=name, name_key=normalize_school_name(name), owner=owner))
+    School.objects.bulk_create(schools, batch_size=5000)
+
+
+def legacy_autocomplete(query):
+    """The view's query before the prefix index, kept for comparison."""
+    from school.models import School
+
+    schools = School.objects.filter(name__icontains=query).order_by("name")
+    return [{"id": school.id, "name": school.name} for school in schools]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schools", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+    from school.autocomplete import autocomplete_schools
+
+    with temporary_database():
+        seed(args.schools)
+        # What a user types, one keystroke at a time
+        rng = random.Random(0)
+        queries = []
+        while len(queries) < args.queries:
+            word = rng.choice(WORDS)
+            queries += [word[:n] for n in range(1, len(word) + 1)]
+        queries = queries[: args.queries]
+
+        runs = [("legacy icontains", legacy_autocomplete), ("prefix index", autocomplete_schools)]
+        for label, search in runs:
+            search(queries[0])  # warm up
+            samples = [timed(search, q)[1] for q in queries]
+            summarize(f"{label} ({args.schools})", samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Scoring throughput of large students x subjects marks matrices: the shared
+scoring engine against the per-row loop it replaced.
+
+    python -m benchmarks.scoring [--students 10000 100000 500000] [--subjects 8]
+"""
+import argparse
+import random
+
+from benchmarks.utils import timed
+
+
+def legacy_scores(marks, full_mark, pass_mark):
+    """The per-row loop with an if/elif grade ladder, kept for comparison."""
+
+    def get_grade(pct):
+        if pct >= 90:
+            return "A+"
+        elif pct >= 80:
+            return "A"
+        elif pct >= 70:
+            return "B+"
+        elif pct >= 60:
+            return "B"
+        elif pct >= 50:
+            return "C+"
+        elif pct >= 40:
+            return "C"
+        elif pct >= 33:
+            return "D"
+        return "F"
+
+    num_subjects = len(marks[0])
+    scored = []
+    for row in marks:
+        total = 0
+        passed = True
+        for mark in row:
+            total += mark
+            if mark < pass_mark:
+                passed = False
+        percentage = round((total / (full_mark * num_subjects)) * 100, 2)
+        scored.append((total, percentage, get_grade(percentage) if passed else "-", passed))
+
+    order = sorted(range(len(scored)), key=lambda idx: scored[idx][0], reverse=True)
+    ranks = [0] * len(scored)
+    current_rank = 0
+    last_total = None
+    for position, idx in enumerate(order, start=1):
+        if scored[idx][0] != last_total:
+            current_rank = position
+        ranks[idx] = current_rank
+        last_total = scored[idx][0]
+    return scored, ranks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--subjects", type=int, default=8)
+    args = parser.parse_args()
+
+    from exam.utils.scoring import score_matrix, uniform_scheme
+
+    scheme = uniform_scheme(args.subjects, 100, 33)
+
+    for count in args.students:
+        rng = random.Random(count)
+        marks = [
+            tuple(float(rng.randint(0, 100)) for _ in range(args.subjects))
+            for _ in range(count)
+        ]
+        runs = [
+            ("legacy loop", lambda: legacy_scores(marks, 100, 33)),
+            ("score_matrix", lambda: score_matrix(marks, scheme)),
+        ]
+        for label, score in runs:
+            ms = min(timed(score)[1] for _ in range(3))
+            print(
+                f"{label:<14} students={count:<7} subjects={args.subjects} "
+                f"time={ms:9.1f}ms rows/s={count / ms * 1000:11.0f}"
+            )
+
+        legacy, ranks = legacy_scores(marks, 100, 33)
+        scores = score_matrix(marks, scheme)
+        assert ranks == scores.ranks
+        assert [row[2] for row in legacy] == scores.grades
+
+
+if __name__ == "__main__":
+    main()
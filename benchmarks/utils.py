@@ -0,0 +1,56 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run against a throwaway database built from the migrations, so
+they never touch the development database. Run them from the project root,
+e.g. `python -m benchmarks.result_lookup`.
+"""
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoauthapi.settings")
+    import django
+
+    django.setup()
+
+
+@contextlib.contextmanager
+def temporary_database():
+    """Create a migrated SQLite file database for the benchmark and drop it after."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp, "bench.sqlite3")
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summarize(label, samples_ms):
+    """Print count, p50, p95, p99 and max of a list of latencies (ms)."""
+    samples = sorted(samples_ms)
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    else:
+        cuts = samples * 99
+    print(
+        f"{label:<28} n={len(samples):<6} p50={cuts[49]:8.2f}ms "
+        f"p95={cuts[94]:8.2f}ms p99={cuts[98]:8.2f}ms max={samples[-1]:8.2f}ms"
+    )
@@ -6,6 +6,8 @@ from rest_framework import status
 from classes.models import Class
 from classes.renderers import UserRenderer
 from classes.serializers import ClassSerializer
+from djangoauthapi.cache import cached_for_owner
+from djangoauthapi.ownership import owns_school
 from school.models import School
 
 
@@ -25,14 +27,7 @@ class ClassCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check ownership safely
-        if not hasattr(school, "owner"):
-            return Response(
-                {"error": "School model has no owner field"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        if school.owner != request.user:
+        if not owns_school(request.user, school.id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -59,14 +54,20 @@ class ClassListView(APIView):
 
     def get(self, request, format=None):
         try:
-            classes = (
-                Class.objects.filter(school__owner=request.user)
-                .select_related("school")  # fetch school in same query
-                .prefetch_related("sections")  # fetch sections efficiently
-            )
-            serializer = ClassSerializer(classes, many=True)
-            return Response(
-                {"msg": "Classes retrieved successfully", "classes": serializer.data},
+            classes = cached_for_owner(
+                "class-list",
+                request.user.id,
+                lambda: list(
+                    ClassSerializer(
+                        Class.objects.filter(school__owner=request.user.id)
+                        .select_related("school")  # fetch school in same query
+                        .prefetch_related("sections"),  # fetch sections efficiently
+                        many=True,
+                    ).data
+                ),
+            )
+            return Response(
+                {"msg": "Classes retrieved successfully", "classes": classes},
                 status=status.HTTP_200_OK,
             )
         except Exception as e:
@@ -89,20 +90,21 @@ class ClassListBySchoolView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Fetch school owned by the logged-in user
-        try:
-            if school_id:
-                school = School.objects.get(id=school_id, owner=request.user)
-            else:
-                school = School.objects.get(name=school_name, owner=request.user)
-        except School.DoesNotExist:
+        # Resolve a school owned by the logged-in user
+        if not school_id:
+            school_id = (
+                School.objects.filter(name=school_name, owner=request.user.id)
+                .values_list("id", flat=True)
+                .first()
+            )
+        if not owns_school(request.user, school_id):
             return Response(
                 {"error": "School not found or you do not own this school"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         # Fetch all classes for this school
-        classes = Class.objects.filter(school=school)
+        classes = Class.objects.filter(school_id=school_id).select_related("school")
         serializer = ClassSerializer(classes, many=True)
 
         return Response(
@@ -117,14 +119,14 @@ class ClassRetrieveView(APIView):
 
     def get(self, request, pk, format=None):
         try:
-            class_obj = Class.objects.get(pk=pk)
+            class_obj = Class.objects.select_related("school").get(pk=pk)
         except Class.DoesNotExist:
             return Response(
                 {"error": "Class not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
         # Check ownership
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -143,13 +145,13 @@ class ClassUpdateView(APIView):
 
     def put(self, request, pk, format=None):
         try:
-            class_obj = Class.objects.get(pk=pk)
+            class_obj = Class.objects.select_related("school").get(pk=pk)
         except Class.DoesNotExist:
             return Response(
                 {"error": "Class not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -169,13 +171,13 @@ class ClassUpdateView(APIView):
 
     def patch(self, request, pk, format=None):
         try:
-            class_obj = Class.objects.get(pk=pk)
+            class_obj = Class.objects.select_related("school").get(pk=pk)
         except Class.DoesNotExist:
             return Response(
                 {"error": "Class not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -206,7 +208,7 @@ class ClassDeleteView(APIView):
                 {"error": "Class not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,74 @@
+"""
+Per-owner and per-school caching for read-mostly list endpoints.
+
+Entries are keyed by a version number per owner (or school) rather than
+deleted one by one: invalidating bumps the version, so every entry built
+for the old version is simply never read again and ages out. This works
+with any cache backend, including ones that cannot delete by pattern.
+Invalidation is wired to model signals in school/signals.py.
+"""
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+# Versions outlive the entries they guard
+VERSION_TIMEOUT = None
+
+
+def _version_key(scope, scope_id):
+    return f"cache-version:{scope}:{scope_id}"
+
+
+def _version(scope, scope_id):
+    key = _version_key(scope, scope_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock, so a version lost to eviction can never
+        # come back to a number that older entries were stored under
+        version = time.time_ns()
+        if not cache.add(key, version, VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def _cached(name, scope, scope_id, build, timeout):
+    key = f"{name}:{scope}:{scope_id}:{_version(scope, scope_id)}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout)
+    return data
+
+
+def cached_for_owner(name, owner_id, build, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the cached value `name` for an owner, calling `build()` on a miss.
+    The value must be picklable (e.g. `list(serializer.data)`).
+    """
+    return _cached(name, "owner", owner_id, build, timeout)
+
+
+def cached_for_school(name, school_id, build, timeout=DEFAULT_TIMEOUT):
+    """Same as cached_for_owner, for values scoped to one school."""
+    return _cached(name, "school", school_id, build, timeout)
+
+
+def school_version(school_id):
+    """
+    Current version of a school's cached values, for values cached outside
+    the cache backend (e.g. in process) that must follow its invalidation.
+    """
+    return _version("school", school_id)
+
+
+def invalidate_owner(owner_id):
+    """Drop every cached value of an owner."""
+    cache.set(_version_key("owner", owner_id), time.time_ns(), VERSION_TIMEOUT)
+
+
+def invalidate_school(school_id, owner_id=None):
+    """Drop every cached value of a school, and of its owner when given."""
+    cache.set(_version_key("school", school_id), time.time_ns(), VERSION_TIMEOUT)
+    if owner_id is not None:
+        invalidate_owner(owner_id)
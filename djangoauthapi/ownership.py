@@ -0,0 +1,36 @@
+"""
+Ownership checks shared by the apps' views.
+
+The ids of the schools a user owns are loaded with one query, cached per
+owner (see djangoauthapi/cache.py, invalidated by the School signals) and
+kept on the request's user object. A view then checks an object it already
+fetched by comparing its school id, without loading the school or its
+owner through foreign keys.
+"""
+from djangoauthapi.cache import cached_for_owner
+from school.models import School
+
+
+def owned_school_ids(user):
+    """Frozenset of the ids of the schools `user` owns."""
+    if not user or not user.is_authenticated:
+        return frozenset()
+    ids = getattr(user, "_owned_school_ids", None)
+    if ids is None:
+        ids = cached_for_owner(
+            "owned-school-ids",
+            user.id,
+            lambda: frozenset(
+                School.objects.filter(owner=user.id).values_list("id", flat=True)
+            ),
+        )
+        user._owned_school_ids = ids
+    return ids
+
+
+def owns_school(user, school_id):
+    """True if `user` owns the school with id `school_id` (int or str)."""
+    try:
+        return int(school_id) in owned_school_ids(user)
+    except (TypeError, ValueError):
+        return False
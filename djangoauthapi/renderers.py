@@ -0,0 +1,65 @@
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional, the standard json module is used without it
+    orjson = None
+
+
+def contains_error_detail(data):
+    """True if a DRF ErrorDetail appears anywhere in `data` (dicts/lists)."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, ErrorDetail):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class UserRenderer(JSONRenderer):
+    """
+    JSON renderer shared by the apps: validation and other DRF errors are
+    wrapped as {"errors": ...}, everything else is rendered as is.
+
+    Errors are detected by looking for ErrorDetail values, and only in
+    responses with an error status, so successful (and typically large)
+    responses are never walked. Rendering goes through orjson when it is
+    installed, with the same output as DRF's encoder.
+    """
+
+    charset = "utf-8"
+
+    def is_error(self, data, renderer_context):
+        response = (renderer_context or {}).get("response")
+        if response is not None and response.status_code < 400:
+            return False
+        return contains_error_detail(data)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if self.is_error(data, renderer_context):
+            data = {"errors": data}
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or data is None or indent:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Datetimes and anything orjson doesn't know go through DRF's
+        # encoder, so values are formatted exactly as without orjson
+        try:
+            ret = orjson.dumps(
+                data,
+                default=JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer for these JavaScript line terminators
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
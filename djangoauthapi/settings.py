@@ -95,15 +95,66 @@ WSGI_APPLICATION = "djangoauthapi.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+    }
+}
+
+# DB_PROFILE=production tunes SQLite for concurrent result-day reads and
+# import writes: readers no longer block on a writer (WAL), writers wait
+# for the lock instead of failing with "database is locked", and write
+# transactions take the lock up front so they cannot deadlock on upgrade.
+# Connections are kept for DB_CONN_MAX_AGE seconds between requests.
+# The init_command and transaction_mode options need Django 5.1 or later.
+DB_PROFILE = os.environ.get("DB_PROFILE", "development")
+
+SQLITE_PRODUCTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+]
+
+if DB_PROFILE == "production":
+    DATABASES["default"].update(
+        {
+            "OPTIONS": {
+                "timeout": int(os.environ.get("DB_BUSY_TIMEOUT", 20)),
+                "transaction_mode": "IMMEDIATE",
+                "init_command": ";".join(SQLITE_PRODUCTION_PRAGMAS),
+            },
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    )
+
+# Cache for the reference-data list endpoints (see djangoauthapi/cache.py).
+# Local memory by default; with several worker processes use a shared
+# backend, e.g. CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# and CACHE_LOCATION=/var/tmp/django-school-cache, so invalidation reaches all.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "django-school"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", 600)),
     }
 }
 
 
 # JWT Configuration
+# JWT_STATELESS_AUTH=1 builds the request user from the token claims
+# instead of loading it on every request (see accounts/authentication.py);
+# revocation is then checked at most every JWT_REVOCATION_CHECK_TTL seconds.
+JWT_STATELESS_AUTH = os.environ.get("JWT_STATELESS_AUTH", "0") == "1"
+JWT_REVOCATION_CHECK_TTL = int(os.environ.get("JWT_REVOCATION_CHECK_TTL", 30))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     )
 }
 
@@ -144,6 +195,26 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded marksheets and generated result workbooks
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
+# Worker threads processing marksheet import jobs (0 = run inside the request)
+MARKSHEET_IMPORT_WORKERS = int(os.environ.get("MARKSHEET_IMPORT_WORKERS", 2))
+
+# Worker processes building and parsing workbooks of bulk marksheet
+# exports and whole-school imports (0 = in the request)
+MARKSHEET_WORKER_PROCESSES = int(os.environ.get("MARKSHEET_WORKER_PROCESSES", 2))
+
+# Outgoing email is queued in accounts.OutboxEmail and sent by a background
+# thread (0 = send inside the request), in batches over one connection.
+# Failed sends are retried after EMAIL_OUTBOX_RETRY_DELAY seconds, doubled
+# on every attempt, up to EMAIL_OUTBOX_MAX_ATTEMPTS.
+EMAIL_OUTBOX_WORKERS = int(os.environ.get("EMAIL_OUTBOX_WORKERS", 1))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.environ.get("EMAIL_OUTBOX_RETRY_DELAY", 30))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
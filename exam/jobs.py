@@ -0,0 +1,111 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from exam.models import MarksheetImportJob
+from exam.utils.marksheet_importer import import_marksheet
+
+logger = logging.getLogger(__name__)
+
+# Seconds a job may stay running; past that its worker is assumed gone
+# (restart, deploy, OOM) and the job is queued again
+RUNNING_JOB_LEASE = 3600
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MARKSHEET_IMPORT_WORKERS,
+                thread_name_prefix="marksheet-import",
+            )
+        return _executor
+
+
+def enqueue_import_job(job):
+    """
+    Hand a queued job to the local worker pool once the current transaction
+    commits. The job row itself is the queue entry, so jobs that were not
+    picked up (e.g. after a restart) can be run with `process_import_jobs`.
+    """
+    if settings.MARKSHEET_IMPORT_WORKERS <= 0:
+        run_import_job(job.id)
+        return
+
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, job.id))
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_import_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def run_import_job(job_id):
+    """Claim a queued job and import its marksheet."""
+    # Conditional update so a job is only ever claimed by one worker
+    claimed = MarksheetImportJob.objects.filter(
+        id=job_id, status=MarksheetImportJob.QUEUED
+    ).update(status=MarksheetImportJob.RUNNING, started_at=timezone.now())
+    if not claimed:
+        return
+
+    job = MarksheetImportJob.objects.get(id=job_id)
+    try:
+        with job.file.open("rb") as file:
+            imported = import_marksheet(file, job.full_mark, job.pass_mark)
+
+        # A copy of its own: the imported sheet's workbook is replaced and
+        # deleted by later imports of the same class/section/term
+        with imported.result_file.open("rb") as result:
+            job.result_file.save(f"marksheet_job_{job.id}.xlsx", File(result), save=False)
+        job.total_rows = imported.total_rows
+        job.imported_rows = imported.imported_rows
+        job.errors = imported.errors
+        job.status = MarksheetImportJob.SUCCEEDED
+    except Exception as e:
+        logger.exception("Marksheet import job %s failed", job_id)
+        job.errors = job.errors + [{"row": None, "error": str(e)}]
+        job.status = MarksheetImportJob.FAILED
+
+    job.finished_at = timezone.now()
+    job.save()
+
+
+def requeue_stale_jobs():
+    """
+    Put jobs back in the queue whose worker died while running them, i.e.
+    started more than RUNNING_JOB_LEASE seconds ago. Returns their number.
+    """
+    cutoff = timezone.now() - timedelta(seconds=RUNNING_JOB_LEASE)
+    return MarksheetImportJob.objects.filter(
+        status=MarksheetImportJob.RUNNING, started_at__lt=cutoff
+    ).update(status=MarksheetImportJob.QUEUED, started_at=None)
+
+
+def process_queued_jobs():
+    """
+    Run every job still waiting in the queue, including stale running jobs
+    requeued by requeue_stale_jobs. Returns the number run.
+    """
+    requeue_stale_jobs()
+    job_ids = list(
+        MarksheetImportJob.objects.filter(
+            status=MarksheetImportJob.QUEUED
+        ).values_list("id", flat=True)
+    )
+    for job_id in job_ids:
+        run_import_job(job_id)
+    return len(job_ids)
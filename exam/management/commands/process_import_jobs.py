@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from exam.jobs import process_queued_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run marksheet import jobs that are still queued, or were left running "
+        "by a worker that died (e.g. after a restart)."
+    )
+
+    def handle(self, *args, **options):
+        count = process_queued_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Processed {count} import job(s)"))
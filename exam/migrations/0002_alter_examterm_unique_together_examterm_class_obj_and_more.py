@@ -12,15 +12,15 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.AlterUniqueTogether(
-            name='examterm',
-            unique_together={('class_obj', 'name')},
-        ),
         migrations.AddField(
             model_name='examterm',
             name='class_obj',
             field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exam_terms', to='classes.class'),
         ),
+        migrations.AlterUniqueTogether(
+            name='examterm',
+            unique_together={('class_obj', 'name')},
+        ),
         migrations.RemoveField(
             model_name='examterm',
             name='school',
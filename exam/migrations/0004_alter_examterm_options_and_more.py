@@ -16,15 +16,15 @@ class Migration(migrations.Migration):
             name='examterm',
             options={},
         ),
-        migrations.AlterUniqueTogether(
-            name='examterm',
-            unique_together={('school', 'name')},
-        ),
         migrations.AddField(
             model_name='examterm',
             name='school',
             field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exam_terms', to='school.school'),
         ),
+        migrations.AlterUniqueTogether(
+            name='examterm',
+            unique_together={('school', 'name')},
+        ),
         migrations.RemoveField(
             model_name='examterm',
             name='class_obj',
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0005_alter_class_options'),
+        ('exam', '0006_marksheetimportjob'),
+        ('section', '0007_alter_section_unique_together_section_class_obj_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedMarksheet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(db_index=True, max_length=64)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('total_rows', models.IntegerField(default=0)),
+                ('imported_rows', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('result_file', models.FileField(blank=True, upload_to='marksheet_results/')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imported_marksheets', to='classes.class')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imported_marksheets', to='section.section')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imported_marksheets', to='exam.examterm')),
+            ],
+            options={
+                'unique_together': {('term', 'class_obj', 'section')},
+            },
+        ),
+    ]
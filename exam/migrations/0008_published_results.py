@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0005_alter_class_options'),
+        ('exam', '0007_importedmarksheet'),
+        ('section', '0007_alter_section_unique_together_section_class_obj_and_more'),
+        ('students', '0009_student_result_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examterm',
+            name='published_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='PublishedResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_key', models.CharField(max_length=255)),
+                ('grade', models.IntegerField()),
+                ('section_key', models.CharField(max_length=255)),
+                ('roll_no', models.IntegerField()),
+                ('otp', models.CharField(blank=True, max_length=50)),
+                ('rank', models.IntegerField(blank=True, null=True)),
+                ('payload', models.JSONField()),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_results', to='classes.class')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_results', to='section.section')),
+                ('student_marks', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='published_result', to='students.studentmarks')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_results', to='exam.examterm')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school_key', 'grade', 'section_key', 'roll_no', 'otp'], name='exam_publis_school__e1a20b_idx'), models.Index(fields=['term', 'class_obj', 'section', 'rank'], name='exam_publis_term_id_2ac53b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0008_published_results'),
+        ('school', '0002_school_name_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradingScale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grading_scales', to='school.school')),
+                ('term', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grading_scales', to='exam.examterm')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GradeBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=5)),
+                ('min_percentage', models.FloatField()),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='exam.gradingscale')),
+            ],
+            options={
+                'ordering': ['min_percentage'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(condition=models.Q(('term__isnull', True)), fields=('school',), name='unique_school_grading_scale'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(fields=('school', 'term'), name='unique_term_grading_scale'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='gradeband',
+            unique_together={('scale', 'min_percentage')},
+        ),
+    ]
@@ -1,3 +1,6 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 from school.models import School
 from django.utils import timezone
@@ -10,9 +13,182 @@ class ExamTerm(models.Model):
     )
     name = models.CharField(max_length=100)
     created_at = models.DateTimeField(default=timezone.now)
+    # Set while the term's results are served from PublishedResult snapshots
+    published_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         unique_together = ("school", "name")
 
     def __str__(self):
         return f"{self.name} ({self.school.name})"
+
+
+class GradingScale(models.Model):
+    """
+    Grade bands of a school, for all its terms (term is null) or for one
+    term. Compiled scales are cached in process, see exam/utils/grading.py.
+    """
+
+    school = models.ForeignKey(
+        School, on_delete=models.CASCADE, related_name="grading_scales"
+    )
+    term = models.ForeignKey(
+        ExamTerm,
+        on_delete=models.CASCADE,
+        related_name="grading_scales",
+        null=True,
+        blank=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["school"],
+                condition=models.Q(term__isnull=True),
+                name="unique_school_grading_scale",
+            ),
+            models.UniqueConstraint(
+                fields=["school", "term"], name="unique_term_grading_scale"
+            ),
+        ]
+
+    def __str__(self):
+        term = self.term.name if self.term_id else "all terms"
+        return f"Grading scale of {self.school.name} ({term})"
+
+
+class GradeBand(models.Model):
+    """
+    A grade given from `min_percentage` up to the next band. The lowest
+    band also covers everything below it.
+    """
+
+    scale = models.ForeignKey(
+        GradingScale, on_delete=models.CASCADE, related_name="bands"
+    )
+    label = models.CharField(max_length=5)
+    min_percentage = models.FloatField()
+
+    class Meta:
+        ordering = ["min_percentage"]
+        unique_together = ("scale", "min_percentage")
+
+    def __str__(self):
+        return f"{self.label} from {self.min_percentage}%"
+
+
+class MarksheetImportJob(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    # Random id so the status/download links cannot be guessed
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file = models.FileField(upload_to="marksheet_imports/")
+    full_mark = models.FloatField(default=100)
+    pass_mark = models.FloatField(default=33)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True
+    )
+    total_rows = models.IntegerField(default=0)
+    imported_rows = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    result_file = models.FileField(upload_to="marksheet_results/", blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="marksheet_import_jobs",
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"Marksheet import {self.id} ({self.status})"
+
+
+class ImportedMarksheet(models.Model):
+    """
+    Fingerprints and result workbook of the last marksheet imported for a
+    class/section/term, used to skip work when the same sheet is re-uploaded.
+    """
+
+    term = models.ForeignKey(
+        ExamTerm, on_delete=models.CASCADE, related_name="imported_marksheets"
+    )
+    class_obj = models.ForeignKey(
+        "classes.Class", on_delete=models.CASCADE, related_name="imported_marksheets"
+    )
+    section = models.ForeignKey(
+        "section.Section",
+        on_delete=models.CASCADE,
+        related_name="imported_marksheets",
+    )
+    file_hash = models.CharField(max_length=64, db_index=True)
+    content_hash = models.CharField(max_length=64)
+    total_rows = models.IntegerField(default=0)
+    imported_rows = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    result_file = models.FileField(upload_to="marksheet_results/", blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("term", "class_obj", "section")
+
+    def __str__(self):
+        return f"Imported marksheet {self.class_obj_id}/{self.section_id} ({self.term.name})"
+
+
+class PublishedResult(models.Model):
+    """
+    Result payload of one student for a published term, stored as the
+    single-result endpoint returns it and keyed by the public lookup tuple
+    (normalized school name, grade, section, roll number, OTP).
+    See exam.utils.published_results.
+    """
+
+    term = models.ForeignKey(
+        ExamTerm, on_delete=models.CASCADE, related_name="published_results"
+    )
+    class_obj = models.ForeignKey(
+        "classes.Class", on_delete=models.CASCADE, related_name="published_results"
+    )
+    section = models.ForeignKey(
+        "section.Section", on_delete=models.CASCADE, related_name="published_results"
+    )
+    student_marks = models.OneToOneField(
+        "students.StudentMarks",
+        on_delete=models.CASCADE,
+        related_name="published_result",
+    )
+    school_key = models.CharField(max_length=255)
+    grade = models.IntegerField()
+    section_key = models.CharField(max_length=255)
+    roll_no = models.IntegerField()
+    otp = models.CharField(max_length=50, blank=True)
+    rank = models.IntegerField(blank=True, null=True)
+    payload = models.JSONField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["school_key", "grade", "section_key", "roll_no", "otp"]
+            ),
+            models.Index(fields=["term", "class_obj", "section", "rank"]),
+        ]
+
+    def __str__(self):
+        return f"Published result {self.roll_no} ({self.term_id})"
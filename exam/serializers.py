@@ -1,8 +1,9 @@
+from django.urls import reverse
 from rest_framework import serializers
 from section.models import Section
 from classes.models import Class
 from school.models import School
-from .models import ExamTerm
+from .models import ExamTerm, GradeBand, MarksheetImportJob
 
 
 class ExamTermSerializer(serializers.ModelSerializer):
@@ -10,13 +11,66 @@ class ExamTermSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ExamTerm
-        fields = ["id", "school", "name", "school_name", "created_at"]
-        read_only_fields = ["id", "school_name", "created_at"]
+        fields = ["id", "school", "name", "school_name", "created_at", "published_at"]
+        read_only_fields = ["id", "school_name", "created_at", "published_at"]
 
 
 class MarksheetImportSerializer(serializers.Serializer):
     full_mark = serializers.FloatField(default=100)
     pass_mark = serializers.FloatField(default=33)
     file = serializers.FileField()
-    
-    
+
+
+class MarksheetWorkbookImportSerializer(MarksheetImportSerializer):
+    # Save all sheets or none; with False each sheet is saved on its own
+    atomic = serializers.BooleanField(default=True)
+
+
+class MarksheetImportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MarksheetImportJob
+        fields = [
+            "id",
+            "status",
+            "total_rows",
+            "imported_rows",
+            "errors",
+            "download_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != MarksheetImportJob.SUCCEEDED or not obj.result_file:
+            return None
+        url = reverse("marksheet-import-job-download", args=[obj.id])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class GradeBandSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GradeBand
+        fields = ["label", "min_percentage"]
+
+
+class GradingScaleSerializer(serializers.Serializer):
+    # Null (or missing) sets the school's scale for all terms
+    term = serializers.PrimaryKeyRelatedField(
+        queryset=ExamTerm.objects.all(), required=False, allow_null=True
+    )
+    bands = GradeBandSerializer(many=True)
+
+    def validate_bands(self, bands):
+        if not bands:
+            raise serializers.ValidationError("At least one band is required.")
+        minimums = [band["min_percentage"] for band in bands]
+        if len(set(minimums)) != len(minimums):
+            raise serializers.ValidationError("Band minimums must be unique.")
+        if any(not 0 <= minimum <= 100 for minimum in minimums):
+            raise serializers.ValidationError("Band minimums must be between 0 and 100.")
+        return bands
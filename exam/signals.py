@@ -0,0 +1,186 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from classes.models import Class
+from djangoauthapi.cache import invalidate_school
+from exam.models import (
+    ExamTerm,
+    GradeBand,
+    GradingScale,
+    ImportedMarksheet,
+    MarksheetImportJob,
+    PublishedResult,
+)
+from exam.utils.published_results import invalidate_published_results
+from school.models import School
+from section.models import Section
+from students.models import Student, StudentMarks, StudentSubjectMarks
+from subject.models import Subject
+
+# Keep published result snapshots in step with mark edits made through
+# save()/delete() (API views, admin). Bulk writes don't send signals, so
+# the marksheet writer invalidates explicitly.
+
+
+@receiver(post_save, sender=StudentMarks)
+def invalidate_on_marks_change(sender, instance, **kwargs):
+    student = instance.student
+    invalidate_published_results(
+        instance.term_id, student.class_obj_id, student.section_id
+    )
+
+
+@receiver(post_save, sender=StudentSubjectMarks)
+@receiver(post_delete, sender=StudentSubjectMarks)
+def invalidate_on_subject_marks_change(sender, instance, **kwargs):
+    invalidate_on_marks_change(StudentMarks, instance.student_marks)
+
+
+def _invalidate_student_groups(student, include_current=True):
+    """
+    Drop the snapshot of every group the student has a result in: groups
+    are only served from their snapshot when it holds the whole group.
+    """
+    groups = set(
+        PublishedResult.objects.filter(student_marks__student=student).values_list(
+            "term_id", "class_obj_id", "section_id"
+        )
+    )
+    if include_current:
+        # A student moved to another class or section joins its groups
+        groups.update(
+            (term_id, student.class_obj_id, student.section_id)
+            for term_id in student.marks.values_list("term_id", flat=True)
+        )
+    for group in groups:
+        invalidate_published_results(*group)
+
+
+@receiver(post_save, sender=Student)
+def invalidate_on_student_change(sender, instance, created, **kwargs):
+    # Name, roll number or OTP may be part of the snapshot and its key
+    if not created:
+        _invalidate_student_groups(instance)
+
+
+@receiver(pre_delete, sender=Student)
+def invalidate_on_student_delete(sender, instance, **kwargs):
+    # Before the delete cascades to the student's own snapshot rows
+    _invalidate_student_groups(instance, include_current=False)
+
+
+# Snapshots carry the school, term and section names and the grade, in
+# their payload and lookup key: renaming one drops the snapshots it is in.
+# Model -> (field, PublishedResult lookup of its rows)
+_SNAPSHOT_FIELDS = {
+    School: ("name", "term__school"),
+    ExamTerm: ("name", "term"),
+    Class: ("grade", "class_obj"),
+    Section: ("name", "section"),
+}
+
+
+@receiver(pre_save, sender=School)
+@receiver(pre_save, sender=ExamTerm)
+@receiver(pre_save, sender=Class)
+@receiver(pre_save, sender=Section)
+def remember_snapshot_field(sender, instance, **kwargs):
+    field, _ = _SNAPSHOT_FIELDS[sender]
+    instance._snapshot_value = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=School)
+@receiver(post_save, sender=ExamTerm)
+@receiver(post_save, sender=Class)
+@receiver(post_save, sender=Section)
+def invalidate_on_rename(sender, instance, created, **kwargs):
+    field, lookup = _SNAPSHOT_FIELDS[sender]
+    if not created and instance._snapshot_value != getattr(instance, field):
+        PublishedResult.objects.filter(**{lookup: instance.pk}).delete()
+
+
+# Imported-sheet records only describe the rows as the import left them:
+# once a student or their marks change some other way, re-uploading the
+# same sheet has to write it again instead of being skipped.
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def forget_imports_on_student_change(sender, instance, **kwargs):
+    ImportedMarksheet.objects.filter(
+        class_obj=instance.class_obj_id, section=instance.section_id
+    ).delete()
+
+
+@receiver(post_save, sender=StudentMarks)
+@receiver(post_delete, sender=StudentMarks)
+def forget_imports_on_marks_change(sender, instance, **kwargs):
+    # Matched through the student id: the row may be going with its student
+    ImportedMarksheet.objects.filter(
+        term=instance.term_id,
+        class_obj__students=instance.student_id,
+        section__students=instance.student_id,
+    ).delete()
+
+
+# Marking changes: compiled grading scales (exam/utils/grading.py) follow
+# the school's cache version, and imported sheets are forgotten so that
+# re-uploading them scores the marks again instead of being skipped.
+
+
+def _grading_changed(school_id):
+    invalidate_school(school_id)
+    ImportedMarksheet.objects.filter(term__school=school_id).delete()
+
+
+@receiver(post_save, sender=GradingScale)
+@receiver(post_delete, sender=GradingScale)
+def invalidate_on_grading_scale_change(sender, instance, **kwargs):
+    _grading_changed(instance.school_id)
+
+
+@receiver(post_save, sender=GradeBand)
+@receiver(post_delete, sender=GradeBand)
+def invalidate_on_grade_band_change(sender, instance, **kwargs):
+    # Bands deleted along with their scale are covered by the scale's signal
+    school_id = (
+        GradingScale.objects.filter(id=instance.scale_id)
+        .values_list("school_id", flat=True)
+        .first()
+    )
+    if school_id:
+        _grading_changed(school_id)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def forget_imports_on_subject_change(sender, instance, **kwargs):
+    # The school's cache version is bumped in school/signals.py
+    ImportedMarksheet.objects.filter(class_obj=instance.class_obj_id).delete()
+
+
+# Stored files go with their rows, including queryset deletes; only once
+# the deletion is committed, so a rolled back delete keeps its files.
+
+
+def _delete_files_on_commit(*files):
+    for file in files:
+        if file:
+            transaction.on_commit(partial(file.storage.delete, file.name))
+
+
+@receiver(post_delete, sender=ImportedMarksheet)
+def delete_imported_result_file(sender, instance, **kwargs):
+    _delete_files_on_commit(instance.result_file)
+
+
+@receiver(post_delete, sender=MarksheetImportJob)
+def delete_import_job_files(sender, instance, **kwargs):
+    _delete_files_on_commit(instance.file, instance.result_file)
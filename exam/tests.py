@@ -1,3 +1,1200 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from classes.models import Class
+from exam.jobs import RUNNING_JOB_LEASE, process_queued_jobs, run_import_job
+from exam.models import ExamTerm, ImportedMarksheet, MarksheetImportJob, PublishedResult
+from exam.utils import bulk_marksheets, marksheet_generator, marksheet_importer
+from exam.utils.bulk_marksheets import blank_marksheet_groups
+from exam.utils.all_marksheet import get_all_students_marksheet_data
+from exam.utils.grading import marking_scheme
+from exam.utils.result_export import iter_results
+from exam.utils.scoring import grade_for, score_matrix, uniform_scheme
+from exam.utils.single_marksheet import get_single_student_marksheet_data
+from exam.utils.sheet_reader import read_marksheet
+from school.models import School
+from section.models import Section
+from students.models import Student, StudentMarks, StudentSubjectMarks
+from subject.models import Subject
+
+SUBJECTS = ["English", "Nepali", "Math", "Science"]
+
+
+def build_marksheet(rows, school="Test School", grade=5, section="A", term="First"):
+    """Build a filled marksheet upload in the layout of the blank export."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws["A1"] = f"School: {school}"
+    ws["A2"] = f"Class: {grade} | Section: {section} | Term: {term}"
+    ws.append([])
+    ws.append(["S.N.", "Student Name", "Roll No.", "OTP"] + SUBJECTS)
+    for sn, (name, roll_no, otp, marks) in enumerate(rows, start=1):
+        ws.append([sn, name, roll_no, otp] + list(marks))
+
+    stream = io.BytesIO()
+    wb.save(stream)
+    stream.seek(0)
+    stream.name = "marksheet.xlsx"
+    return stream
+
+
+def build_delimited_marksheet(
+    rows, delimiter=",", name="marksheet.csv", school="Test School", grade=5, section="A", term="First"
+):
+    """The CSV/TSV counterpart of build_marksheet, as spreadsheet apps export it."""
+    text = io.StringIO()
+    writer = csv.writer(text, delimiter=delimiter)
+    writer.writerow([f"School: {school}"])
+    writer.writerow([f"Class: {grade} | Section: {section} | Term: {term}"])
+    writer.writerow([])
+    writer.writerow(["S.N.", "Student Name", "Roll No.", "OTP"] + SUBJECTS)
+    for sn, (student, roll_no, otp, marks) in enumerate(rows, start=1):
+        writer.writerow([sn, student, roll_no, otp] + list(marks))
+
+    stream = io.BytesIO(("\ufeff" + text.getvalue()).encode())
+    stream.name = name
+    return stream
+
+
+def build_workbook(sheets, school="Test School", grade=5, term="First"):
+    """A multi-sheet upload: one marksheet per (section, rows) pair."""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for section, rows in sheets:
+        if section is None:
+            wb.create_sheet("Notes")
+            continue
+        ws = wb.create_sheet(f"{grade}-{section}")
+        ws["A1"] = f"School: {school}"
+        ws["A2"] = f"Class: {grade} | Section: {section} | Term: {term}"
+        ws.append([])
+        ws.append(["S.N.", "Student Name", "Roll No.", "OTP"] + SUBJECTS)
+        for sn, (name, roll_no, otp, marks) in enumerate(rows, start=1):
+            ws.append([sn, name, roll_no, otp] + list(marks))
+
+    stream = io.BytesIO()
+    wb.save(stream)
+    stream.seek(0)
+    stream.name = "school.xlsx"
+    return stream
+
+
+def make_rows(count, marks=(80, 70, 60, 50)):
+    return [(f"Student {i}", i, f"OTP{i}", marks) for i in range(1, count + 1)]
+
+
+class MarksheetTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="owner@example.com", name="Owner", tc=True, password="pass"
+        )
+        cls.school = School.objects.create(name="Test School", owner=cls.user)
+        cls.class_obj = Class.objects.create(school=cls.school, grade=5)
+        cls.section = Section.objects.create(
+            name="A", class_obj=cls.class_obj, school=cls.school
+        )
+        cls.term = ExamTerm.objects.create(school=cls.school, name="First")
+        for name in SUBJECTS:
+            Subject.objects.create(
+                name=name, class_obj=cls.class_obj, section=cls.section
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def import_sheet(self, rows, file=None, **data):
+        data.setdefault("full_mark", 100)
+        data.setdefault("pass_mark", 33)
+        return self.client.post(
+            "/exams/marksheet/import/",
+            {"file": file or build_marksheet(rows), **data},
+            format="multipart",
+        )
+
+
+def load_response_workbook(response):
+    return openpyxl.load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+
+
+class MarksheetImportTests(MarksheetTestMixin, TestCase):
+    def test_import_saves_students_and_marks(self):
+        response = self.import_sheet(
+            [("Asha", 1, "111", (90, 95, 85, 92)), ("Bikash", 2, "222", (20, 50, 60, 70))]
+        )
+        self.assertEqual(response.status_code, 200)
+
+        asha = StudentMarks.objects.get(student__roll_no=1, term=self.term)
+        self.assertEqual(asha.total_marks, 362)
+        self.assertEqual(asha.percentage, 90.5)
+        self.assertEqual(asha.result, "Pass")
+        self.assertEqual(asha.subject_marks.count(), 4)
+
+        bikash = StudentMarks.objects.get(student__roll_no=2, term=self.term)
+        self.assertEqual(bikash.result, "Fail")
+        self.assertEqual(bikash.grade, "-")
+
+    def test_result_workbook_matches_saved_marks(self):
+        response = self.import_sheet(
+            [("Asha", 1, "111", (55, 55, 55, 55)), ("Bikash", 2, "222", (60, 60, 60, 60))]
+        )
+        ws = load_response_workbook(response).active
+        rows = {r[1]: r for r in ws.iter_rows(min_row=5, values_only=True)}
+
+        asha = StudentMarks.objects.get(student__roll_no=1, term=self.term)
+        self.assertEqual(rows["Asha"][-5:], (220, 55, asha.grade, "PASS", "2nd"))
+        self.assertEqual(rows["Bikash"][-1], "1st")
+
+    def test_result_workbook_layout(self):
+        response = self.import_sheet([("Asha Kumari Shrestha", 1, "111", (20, 55, 55, 55))])
+        ws = load_response_workbook(response).active
+
+        self.assertEqual(ws["A1"].value, "School: Test School")
+        self.assertIn("A1:M1", {str(r) for r in ws.merged_cells.ranges})
+        self.assertEqual(ws.freeze_panes, "A5")
+        self.assertEqual(ws["E5"].style, "result_mark_fail")
+        self.assertEqual(ws["F5"].fill.start_color.rgb, "00C6EFCE")
+        self.assertEqual(ws["L5"].font.bold, True)
+        self.assertEqual(ws.column_dimensions["J"].width, len("Percentage") + 2)
+
+    def test_reimport_updates_marks_in_place(self):
+        self.import_sheet([("Asha", 1, "111", (90, 95, 85, 92))])
+        self.import_sheet([("Asha", 1, "111", (40, 40, 40, 40))])
+
+        self.assertEqual(Student.objects.count(), 1)
+        self.assertEqual(StudentMarks.objects.count(), 1)
+        self.assertEqual(StudentSubjectMarks.objects.count(), 4)
+        self.assertEqual(StudentMarks.objects.get().total_marks, 160)
+
+    def test_identical_reupload_returns_cached_result(self):
+        # Same bytes: workbooks built a second apart differ in their metadata
+        upload = build_marksheet(make_rows(20)).getvalue()
+
+        def reupload():
+            file = io.BytesIO(upload)
+            file.name = "marksheet.xlsx"
+            return self.import_sheet(None, file=file)
+
+        first = reupload()
+        first_content = b"".join(first.streaming_content)
+        updated_at = StudentMarks.objects.get(student__roll_no=1).updated_at
+
+        with CaptureQueriesContext(connection) as queries:
+            second = reupload()
+
+        self.assertEqual(b"".join(second.streaming_content), first_content)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            StudentMarks.objects.get(student__roll_no=1).updated_at, updated_at
+        )
+
+    def test_reupload_after_student_delete_imports_again(self):
+        upload = build_marksheet(make_rows(2)).getvalue()
+
+        def reupload():
+            file = io.BytesIO(upload)
+            file.name = "marksheet.xlsx"
+            return self.import_sheet(None, file=file)
+
+        reupload()
+        Student.objects.get(roll_no=2).delete()
+        self.assertFalse(ImportedMarksheet.objects.exists())
+
+        response = reupload()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertEqual(StudentMarks.objects.count(), 2)
+        ws = load_response_workbook(response).active
+        self.assertEqual(
+            [row[1] for row in ws.iter_rows(min_row=5, values_only=True)],
+            ["Student 1", "Student 2"],
+        )
+
+    def test_marks_edit_forgets_imported_sheet(self):
+        self.import_sheet(make_rows(2))
+        marks = StudentMarks.objects.get(student__roll_no=1)
+        marks.total_marks = 0
+        marks.save()
+        self.assertFalse(ImportedMarksheet.objects.exists())
+
+    def test_reimport_only_writes_changed_rows(self):
+        rows = make_rows(3)
+        self.import_sheet(rows)
+        unchanged = StudentMarks.objects.get(student__roll_no=1).updated_at
+
+        rows[1] = ("Student 2", 2, "OTP2", (10, 10, 10, 10))
+        self.import_sheet(rows)
+
+        self.assertEqual(
+            StudentMarks.objects.get(student__roll_no=1).updated_at, unchanged
+        )
+        self.assertEqual(StudentMarks.objects.get(student__roll_no=2).total_marks, 40)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self.import_sheet(make_rows(5))
+        StudentMarks.objects.all().delete()
+        Student.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            self.import_sheet(make_rows(60))
+
+        self.assertEqual(StudentSubjectMarks.objects.count(), 60 * len(SUBJECTS))
+        self.assertEqual(len(small), len(large))
+
+
+class ResultFileCleanupTests(MarksheetTestMixin, TestCase):
+    def stored_results(self):
+        folder = os.path.join(settings.MEDIA_ROOT, "marksheet_results")
+        return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+    def test_reimport_deletes_the_superseded_workbook(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_sheet(make_rows(2))
+        first = self.stored_results()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_sheet(make_rows(2, marks=(40, 40, 40, 40)))
+
+        stored = self.stored_results()
+        self.assertEqual(len(stored), 1)
+        self.assertNotEqual(stored, first)
+        self.assertEqual(
+            os.path.basename(ImportedMarksheet.objects.get().result_file.name), stored[0]
+        )
+
+    def test_row_delete_deletes_its_workbook(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_sheet(make_rows(2))
+            ImportedMarksheet.objects.all().delete()
+        self.assertEqual(self.stored_results(), [])
+
+    @override_settings(MARKSHEET_IMPORT_WORKERS=0)
+    def test_job_download_outlives_later_imports(self):
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/exams/marksheet/import/jobs/",
+                {"file": build_marksheet(make_rows(2))},
+                format="multipart",
+            )
+            self.import_sheet(make_rows(2, marks=(40, 40, 40, 40)))
+
+        job = self.client.get(
+            f"/exams/marksheet/import/jobs/{response.data['job']['id']}/"
+        ).data
+        download = self.client.get(job["download_url"])
+        self.assertEqual(download.status_code, 200)
+        ws = load_response_workbook(download).active
+        self.assertEqual(ws["E5"].value, 80)
+
+
+class DelimitedMarksheetImportTests(MarksheetTestMixin, TestCase):
+    def test_csv_upload_is_imported_like_excel(self):
+        rows = make_rows(3)
+        response = self.import_sheet(rows, file=build_delimited_marksheet(rows))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StudentMarks.objects.filter(term=self.term).count(), 3)
+        self.assertEqual(
+            StudentSubjectMarks.objects.get(
+                student_marks__student__roll_no=1, subject__name="Math"
+            ).marks_obtained,
+            60,
+        )
+
+        # The same contents as Excel are recognised as unchanged
+        with mock.patch.object(marksheet_importer, "save_marksheet_results") as save:
+            response = self.import_sheet(rows)
+        self.assertEqual(response.status_code, 200)
+        save.assert_not_called()
+
+
+class MarksheetImportJobTests(MarksheetTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def queue(self, rows):
+        return self.client.post(
+            "/exams/marksheet/import/jobs/",
+            {"file": build_marksheet(rows)},
+            format="multipart",
+        )
+
+    @override_settings(MARKSHEET_IMPORT_WORKERS=0)
+    def test_job_reports_counts_errors_and_result(self):
+        response = self.queue(make_rows(3) + [("No Roll", "x", "9", (1, 1, 1, 1))])
+        self.assertEqual(response.status_code, 202)
+
+        status_url = f"/exams/marksheet/import/jobs/{response.data['job']['id']}/"
+        job = self.client.get(status_url).data
+        self.assertEqual(job["status"], MarksheetImportJob.SUCCEEDED)
+        self.assertEqual((job["total_rows"], job["imported_rows"]), (4, 3))
+        self.assertEqual(job["errors"][0]["row"], 8)
+        self.assertEqual(StudentMarks.objects.filter(term=self.term).count(), 3)
+
+        download = self.client.get(job["download_url"])
+        self.assertEqual(download.status_code, 200)
+        ws = load_response_workbook(download).active
+        self.assertEqual(ws["B5"].value, "Student 1")
+
+    @override_settings(MARKSHEET_IMPORT_WORKERS=2)
+    def test_job_waits_in_queue_until_processed(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.queue(make_rows(2))
+
+        job = MarksheetImportJob.objects.get(id=response.data["job"]["id"])
+        self.assertEqual(job.status, MarksheetImportJob.QUEUED)
+        self.assertEqual(job.created_by, self.user)
+        self.assertIsNone(response.data["job"]["download_url"])
+
+        run_import_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, MarksheetImportJob.SUCCEEDED)
+
+    @override_settings(MARKSHEET_IMPORT_WORKERS=0)
+    def test_jobs_are_only_visible_to_their_creator(self):
+        job_id = self.queue(make_rows(2)).data["job"]["id"]
+        status_url = f"/exams/marksheet/import/jobs/{job_id}/"
+        download_url = self.client.get(status_url).data["download_url"]
+
+        other = User.objects.create_user(
+            email="stranger@example.com", name="Stranger", tc=True, password="pass"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(status_url).status_code, 401)
+        self.assertEqual(self.client.get(download_url).status_code, 401)
+        self.assertEqual(self.queue(make_rows(1)).status_code, 401)
+
+    @override_settings(MARKSHEET_IMPORT_WORKERS=2)
+    def test_stale_running_job_is_requeued(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.queue(make_rows(2))
+        job = MarksheetImportJob.objects.get(id=response.data["job"]["id"])
+
+        # A worker claimed the job and died; a recent claim is left alone
+        started = timezone.now()
+        MarksheetImportJob.objects.filter(id=job.id).update(
+            status=MarksheetImportJob.RUNNING, started_at=started
+        )
+        self.assertEqual(process_queued_jobs(), 0)
+
+        MarksheetImportJob.objects.filter(id=job.id).update(
+            started_at=started - timedelta(seconds=RUNNING_JOB_LEASE + 1)
+        )
+        self.assertEqual(process_queued_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, MarksheetImportJob.SUCCEEDED)
+
+
+class StudentMarksRetrieveTests(MarksheetTestMixin, TestCase):
+    def retrieve(self):
+        return self.client.get(
+            "/exams/student-marks/",
+            {
+                "school_id": self.school.id,
+                "grade": 5,
+                "section_name": "a",
+                "term_id": self.term.id,
+            },
+        )
+
+    def test_ranks_share_ties_like_result_sheet(self):
+        self.import_sheet(
+            [
+                ("Asha", 1, "1", (60, 60, 60, 60)),
+                ("Bikash", 2, "2", (90, 90, 90, 90)),
+                ("Chandra", 3, "3", (60, 60, 60, 60)),
+                ("Dipa", 4, "4", (50, 50, 50, 50)),
+            ]
+        )
+        data = self.retrieve().data["data"]
+
+        ranks = {row["student"]: row["rank"] for row in data}
+        self.assertEqual(ranks, {"Bikash": 1, "Asha": 2, "Chandra": 2, "Dipa": 4})
+        self.assertEqual(data[0]["subjects"]["Math"], 90)
+
+    def test_query_count_does_not_grow_with_class_size(self):
+        self.import_sheet(make_rows(3))
+        with CaptureQueriesContext(connection) as small:
+            self.retrieve()
+        self.import_sheet(make_rows(40))
+        with CaptureQueriesContext(connection) as large:
+            response = self.retrieve()
+
+        self.assertEqual(len(response.data["data"]), 40)
+        self.assertEqual(len(small), len(large))
+
+
+class StoredRankTests(MarksheetTestMixin, TestCase):
+    def ranks(self):
+        return dict(
+            StudentMarks.objects.filter(term=self.term).values_list(
+                "student__roll_no", "rank"
+            )
+        )
+
+    def test_import_stores_ranks(self):
+        self.import_sheet(
+            [
+                ("Asha", 1, "1", (60, 60, 60, 60)),
+                ("Bikash", 2, "2", (90, 90, 90, 90)),
+                ("Chandra", 3, "3", (60, 60, 60, 60)),
+            ]
+        )
+        self.assertEqual(self.ranks(), {1: 2, 2: 1, 3: 2})
+
+    def test_subject_mark_edit_updates_group_ranks(self):
+        self.import_sheet(
+            [("Asha", 1, "1", (60, 60, 60, 60)), ("Bikash", 2, "2", (70, 70, 70, 70))]
+        )
+        computer = Subject.objects.create(
+            name="Computer", class_obj=self.class_obj, section=self.section
+        )
+        asha = StudentMarks.objects.get(student__roll_no=1)
+
+        response = self.client.post(
+            "/students/student-subject-marks/",
+            {"student_marks": asha.id, "subject": computer.id, "marks_obtained": 50},
+        )
+        self.assertEqual(response.status_code, 201)
+
+        asha.refresh_from_db()
+        self.assertEqual(asha.total_marks, 290)
+        self.assertEqual(asha.percentage, 58.0)
+        self.assertEqual(asha.grade, "C+")
+        self.assertEqual(asha.result, "Pass")
+        self.assertEqual(asha.marks_hash, "")
+        self.assertEqual(self.ranks(), {1: 1, 2: 2})
+
+        # A failed subject fails the whole row
+        art = Subject.objects.create(
+            name="Art", class_obj=self.class_obj, section=self.section
+        )
+        self.client.post(
+            "/students/student-subject-marks/",
+            {"student_marks": asha.id, "subject": art.id, "marks_obtained": 10},
+        )
+        asha.refresh_from_db()
+        self.assertEqual(
+            (asha.total_marks, asha.percentage, asha.grade, asha.result),
+            (300, 50.0, "-", "Fail"),
+        )
+
+    def test_subject_mark_edit_keeps_upload_marks(self):
+        self.import_sheet(
+            [("Asha", 1, "1", (40, 40, 40, 40)), ("Bikash", 2, "2", (30, 30, 30, 30))],
+            full_mark=50,
+            pass_mark=20,
+        )
+        asha = StudentMarks.objects.get(student__roll_no=1)
+        self.assertEqual((asha.total_marks, asha.percentage, asha.grade), (160, 80.0, "A"))
+
+        computer = Subject.objects.create(
+            name="Computer", class_obj=self.class_obj, section=self.section
+        )
+        self.client.post(
+            "/students/student-subject-marks/",
+            {"student_marks": asha.id, "subject": computer.id, "marks_obtained": 45},
+        )
+        asha.refresh_from_db()
+        self.assertEqual(
+            (asha.total_marks, asha.percentage, asha.grade, asha.result),
+            (205, 82.0, "A", "Pass"),
+        )
+        self.assertEqual(self.ranks(), {1: 1, 2: 2})
+
+    def test_marks_create_ranks_new_row(self):
+        self.import_sheet(make_rows(2))
+        student = Student.objects.create(
+            school=self.school,
+            class_obj=self.class_obj,
+            section=self.section,
+            name="Late Entry",
+            roll_no=3,
+            otp="3",
+        )
+
+        response = self.client.post(
+            "/students/student-marks/",
+            {"student": student.id, "term": self.term.id, "total_marks": 300},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["student_marks"]["rank"], 1)
+        self.assertEqual(self.ranks(), {1: 2, 2: 2, 3: 1})
+
+
+class SingleStudentResultLookupTests(MarksheetTestMixin, TestCase):
+    def lookup(self, **data):
+        payload = {
+            "school_name": "Test School",
+            "grade": 5,
+            "section_name": "A",
+            "roll_no": 2,
+            "otp": "222",
+        }
+        payload.update(data)
+        return self.client.post("/exams/marksheet/single/", payload, format="json")
+
+    def setUp(self):
+        super().setUp()
+        self.import_sheet(
+            [("Asha", 1, "111", (90, 95, 85, 92)), ("Bikash", 2, "222", (20, 50, 60, 70))]
+        )
+
+    def test_unpublished_lookup_is_a_fixed_number_of_queries(self):
+        # Snapshot miss, then the marks row and the subject marks
+        with self.assertNumQueries(3):
+            response = self.lookup(school_name="  test   SCHOOL ", section_name="a")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["student"], "Bikash")
+        self.assertEqual(response.data["rank"], 2)
+        self.assertEqual(response.data["result"], "Fail")
+        self.assertEqual(response.data["grade"], "-")
+        self.assertEqual(response.data["subjects"]["English"], 20)
+
+    def test_lookup_misses(self):
+        self.assertEqual(
+            self.lookup(school_name="Other School").data["error"], "School not found"
+        )
+        self.assertEqual(
+            self.lookup(otp="999").data["error"],
+            "No student found with provided details",
+        )
+
+        Student.objects.create(
+            school=self.school,
+            class_obj=self.class_obj,
+            section=self.section,
+            name="New",
+            roll_no=3,
+            otp="333",
+        )
+        response = self.lookup(roll_no=3, otp="333")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["error"], "Marks not found for this student")
+
+    def test_school_name_key_follows_renames(self):
+        self.school.name = "Renamed  School"
+        self.school.save(update_fields=["name"])
+        self.school.refresh_from_db()
+        self.assertEqual(self.school.name_key, "renamed school")
+
+
+class PublishedResultTests(MarksheetTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.import_sheet(
+            [("Asha", 1, "111", (90, 95, 85, 92)), ("Bikash", 2, "222", (20, 50, 60, 70))]
+        )
+        self.client.force_authenticate(self.user)
+        response = self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data["term"]["published_at"])
+
+    def lookup(self):
+        return self.client.post(
+            "/exams/marksheet/single/",
+            {
+                "school_name": "test school",
+                "grade": 5,
+                "section_name": "A",
+                "roll_no": 1,
+                "otp": "111",
+            },
+            format="json",
+        )
+
+    def class_results(self):
+        return self.client.get(
+            "/exams/student-marks/",
+            {
+                "school_id": self.school.id,
+                "grade": 5,
+                "section_name": "A",
+                "term_id": self.term.id,
+            },
+        )
+
+    def test_published_results_are_served_from_snapshot(self):
+        self.assertEqual(PublishedResult.objects.filter(term=self.term).count(), 2)
+        with self.assertNumQueries(1):
+            response = self.lookup()
+        self.assertEqual(response.data["total_marks"], 362)
+        self.assertEqual(response.data["rank"], 1)
+
+        live = self.class_results().data["data"]
+        self.client.delete(f"/exams/terms/{self.term.id}/publish/")
+        self.assertFalse(PublishedResult.objects.exists())
+        self.assertEqual(self.class_results().data["data"], live)
+
+    def test_mark_edit_invalidates_group_snapshot(self):
+        computer = Subject.objects.create(
+            name="Computer", class_obj=self.class_obj, section=self.section
+        )
+        self.client.post(
+            "/students/student-subject-marks/",
+            {
+                "student_marks": StudentMarks.objects.get(student__roll_no=1).id,
+                "subject": computer.id,
+                "marks_obtained": 40,
+            },
+        )
+
+        self.assertFalse(PublishedResult.objects.exists())
+        self.assertEqual(self.lookup().data["total_marks"], 402)
+        self.assertEqual(self.class_results().data["data"][0]["total_marks"], 402)
+
+    def test_reimport_invalidates_group_snapshot(self):
+        self.import_sheet(
+            [("Asha", 1, "111", (10, 10, 10, 10)), ("Bikash", 2, "222", (20, 50, 60, 70))]
+        )
+        self.assertFalse(PublishedResult.objects.exists())
+        self.assertEqual(self.lookup().data["rank"], 2)
+
+    def test_student_edit_invalidates_group_snapshot(self):
+        student = Student.objects.get(roll_no=2)
+        student.name = "Bikash Thapa"
+        student.save()
+
+        self.assertFalse(PublishedResult.objects.exists())
+        data = self.class_results().data["data"]
+        self.assertEqual([row["student"] for row in data], ["Asha", "Bikash Thapa"])
+
+        self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        Student.objects.get(roll_no=2).delete()
+        self.assertFalse(PublishedResult.objects.exists())
+        self.assertEqual(len(self.class_results().data["data"]), 1)
+
+    def test_student_edit_resets_import_and_snapshot_together(self):
+        upload = build_marksheet(
+            [("Asha", 1, "111", (90, 95, 85, 92)), ("Bikash", 2, "222", (20, 50, 60, 70))]
+        ).getvalue()
+
+        def reupload():
+            file = io.BytesIO(upload)
+            file.name = "marksheet.xlsx"
+            return self.import_sheet(None, file=file)
+
+        reupload()
+        self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        self.assertTrue(ImportedMarksheet.objects.exists())
+
+        student = Student.objects.get(roll_no=2)
+        student.name = "Renamed"
+        student.save()
+        self.assertFalse(ImportedMarksheet.objects.exists())
+        self.assertFalse(PublishedResult.objects.exists())
+
+        # The same bytes are imported again, not answered from the record,
+        # and the live and republished group results agree
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(reupload().status_code, 200)
+        self.assertGreater(len(queries), 1)
+        self.assertTrue(ImportedMarksheet.objects.exists())
+        live = self.class_results().data["data"]
+        self.assertEqual([row["student"] for row in live], ["Asha", "Renamed"])
+        self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        self.assertEqual(PublishedResult.objects.count(), 2)
+        self.assertEqual(self.class_results().data["data"], live)
+
+    def test_rename_invalidates_snapshots(self):
+        self.school.address = "Kathmandu"
+        self.school.save()
+        self.term.save()
+        self.assertEqual(PublishedResult.objects.count(), 2)
+
+        self.school.name = "Renamed School"
+        self.school.save()
+        self.assertFalse(PublishedResult.objects.exists())
+        self.assertEqual(self.lookup().status_code, 404)
+
+        self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        self.term.name = "Final"
+        self.term.save()
+        self.section.name = "a"
+        self.section.save()
+        self.assertFalse(PublishedResult.objects.exists())
+
+        self.client.post(f"/exams/terms/{self.term.id}/publish/")
+        self.section.name = "Rose"
+        self.section.save()
+        self.assertFalse(PublishedResult.objects.exists())
+        response = self.client.post(
+            "/exams/marksheet/single/",
+            {
+                "school_name": "renamed school",
+                "grade": 5,
+                "section_name": "rose",
+                "roll_no": 1,
+                "otp": "111",
+            },
+            format="json",
+        )
+        self.assertEqual(
+            (response.data["school"], response.data["term"], response.data["section"]),
+            ("Renamed School", "Final", "Rose"),
+        )
+
+
+class StudentMarksExportTests(MarksheetTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.import_sheet(
+            [
+                ("Asha", 1, "111", (60, 60, 60, 60)),
+                ("Bikash", 2, "222", (90, 90, 90, 90)),
+                ("Chandra", 3, "333", (10, 10, 10, 10)),
+            ]
+        )
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        params.setdefault("school", self.school.id)
+        params.setdefault("term", self.term.id)
+        return self.client.get("/exams/student-marks/export/", params)
+
+    def test_ndjson_export(self):
+        response = self.export(**{"class": self.class_obj.id, "section": self.section.id})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+
+        self.assertEqual([r["student"] for r in rows], ["Bikash", "Asha", "Chandra"])
+        self.assertEqual(rows[0]["subjects"]["Math"], 90)
+        self.assertEqual(rows[2]["grade"], "-")
+
+    def test_csv_export(self):
+        response = self.export(output="csv")
+        self.assertIn('filename="results_First.csv"', response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+        self.assertEqual(rows[0][:2], ["Student", "Roll No."])
+        self.assertEqual(rows[0][10:], sorted(SUBJECTS))
+        self.assertEqual(rows[1][:2], ["Bikash", "2"])
+        self.assertEqual(len(rows), 4)
+
+    def test_subject_marks_are_fetched_per_chunk(self):
+        # Rows in one query, subject marks once per chunk of two
+        with self.assertNumQueries(3):
+            results = list(iter_results(self.term, chunk_size=2))
+        self.assertEqual(len(results), 3)
+
+    def test_export_requires_owner(self):
+        other = User.objects.create_user(
+            email="other@example.com", name="Other", tc=True, password="pass"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.export().status_code, 403)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.export(output="xml").status_code, 400)
+
+
+class BlankMarksheetExportTests(MarksheetTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **headers):
+        params = {
+            "school": self.school.id,
+            "class": self.class_obj.id,
+            "section": self.section.id,
+            "term": self.term.id,
+        }
+        return self.client.get("/exams/marksheet/export/", params, headers=headers)
+
+    def test_template_headers(self):
+        response = self.export()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="marksheet_5_First.xlsx"', response["Content-Disposition"])
+        ws = openpyxl.load_workbook(io.BytesIO(response.content)).active
+        self.assertEqual(
+            [c.value for c in ws[4]], ["S.N.", "Student Name", "Roll No.", "OTP"] + SUBJECTS
+        )
+
+    def test_repeat_download_is_not_rebuilt(self):
+        first = self.export()
+        with mock.patch.object(
+            marksheet_generator, "build_blank_marksheet"
+        ) as build, CaptureQueriesContext(connection) as queries:
+            again = self.export()
+            not_modified = self.export(if_none_match=first["ETag"])
+        build.assert_not_called()
+        self.assertFalse(
+            [q for q in queries.captured_queries if "subject_subject" in q["sql"]]
+        )
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(
+            self.export(if_modified_since=first["Last-Modified"]).status_code, 304
+        )
+
+    def test_subject_change_gives_new_template(self):
+        first = self.export()
+        Subject.objects.create(name="Art", class_obj=self.class_obj, section=self.section)
+        response = self.export(if_none_match=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        ws = openpyxl.load_workbook(io.BytesIO(response.content)).active
+        self.assertEqual(ws.cell(row=4, column=9).value, "Art")
+
+
+class BulkMarksheetExportTests(MarksheetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        section_b = Section.objects.create(
+            name="B", class_obj=cls.class_obj, school=cls.school
+        )
+        Subject.objects.create(name="Art", class_obj=cls.class_obj, section=section_b)
+        class_6 = Class.objects.create(school=cls.school, grade=6)
+        Subject.objects.create(name="Music", class_obj=class_6)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def export(self):
+        return self.client.get(
+            "/exams/marksheet/export/bulk/",
+            {"school": self.school.id, "term": self.term.id},
+        )
+
+    def read_archive(self, response):
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        return {
+            name: [c.value for c in openpyxl.load_workbook(io.BytesIO(archive.read(name))).active[4]]
+            for name in archive.namelist()
+        }
+
+    def test_archive_has_every_class_and_section(self):
+        response = self.export()
+        self.assertEqual(response["Content-Type"], "application/zip")
+        sheets = self.read_archive(response)
+        self.assertEqual(
+            list(sheets),
+            [
+                "marksheet_5_A_First.xlsx",
+                "marksheet_5_B_First.xlsx",
+                "marksheet_6_First.xlsx",
+            ],
+        )
+        self.assertEqual(sheets["marksheet_5_A_First.xlsx"][4:], SUBJECTS)
+        self.assertEqual(sheets["marksheet_6_First.xlsx"][4:], ["Music"])
+
+    @override_settings(MARKSHEET_WORKER_PROCESSES=0)
+    def test_subjects_are_loaded_once_and_sheets_cached(self):
+        with self.assertNumQueries(1):
+            groups = blank_marksheet_groups(self.school)
+        self.assertEqual(len(groups), 3)
+
+        first = self.read_archive(self.export())
+        with mock.patch.object(bulk_marksheets, "build_blank_marksheet") as build:
+            again = self.read_archive(self.export())
+        build.assert_not_called()
+        self.assertEqual(first, again)
+
+    def test_export_requires_owner(self):
+        other = User.objects.create_user(
+            email="other@example.com", name="Other", tc=True, password="pass"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.export().status_code, 403)
+
+
+class MarksheetWorkbookImportTests(MarksheetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.section_b = Section.objects.create(
+            name="B", class_obj=cls.class_obj, school=cls.school
+        )
+        for name in SUBJECTS:
+            Subject.objects.create(
+                name=name, class_obj=cls.class_obj, section=cls.section_b
+            )
+
+    def import_workbook(self, sheets, **data):
+        data.setdefault("full_mark", 100)
+        data.setdefault("pass_mark", 33)
+        return self.client.post(
+            "/exams/marksheet/import/workbook/",
+            {"file": build_workbook(sheets), **data},
+            format="multipart",
+        )
+
+    def test_imports_every_sheet(self):
+        response = self.import_workbook(
+            [("A", make_rows(3)), (None, []), ("B", make_rows(2))]
+        )
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["imported"], 2)
+        self.assertEqual(
+            [(s["sheet"], s["status"], s["imported_rows"]) for s in report["sheets"]],
+            [("5-A", "imported", 3), ("5-B", "imported", 2)],
+        )
+        self.assertEqual(
+            StudentMarks.objects.filter(student__section=self.section_b).count(), 2
+        )
+
+        again = self.import_workbook([("A", make_rows(3)), ("B", make_rows(2))])
+        self.assertEqual(again.json()["unchanged"], 2)
+
+    @override_settings(MARKSHEET_WORKER_PROCESSES=0)
+    def test_metadata_is_resolved_in_one_batch(self):
+        content = build_workbook([("A", make_rows(1)), ("b", make_rows(1)), ("Z", [])])
+        sheets = [sheet for _, _, sheet in marksheet_importer._parse_workbook(content.read())]
+        with self.assertNumQueries(4):
+            matches = marksheet_importer._resolve_sheets(sheets)
+        self.assertEqual(matches[1][2], self.section_b)
+        self.assertEqual(matches[2], "Section 'Z' not found")
+
+    def test_failing_sheet_rolls_back_the_workbook(self):
+        response = self.import_workbook([("A", make_rows(3)), ("Z", make_rows(2))])
+        self.assertEqual(response.status_code, 400)
+        report = response.json()
+        self.assertFalse(report["committed"])
+        self.assertEqual(
+            [s["status"] for s in report["sheets"]], ["rolled_back", "failed"]
+        )
+        self.assertFalse(Student.objects.exists())
+        self.assertFalse(ImportedMarksheet.objects.exists())
+
+    def test_every_failing_sheet_is_reported(self):
+        response = self.import_workbook(
+            [("Z", make_rows(1)), ("A", make_rows(3)), ("Y", make_rows(2))]
+        )
+        report = response.json()
+        self.assertEqual(
+            [(s["status"], s.get("error")) for s in report["sheets"]],
+            [
+                ("failed", "Section 'Z' not found"),
+                ("rolled_back", None),
+                ("failed", "Section 'Y' not found"),
+            ],
+        )
+        self.assertEqual(report["failed"], 2)
+        self.assertFalse(Student.objects.exists())
+
+    def test_save_failure_still_reports_later_sheets(self):
+        save_sheet = marksheet_importer._save_sheet
+
+        def failing_save(sheet, *args):
+            if sheet.section_name == "A":
+                raise ValueError("disk full")
+            return save_sheet(sheet, *args)
+
+        with mock.patch.object(marksheet_importer, "_save_sheet", failing_save):
+            response = self.import_workbook([("A", make_rows(3)), ("B", make_rows(2))])
+        report = response.json()
+        self.assertEqual(
+            [s["status"] for s in report["sheets"]], ["failed", "rolled_back"]
+        )
+        self.assertNotIn("result_file", report["sheets"][1])
+        self.assertFalse(Student.objects.exists())
+        self.assertFalse(ImportedMarksheet.objects.exists())
+
+    def test_sheets_saved_separately(self):
+        response = self.import_workbook(
+            [("A", make_rows(3)), ("Z", make_rows(2))], atomic=False
+        )
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report["imported"], report["failed"]), (1, 1))
+        self.assertEqual(report["sheets"][1]["error"], "Section 'Z' not found")
+        self.assertEqual(Student.objects.count(), 3)
+
+
+class ScoringTests(TestCase):
+    def test_grades_follow_thresholds(self):
+        self.assertEqual(
+            [grade_for(p) for p in (0, 32.99, 33, 45, 50, 69.99, 70, 89, 90, 100)],
+            ["F", "F", "D", "C", "C+", "B", "B+", "A", "A+", "A+"],
+        )
+
+    def test_score_matrix(self):
+        scores = score_matrix(
+            [(90, 80), (50, 50), (30, 100), (80, 90), (100, 100)],
+            uniform_scheme(2, 100, 33),
+        )
+        self.assertEqual(scores.totals, [170, 100, 130, 170, 200])
+        self.assertEqual(scores.percentages, [85, 50, 65, 85, 100])
+        self.assertEqual(scores.passed, [True, True, False, True, True])
+        self.assertEqual(scores.grades, ["A", "C+", "-", "A", "A+"])
+        self.assertEqual(scores.ranks, [2, 5, 4, 2, 1])
+
+        empty = score_matrix([], uniform_scheme(2, 100, 33))
+        self.assertEqual((empty.totals, empty.ranks), ([], []))
+
+    def test_every_path_scores_alike(self):
+        rows = [("Asha", 1, "111", (45.5, 40, 50, 60)), ("Bikash", 2, "222", (90, 20, 90, 90))]
+        data = get_all_students_marksheet_data(build_marksheet(rows), pass_mark=33)
+        single = get_single_student_marksheet_data(build_marksheet(rows), "111", pass_mark=33)
+
+        self.assertEqual(data["students"][0]["English"], 45.5)
+        self.assertEqual(data["students"][0]["Total"], 195.5)
+        self.assertEqual(
+            {k: single["student_marksheet"][k] for k in ("Total", "Percentage", "Grade")},
+            {"Total": 195.5, "Percentage": 48.88, "Grade": "C"},
+        )
+        self.assertEqual(data["students"][1]["Grade"], "-")
+
+
+class GradingScaleTests(MarksheetTestMixin, TestCase):
+    BANDS = [
+        {"label": "Fail", "min_percentage": 0},
+        {"label": "Good", "min_percentage": 50},
+        {"label": "Best", "min_percentage": 75},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = f"/exams/grading-scale/{self.school.id}/"
+
+    def labels(self, term=None):
+        params = {"term": term.id} if term else {}
+        return [band["label"] for band in self.client.get(self.url, params).data["bands"]]
+
+    def test_term_scale_falls_back_to_school_then_default(self):
+        self.assertEqual(self.labels(), ["F", "D", "C", "C+", "B", "B+", "A", "A+"])
+
+        response = self.client.put(self.url, {"bands": self.BANDS}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.client.put(
+            self.url,
+            {"term": self.term.id, "bands": self.BANDS[:2]},
+            format="json",
+        )
+        other_term = ExamTerm.objects.create(school=self.school, name="Second")
+        self.assertEqual(self.labels(self.term), ["Fail", "Good"])
+        self.assertEqual(self.labels(other_term), ["Fail", "Good", "Best"])
+
+        self.client.delete(self.url + f"?term={self.term.id}")
+        self.assertEqual(self.labels(self.term), ["Fail", "Good", "Best"])
+        self.client.delete(self.url)
+        self.assertEqual(self.labels(self.term)[0], "F")
+
+    def test_compiled_scheme_is_cached_until_changed(self):
+        scheme = marking_scheme(
+            self.school, self.class_obj, self.section, self.term, SUBJECTS
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                marking_scheme(
+                    self.school, self.class_obj, self.section, self.term, SUBJECTS
+                ),
+                scheme,
+            )
+
+        self.client.put(self.url, {"bands": self.BANDS}, format="json")
+        Subject.objects.filter(name="Math").update(pass_mark=50)  # no signal
+        Subject.objects.get(name="Math").save()
+        changed = marking_scheme(
+            self.school, self.class_obj, self.section, self.term, SUBJECTS
+        )
+        self.assertEqual(changed.scale.labels, ("Fail", "Good", "Best"))
+        self.assertEqual(changed.pass_marks, (33, 33, 50, 33))
+
+    def test_calculate_grade_uses_school_scale(self):
+        self.import_sheet([("Asha", 1, "111", (80, 70, 60, 50))])
+        marks = StudentMarks.objects.get()
+        self.assertEqual(marks.calculate_grade(), "B")
+
+        self.client.put(self.url, {"bands": self.BANDS}, format="json")
+        self.assertEqual(marks.calculate_grade(), "Good")
+        self.client.put(
+            self.url, {"term": self.term.id, "bands": self.BANDS[:1]}, format="json"
+        )
+        self.assertEqual(marks.calculate_grade(), "Fail")
+
+    def test_import_uses_subject_marks_and_scale(self):
+        self.client.put(self.url, {"bands": self.BANDS}, format="json")
+        Subject.objects.filter(name="Science").update(full_mark=50, pass_mark=20)
+        Subject.objects.get(name="Science").save()
+
+        rows = [("Asha", 1, "111", (80, 70, 60, 25)), ("Bikash", 2, "222", (90, 90, 90, 15))]
+        self.import_sheet(rows)
+        asha, bikash = StudentMarks.objects.order_by("student__roll_no")
+        self.assertEqual((asha.percentage, asha.grade, asha.result), (67.14, "Good", "Pass"))
+        self.assertEqual(bikash.result, "Fail")
+
+        # A stricter pass mark re-grades the same upload
+        Subject.objects.filter(name="Math").update(pass_mark=65)
+        Subject.objects.get(name="Math").save()
+        self.import_sheet(rows)
+        asha.refresh_from_db()
+        self.assertEqual(asha.result, "Fail")
+
+
+class SheetReaderTests(TestCase):
+    def test_read_marksheet_streams_typed_rows(self):
+        sheet = read_marksheet(
+            build_marksheet(
+                [("Asha", 1, "111", (90, "45.5", None, "abs")), ("", 2, None, ()), ("Bad", "x", None, ())]
+            )
+        )
+
+        self.assertEqual(sheet.school_name, "Test School")
+        self.assertEqual(
+            (sheet.class_name, sheet.section_name, sheet.term_name), ("5", "A", "First")
+        )
+        self.assertEqual(sheet.subject_names, SUBJECTS)
+        self.assertEqual(len(sheet.rows), 1)
+        self.assertEqual(sheet.rows[0].name, "Asha")
+        self.assertEqual(sheet.rows[0].otp, "111")
+        self.assertEqual(sheet.rows[0].marks, (90.0, 45.5, 0.0, 0.0))
+        self.assertEqual([e["row"] for e in sheet.errors], [5, 7])
+
+    def test_delimited_marksheet_matches_excel(self):
+        rows = [("Asha, K.", 1, "0111", (90, "45.5", None, "abs")), ("", 2, None, ()), ("Bad", "x", None, ())]
+        excel = read_marksheet(build_marksheet(rows))
+
+        for delimiter, name in [(",", "m.csv"), (";", "m.csv"), ("\t", "m.tsv")]:
+            sheet = read_marksheet(build_delimited_marksheet(rows, delimiter, name))
+            self.assertEqual(sheet[:6], excel[:6])
+            self.assertEqual(
+                [(r.name, r.roll_no, r.otp, r.marks) for r in sheet.rows],
+                [(r.name, r.roll_no, r.otp, r.marks) for r in excel.rows],
+            )
+            self.assertEqual([e["row"] for e in sheet.errors], [5, 7])
+
+    def test_all_students_marksheet_data(self):
+        data = get_all_students_marksheet_data(
+            build_marksheet(make_rows(3)), pass_mark=33
+        )
+
+        self.assertEqual(data["class"], "5")
+        self.assertEqual(len(data["students"]), 3)
+        self.assertEqual(data["students"][0]["Total"], 260)
+        self.assertEqual(data["students"][0]["Result"], "PASS")
@@ -1,14 +1,22 @@
 from django.urls import path
 from .views import (
     AllMarksheetAPIView,
+    BulkMarksheetExportView,
     ExamTermCreateView,
     ExamMarksheetGenerateView,
     ExamTermListBySchoolView,
     ExamTermListByUserView,
     ExamTermListView,
+    ExamTermPublishView,
+    GradingScaleView,
     MarksheetExportView,
+    MarksheetImportJobCreateView,
+    MarksheetImportJobDownloadView,
+    MarksheetImportJobStatusView,
     MarksheetImportView,
+    MarksheetWorkbookImportView,
     SingleStudentMarksRetrieveView,
+    StudentMarksExportView,
     StudentMarksRetrieveView,
 )
 
@@ -17,9 +25,17 @@ urlpatterns = [
     path("terms/list/", ExamTermListView.as_view(), name="exam-term-list"),
     path("terms/<int:school_id>/", ExamTermListBySchoolView.as_view(), name="exam-term-list-by-school"),
     path("terms/", ExamTermListByUserView.as_view(), name="exam-terms-by-user"),
+    path("terms/<int:term_id>/publish/", ExamTermPublishView.as_view(), name="exam-term-publish"),
+    path("grading-scale/<int:school_id>/", GradingScaleView.as_view(), name="grading-scale"),
 
     # Export blank marksheet via query params
     path("marksheet/export/", MarksheetExportView.as_view(), name="marksheet-export"),
+    # Blank marksheets of every class/section of a school as one ZIP
+    path(
+        "marksheet/export/bulk/",
+        BulkMarksheetExportView.as_view(),
+        name="marksheet-export-bulk",
+    ),
     
     # Generate marksheet for a term/class/section
     path(
@@ -35,6 +51,29 @@ urlpatterns = [
 
     # Uploads filled marksheet with marks and stores in db
     path("marksheet/import/", MarksheetImportView.as_view(), name="marksheet-import"),
+    # One workbook with a marksheet per class/section sheet
+    path(
+        "marksheet/import/workbook/",
+        MarksheetWorkbookImportView.as_view(),
+        name="marksheet-import-workbook",
+    ),
+
+    # Background import jobs: queue an upload, poll its status, download result
+    path(
+        "marksheet/import/jobs/",
+        MarksheetImportJobCreateView.as_view(),
+        name="marksheet-import-job-create",
+    ),
+    path(
+        "marksheet/import/jobs/<uuid:job_id>/",
+        MarksheetImportJobStatusView.as_view(),
+        name="marksheet-import-job-status",
+    ),
+    path(
+        "marksheet/import/jobs/<uuid:job_id>/download/",
+        MarksheetImportJobDownloadView.as_view(),
+        name="marksheet-import-job-download",
+    ),
 
     # NEW: Single student marksheet by OTP
     path("marksheet/single/", SingleStudentMarksRetrieveView.as_view(), name="marksheet-single-otp"),
@@ -48,4 +87,11 @@ urlpatterns = [
         StudentMarksRetrieveView.as_view(),
         name='student-marks-retrieve'
     ),
+
+    # Streamed NDJSON/CSV export of a school's term results
+    path(
+        "student-marks/export/",
+        StudentMarksExportView.as_view(),
+        name="student-marks-export",
+    ),
 ]
@@ -0,0 +1,106 @@
+import io
+import zipfile
+from collections import deque
+from concurrent.futures import Future
+
+from exam.utils.marksheet_generator import (
+    blank_marksheet_args,
+    build_blank_marksheet,
+    cached_blank_marksheet,
+    store_blank_marksheet,
+)
+from exam.utils.process_pool import submit, worker_count
+from subject.models import Subject
+
+
+def blank_marksheet_groups(school):
+    """
+    Every (class, section, subject names) of a school that has subjects, in
+    grade and section order, from a single query. Subjects without a
+    section form the class-wide marksheet, as in the single export.
+    """
+    subjects = (
+        Subject.objects.filter(class_obj__school=school)
+        .select_related("class_obj", "section")
+        .order_by("class_obj__grade", "class_obj_id", "section__name", "section_id", "id")
+    )
+    groups = {}
+    for subject in subjects:
+        key = (subject.class_obj_id, subject.section_id)
+        if key not in groups:
+            groups[key] = (subject.class_obj, subject.section, [])
+        groups[key][2].append(subject.name)
+    return list(groups.values())
+
+
+def iter_blank_marksheets(school, term, groups):
+    """
+    Yield (class, section, BlankMarksheet) for each group, in order.
+
+    Cached templates are reused; the others are built in the workbook process
+    pool, a few sheets ahead of the consumer, and cached on the way out.
+    """
+    window = max(worker_count(), 1) * 2
+    pending = deque()
+
+    def resolve():
+        class_obj, section, subject_names, built = pending.popleft()
+        if isinstance(built, Future):
+            built = store_blank_marksheet(
+                school, class_obj, section, term, subject_names, built.result()
+            )
+        return class_obj, section, built
+
+    for class_obj, section, subject_names in groups:
+        built = cached_blank_marksheet(school, class_obj, section, term, subject_names)
+        if built is None:
+            built = submit(
+                build_blank_marksheet,
+                *blank_marksheet_args(school, class_obj, section, term, subject_names),
+            )
+        pending.append((class_obj, section, subject_names, built))
+        if len(pending) > window:
+            yield resolve()
+    while pending:
+        yield resolve()
+
+
+def bulk_entry_name(class_obj, section, term):
+    """Archive member name of a marksheet, unique per class and section."""
+    parts = ["marksheet", str(class_obj.grade)]
+    if section:
+        parts.append(section.name)
+    parts.append(term.name)
+    return "_".join(p.replace("/", "-") for p in parts) + ".xlsx"
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink whose data is taken out as it arrives."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def zip_stream(entries):
+    """
+    Yield a ZIP archive of (name, bytes) entries piece by piece. Members are
+    stored uncompressed: xlsx files are already deflated.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+            yield buffer.take()
+    yield buffer.take()
@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+
+def _digest(value):
+    return hashlib.sha256(
+        json.dumps(value, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+def file_fingerprint(file, full_mark, pass_mark):
+    """
+    Hash the raw bytes of an upload together with the marking scheme.
+    Identical uploads are recognised without parsing the workbook.
+    """
+    digest = hashlib.sha256(f"{full_mark}|{pass_mark}|".encode())
+    file.seek(0)
+    if hasattr(file, "chunks"):
+        for chunk in file.chunks():
+            digest.update(chunk)
+    else:
+        digest.update(file.read())
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def row_fingerprint(subject_names, marks, scheme):
+    """
+    Hash one student's marks with the MarkingScheme they were scored with;
+    unchanged rows are skipped on re-import.
+    """
+    return _digest([scheme, [name.lower() for name in subject_names], marks])
+
+
+def sheet_fingerprint(sheet, scheme):
+    """
+    Hash the normalized contents of a parsed marksheet and its marking
+    scheme, so a re-saved file with the same data matches even when its
+    bytes differ.
+    """
+    return _digest(
+        [
+            scheme,
+            [
+                sheet.school_name.lower(),
+                sheet.class_name.lower(),
+                sheet.section_name.lower(),
+                sheet.term_name.lower(),
+            ],
+            [name.lower() for name in sheet.subject_names],
+            [
+                [str(row.name).strip(), row.roll_no, str(row.otp or ""), row.marks]
+                for row in sheet.rows
+            ],
+        ]
+    )
@@ -0,0 +1,99 @@
+"""
+Grading scales and subject marking of a school, compiled once and kept in
+process.
+
+Compiled values are stored with the school's cache version (see
+djangoauthapi/cache.py) and rebuilt when it changes: a grading scale, grade
+band or subject change bumps the version through the model signals, in
+every process that shares the cache backend. Scoring a sheet then costs a
+cache version read, never a query per student.
+"""
+from djangoauthapi.cache import school_version
+from exam.models import GradeBand
+from exam.utils.scoring import DEFAULT_SCALE, GradeScale, MarkingScheme
+from subject.models import Subject
+
+DEFAULT_FULL_MARK = 100.0
+DEFAULT_PASS_MARK = 33.0
+
+# (kind, school id, ...) -> (school version, compiled value)
+_compiled = {}
+
+
+def _cached(key, school_id, build):
+    version = school_version(school_id)
+    entry = _compiled.get(key)
+    if entry is None or entry[0] != version:
+        entry = (version, build())
+        _compiled[key] = entry
+    return entry[1]
+
+
+def compile_scale(bands):
+    """GradeScale of (label, min_percentage) bands; DEFAULT_SCALE if none."""
+    bands = sorted(bands, key=lambda band: band[1])
+    if not bands:
+        return DEFAULT_SCALE
+    return GradeScale(
+        thresholds=tuple(minimum for _, minimum in bands[1:]),
+        labels=tuple(label for label, _ in bands),
+    )
+
+
+def grading_scale(school_id, term_id=None):
+    """
+    The GradeScale of a term: its own scale, else the school's scale for
+    all terms, else DEFAULT_SCALE.
+    """
+
+    def build():
+        bands = {}
+        for scale_term_id, label, minimum in GradeBand.objects.filter(
+            scale__school=school_id
+        ).values_list("scale__term_id", "label", "min_percentage"):
+            bands.setdefault(scale_term_id, []).append((label, minimum))
+        own = bands.get(term_id) if term_id is not None else None
+        return compile_scale(own or bands.get(None, []))
+
+    return _cached(("scale", school_id, term_id), school_id, build)
+
+
+def subject_marks(school_id, class_id, section_id):
+    """Configured (full_mark, pass_mark) by lower-cased subject name."""
+
+    def build():
+        return {
+            name.lower(): (full_mark, pass_mark)
+            for name, full_mark, pass_mark in Subject.objects.filter(
+                class_obj=class_id, section=section_id
+            ).values_list("name", "full_mark", "pass_mark")
+        }
+
+    return _cached(("subjects", school_id, class_id, section_id), school_id, build)
+
+
+def marking_scheme(
+    school, class_obj, section, term, subject_names, full_mark=None, pass_mark=None
+):
+    """
+    MarkingScheme of a sheet's subject columns for a class/section/term.
+    Subjects use their own full and pass marks; the ones without fall back
+    to `full_mark`/`pass_mark` (e.g. from the upload), then the defaults.
+    """
+    configured = subject_marks(
+        school.id, class_obj.id, section.id if section else None
+    )
+    fallback = (
+        float(full_mark if full_mark is not None else DEFAULT_FULL_MARK),
+        float(pass_mark if pass_mark is not None else DEFAULT_PASS_MARK),
+    )
+    full_marks, pass_marks = [], []
+    for name in subject_names:
+        subject_full, subject_pass = configured.get(name.lower(), (None, None))
+        full_marks.append(float(subject_full) if subject_full is not None else fallback[0])
+        pass_marks.append(float(subject_pass) if subject_pass is not None else fallback[1])
+    return MarkingScheme(
+        full_marks=tuple(full_marks),
+        pass_marks=tuple(pass_marks),
+        scale=grading_scale(school.id, term.id),
+    )
@@ -1,29 +1,44 @@
+import hashlib
 import io
+import json
+from collections import namedtuple
+
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.utils import timezone
 from openpyxl.utils import get_column_letter
 
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# A generated blank marksheet: file bytes, validator and build time
+BlankMarksheet = namedtuple(
+    "BlankMarksheet", ["content", "etag", "last_modified", "filename"]
+)
 
-def generate_blank_marksheet(school, class_obj, section, term, subjects):
+
+def build_blank_marksheet(school_name, grade, section_name, term_name, subject_names):
     """
-    Generate a styled blank marksheet Excel file for manual entry.
-    Auto-fills SN and Roll No 1–20.
+    Build a styled blank marksheet Excel file for manual entry and return
+    its bytes. Takes plain values only, so it can run in another process.
+    Auto-fills SN and Roll No 1–5.
     """
     wb = openpyxl.Workbook()
     ws = wb.active
 
     # Safe sheet title
-    sheet_title = f"{getattr(class_obj, 'grade', '')}-{getattr(term, 'name', '')}"
+    sheet_title = f"{grade}-{term_name}"
     for ch in ["[", "]", ":", "*", "?", "/", "\\"]:
         sheet_title = sheet_title.replace(ch, "")
     ws.title = sheet_title[:31] if sheet_title else "Marksheet"
 
     # Title rows (row 1–3)
-    school_name = f"School: {getattr(school, 'name', '-')}"
-    class_name = f"Class: {getattr(class_obj, 'grade', '-')}"
-    section_name = f"Section: {getattr(section, 'name', '-') if section else '-'}"
-    term_name = f"Term: {getattr(term, 'name', '-')}"
+    school_name = f"School: {school_name or '-'}"
+    class_name = f"Class: {grade or '-'}"
+    section_name = f"Section: {section_name or '-'}"
+    term_name = f"Term: {term_name or '-'}"
 
     # Fonts & alignment
     title_font = Font(bold=True, size=18, color="4F81BD")
@@ -31,13 +46,13 @@ def generate_blank_marksheet(school, class_obj, section, term, subjects):
     center_align = Alignment(horizontal="center", vertical="center")
 
     # Merge & style School Name row
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(subjects) + 3)
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(subject_names) + 3)
     ws["A1"].value = school_name
     ws["A1"].font = title_font
     ws["A1"].alignment = center_align
 
     # Merge & style Class/Section/Term row
-    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=len(subjects) + 3)
+    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=len(subject_names) + 3)
     ws["A2"].value = f"{class_name} | {section_name} | {term_name}"
     ws["A2"].font = sub_title_font
     ws["A2"].alignment = center_align
@@ -46,9 +61,7 @@ def generate_blank_marksheet(school, class_obj, section, term, subjects):
     ws["A3"].value = ""
 
     # Header row (row 4)
-    headers = ["S.N.", "Student Name", "Roll No.", "OTP"] + [
-        getattr(sub, "name", str(sub)) for sub in subjects
-    ]
+    headers = ["S.N.", "Student Name", "Roll No.", "OTP"] + list(subject_names)
     ws.append(headers)
 
     # Styling
@@ -74,7 +87,7 @@ def generate_blank_marksheet(school, class_obj, section, term, subjects):
 
     # Pre-fill 20 rows SN/Roll
     for i in range(1, 6):
-        ws.append([i, "", i] + [""] * len(subjects))
+        ws.append([i, "", i] + [""] * len(subject_names))
 
     # Alternating row fill for readability
     fill_odd = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
@@ -108,15 +121,74 @@ def generate_blank_marksheet(school, class_obj, section, term, subjects):
 
     # Freeze header row
     ws.freeze_panes = ws["A5"]
-    # Save to response
+
     stream = io.BytesIO()
     wb.save(stream)
-    stream.seek(0)
+    return stream.getvalue()
+
+
+def blank_marksheet_filename(class_obj, term):
+    return f"marksheet_{getattr(class_obj, 'grade', '-')}_{getattr(term, 'name', '-')}.xlsx"
+
 
-    filename = f"marksheet_{getattr(class_obj, 'grade', '-')}_{getattr(term, 'name', '-')}.xlsx"
-    response = HttpResponse(
-        stream.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+def blank_marksheet_args(school, class_obj, section, term, subject_names):
+    """The plain build_blank_marksheet arguments of a marksheet."""
+    return (
+        school.name,
+        class_obj.grade,
+        section.name if section else None,
+        term.name,
+        list(subject_names),
     )
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+
+
+def _template_key(school, class_obj, section, term, subject_names):
+    # A digest of everything the file shows, so renaming the school or term
+    # or changing the subjects gives a new template (and ETag)
+    section_key = [section.id, section.name] if section else None
+    return hashlib.sha256(
+        json.dumps(
+            [
+                [school.id, school.name],
+                [class_obj.id, class_obj.grade],
+                section_key,
+                [term.id, term.name],
+                list(subject_names),
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def cached_blank_marksheet(school, class_obj, section, term, subject_names):
+    """The cached BlankMarksheet of a marksheet, or None if not built yet."""
+    digest = _template_key(school, class_obj, section, term, subject_names)
+    return cache.get(f"blank-marksheet:{digest}")
+
+
+def store_blank_marksheet(school, class_obj, section, term, subject_names, content):
+    """Cache the built `content` of a marksheet and return its BlankMarksheet."""
+    digest = _template_key(school, class_obj, section, term, subject_names)
+    template = BlankMarksheet(
+        content=content,
+        etag=f'"{digest[:32]}"',
+        last_modified=timezone.now().replace(microsecond=0),
+        filename=blank_marksheet_filename(class_obj, term),
+    )
+    cache.set(f"blank-marksheet:{digest}", template)
+    return template
+
+
+def blank_marksheet_template(school, class_obj, section, term, subject_names):
+    """
+    Return the BlankMarksheet for a school/class/section/term and ordered
+    subject names, from the cache when it was built before.
+    """
+    template = cached_blank_marksheet(school, class_obj, section, term, subject_names)
+    if template is None:
+        content = build_blank_marksheet(
+            *blank_marksheet_args(school, class_obj, section, term, subject_names)
+        )
+        template = store_blank_marksheet(
+            school, class_obj, section, term, subject_names, content
+        )
+    return template
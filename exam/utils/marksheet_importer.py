@@ -1,271 +1,273 @@
-import io
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from django.http import HttpResponse
-from openpyxl.cell.cell import MergedCell
-from openpyxl.utils import get_column_letter
+from contextlib import nullcontext
+from functools import partial
 
+from django.core.files import File
+from django.db import transaction
 
-def generate_marksheet_with_results(
-    file, full_mark, pass_mark, school=None, class_obj=None, section=None, term=None
-):
-    wb = openpyxl.load_workbook(file)
-    ws = wb.active
+from classes.models import Class
+from exam.models import ExamTerm, ImportedMarksheet
+from exam.utils.fingerprint import file_fingerprint, sheet_fingerprint
+from exam.utils.grading import marking_scheme
+from exam.utils.marksheet_results import compute_marksheet_results
+from exam.utils.marksheet_writer import save_marksheet_results
+from exam.utils.process_pool import submit, worker_count
+from exam.utils.result_lookup import normalize_section_name
+from exam.utils.result_workbook import results_workbook_file
+from exam.utils.sheet_reader import read_marksheet, read_workbook_sheets
+from school.models import School, normalize_school_name
+from section.models import Section
 
-    # === Read existing Excel info ===
-    excel_school = (
-        str(ws.cell(row=1, column=1).value or "").replace("School:", "").strip()
-    )
-    excel_class = (
-        str(ws.cell(row=2, column=1).value or "").replace("Class:", "").strip()
-    )
 
-    # Prefer model attributes, fallback to Excel
-    school_name = getattr(school, "name", None) or excel_school or "-"
-    class_grade = (
-        getattr(class_obj, "grade", getattr(class_obj, "name", None))
-        or excel_class
-        or "-"
-    )
-    section_name = getattr(section, "name", "-") if section else "-"
-    term_name = getattr(term, "name", "-")
-
-    # === Styles ===
-    title_font = Font(bold=True, size=18, color="4F81BD")
-    sub_title_font = Font(bold=True, size=12, color="4F81BD")
-    header_font = Font(bold=True, color="FFFFFF")
-    center_align = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-    header_fill = PatternFill(
-        start_color="4F81BD", end_color="4F81BD", fill_type="solid"
-    )
-    pass_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    fail_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    alt_fill_odd = PatternFill(
-        start_color="F2F2F2", end_color="F2F2F2", fill_type="solid"
+class MarksheetImportError(ValueError):
+    """Raised when an uploaded marksheet cannot be matched to the DB."""
+
+
+def _check_metadata(sheet):
+    if not all(
+        [sheet.school_name, sheet.class_name, sheet.section_name, sheet.term_name]
+    ):
+        raise MarksheetImportError(
+            "School, Class, Section, or Term not found in Excel."
+        )
+
+
+def _save_sheet(
+    sheet, school, class_obj, section, term, full_mark, pass_mark, file_hash=None
+):
+    """
+    Score and save a parsed sheet of a class/section/term and store its
+    result workbook. Returns (ImportedMarksheet, changed); nothing is
+    written when the stored content fingerprint matches.
+
+    Subjects are marked with their own full and pass marks and the term's
+    grading scale (see grading.marking_scheme); `full_mark`/`pass_mark`
+    only apply to subjects without their own.
+    """
+    scheme = marking_scheme(
+        school, class_obj, section, term, sheet.subject_names, full_mark, pass_mark
     )
-    alt_fill_even = PatternFill(
-        start_color="FFFFFF", end_color="FFFFFF", fill_type="solid"
+    content_hash = sheet_fingerprint(sheet, scheme)
+    imported = ImportedMarksheet.objects.filter(
+        term=term, class_obj=class_obj, section=section
+    ).first() or ImportedMarksheet(term=term, class_obj=class_obj, section=section)
+    imported.file_hash = file_hash or content_hash
+
+    if imported.content_hash == content_hash and imported.result_file:
+        imported.save(update_fields=["file_hash", "updated_at"])
+        return imported, False
+    previous_file = imported.result_file.name
+
+    # Score the sheet once; both the DB and the styled Excel use it
+    results = compute_marksheet_results(sheet, scheme)
+    save_marksheet_results(
+        school, class_obj, section, term, results, full_mark, pass_mark
     )
 
-    # === Header row (assume row 4) ===
-    header_row = 4
-    headers = [cell.value for cell in ws[header_row]]
-
-    # Identify subject columns, skip OTP if present
-    subject_cols = []
-    for idx, header in enumerate(headers[3:], start=4):  # columns 4 onward
-        if str(header).strip().upper() not in [
-            "OTP",
-            "TOTAL",
-            "PERCENTAGE",
-            "GRADE",
-            "RESULT",
-            "RANK",
-        ]:
-            subject_cols.append(idx)
-
-    num_subjects = len(subject_cols)
-    last_subject_col = subject_cols[-1]  # last actual subject column
-
-    # === Clean top rows ===
-    for merge in list(ws.merged_cells.ranges):
-        if merge.min_row <= 3:
-            ws.unmerge_cells(str(merge))
-
-    for r in [1, 2, 3]:
-        for c in range(1, last_subject_col + 6):  # extra columns for total/grade/rank
-            cell = ws.cell(row=r, column=c)
-            if not isinstance(cell, MergedCell):
-                cell.value = None
-
-    # Row 1: School name
-    ws.merge_cells(
-        start_row=1, start_column=1, end_row=1, end_column=last_subject_col + 5
+    with results_workbook_file(results, school, class_obj, section, term) as file:
+        imported.result_file.save(
+            f"marksheet_result_{term.id}_{class_obj.id}_{section.id}.xlsx",
+            File(file),
+            save=False,
+        )
+
+    skipped = sum(1 for error in sheet.errors if error.get("skipped"))
+    imported.content_hash = content_hash
+    imported.total_rows = len(results.students) + skipped
+    imported.imported_rows = len(results.students)
+    imported.errors = sheet.errors
+    imported.save()
+
+    # The superseded workbook goes once the new one is committed
+    if previous_file:
+        transaction.on_commit(partial(imported.result_file.storage.delete, previous_file))
+    return imported, True
+
+
+def import_marksheet(file, full_mark, pass_mark):
+    """
+    Parse, score and save an uploaded marksheet and store its result workbook.
+    Returns the ImportedMarksheet of the class/section/term.
+
+    Re-uploading a file that was already imported only costs a hash
+    comparison: the stored result workbook is returned without parsing the
+    sheet or touching the marks. A re-saved sheet with the same contents is
+    recognised after parsing, and otherwise only changed rows are written.
+    """
+    file_hash = file_fingerprint(file, full_mark, pass_mark)
+    imported = (
+        ImportedMarksheet.objects.filter(file_hash=file_hash)
+        .exclude(result_file="")
+        .first()
     )
-    ws["A1"].value = f"School: {school_name}"
-    ws["A1"].font = title_font
-    ws["A1"].alignment = center_align
+    if imported:
+        return imported
 
-    # Row 2: Class + Section + Term
-    ws.merge_cells(
-        start_row=2, start_column=1, end_row=2, end_column=last_subject_col + 5
-    )
-    ws["A2"].value = (
-        f"Class: {class_grade} | Section: {section_name} | Term: {term_name}"
-    )
-    ws["A2"].font = sub_title_font
-    ws["A2"].alignment = center_align
-
-    ws["A3"].value = ""  # spacing row
-
-    # === Add new headers: Total, Percentage, Grade, Result, Rank ===
-    ws.cell(row=header_row, column=last_subject_col + 1, value="Total")
-    ws.cell(row=header_row, column=last_subject_col + 2, value="Percentage")
-    ws.cell(row=header_row, column=last_subject_col + 3, value="Grade")
-    ws.cell(row=header_row, column=last_subject_col + 4, value="Result")
-    ws.cell(row=header_row, column=last_subject_col + 5, value="Rank")
-    rank_col = last_subject_col + 5
-
-    # Style headers
-    for col_num in range(1, rank_col + 1):
-        cell = ws.cell(row=header_row, column=col_num)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-        cell.border = thin_border
-
-    # === Grade function ===
-    def get_grade(pct):
-        if pct >= 90:
-            return "A+"
-        elif pct >= 80:
-            return "A"
-        elif pct >= 70:
-            return "B+"
-        elif pct >= 60:
-            return "B"
-        elif pct >= 50:
-            return "C+"
-        elif pct >= 40:
-            return "C"
-        elif pct >= 33:
-            return "D"
-        else:
-            return "F"
+    sheet = read_marksheet(file)
+    _check_metadata(sheet)
 
-    # === First pass: calculate totals ===
-    student_totals = {}  # row_idx -> total
-    for row_idx in range(header_row + 1, ws.max_row + 1):
-        sn_cell = ws.cell(row=row_idx, column=1).value
-        if not sn_cell or not str(sn_cell).isdigit():
-            continue
+    # Fetch DB objects
+    school = School.objects.get(name_key=normalize_school_name(sheet.school_name))
+    grade_int = int(sheet.class_name)
+    class_obj = Class.objects.get(grade=grade_int, school=school)
+    section = Section.objects.get(name__iexact=sheet.section_name, class_obj=class_obj)
+    term = ExamTerm.objects.get(name__iexact=sheet.term_name, school=school)
 
-        total_marks = 0
-        for col_idx in subject_cols:
-            cell = ws.cell(row=row_idx, column=col_idx)
-            try:
-                mark = int(cell.value) if cell.value not in [None, ""] else 0
-            except:
-                mark = 0
-            total_marks += mark
-        student_totals[row_idx] = total_marks
-
-    # === Rank calculation ===
-    sorted_totals = sorted(student_totals.items(), key=lambda x: x[1], reverse=True)
-    rank_map = {}
-    current_rank = 0
-    last_total = None
-
-    for idx, (row_idx, total) in enumerate(sorted_totals, start=1):
-        if total != last_total:
-            current_rank = idx
-        rank_map[row_idx] = current_rank
-        last_total = total
-
-    # === Helper: Convert number to ordinal ===
-    def ordinal(n):
-        if 10 <= n % 100 <= 20:
-            suffix = "th"
-        else:
-            suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
-        return f"{n}{suffix}"
-
-    # === Second pass: write results ===
-    for row_idx, total_marks in student_totals.items():
-        overall_pass = True
-
-        # Subject marks with pass/fail coloring
-        for col_idx in subject_cols:
-            cell = ws.cell(row=row_idx, column=col_idx)
-            try:
-                mark = int(cell.value) if cell.value not in [None, ""] else 0
-            except:
-                mark = 0
-
-            if mark < pass_mark:
-                overall_pass = False
-                cell.fill = fail_fill
-            else:
-                cell.fill = pass_fill
-
-            cell.alignment = center_align
-            cell.border = thin_border
-
-        # Total
-        total_cell = ws.cell(row=row_idx, column=last_subject_col + 1)
-        total_cell.value = total_marks
-        total_cell.alignment = center_align
-        total_cell.border = thin_border
-
-        # Percentage
-        pct = round((total_marks / (full_mark * num_subjects)) * 100, 2)
-        pct_cell = ws.cell(row=row_idx, column=last_subject_col + 2)
-        pct_cell.value = pct
-        pct_cell.alignment = Alignment(horizontal="left", vertical="center")
-        pct_cell.border = thin_border
-
-        # Grade
-        grade_cell = ws.cell(row=row_idx, column=last_subject_col + 3)
-        grade_cell.value = get_grade(pct) if overall_pass else "-"
-        grade_cell.alignment = center_align
-        grade_cell.border = thin_border
-
-        # Result
-        result_cell = ws.cell(row=row_idx, column=last_subject_col + 4)
-        result_cell.value = "PASS" if overall_pass else "FAIL"
-        result_cell.fill = pass_fill if overall_pass else fail_fill
-        result_cell.alignment = center_align
-        result_cell.font = Font(bold=True)
-        result_cell.border = thin_border
-
-        # Rank
-        rank_cell = ws.cell(row=row_idx, column=last_subject_col + 5)
-        rank_cell.value = ordinal(rank_map[row_idx])
-        rank_cell.alignment = center_align
-        rank_cell.border = thin_border
-
-        # Alternating row fill for SN, Name, Roll
-        row_fill = alt_fill_odd if row_idx % 2 else alt_fill_even
-        for col_idx in range(1, 4):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.fill = row_fill
-            cell.border = thin_border
-            if col_idx == 2:
-                cell.alignment = Alignment(horizontal="left", vertical="center")
-            else:
-                cell.alignment = center_align
-
-    # === Auto column widths ===
-    for i, col_cells in enumerate(ws.columns, start=1):
-        max_length = 0
-        column_letter = get_column_letter(i)
-        for cell in col_cells:
-            if isinstance(cell, MergedCell):
-                continue
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        ws.column_dimensions[column_letter].width = max_length + 2
-
-    # Adjust SN and Name width
-    ws.column_dimensions["A"].width = 5
-    ws.column_dimensions["B"].width = 25
-
-    # Freeze headers
-    ws.freeze_panes = ws[f"A{header_row + 1}"]
-
-    # === Return Excel file ===
-    stream = io.BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-    response = HttpResponse(
-        stream.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    imported, _ = _save_sheet(
+        sheet, school, class_obj, section, term, full_mark, pass_mark, file_hash
     )
-    response["Content-Disposition"] = 'attachment; filename="marksheet_result.xlsx"'
-    return response
+    return imported
+
+
+def _parse_workbook(content):
+    """
+    (index, title, Marksheet) of every worksheet, in workbook order. The
+    sheets are split over the workbook process pool, one slice per worker.
+    """
+    step = max(worker_count(), 1)
+    futures = [
+        submit(read_workbook_sheets, content, start, step) for start in range(step)
+    ]
+    sheets = [sheet for future in futures for sheet in future.result()]
+    return sorted(sheets, key=lambda sheet: sheet[0])
+
+
+def _resolve_sheets(sheets):
+    """
+    Match parsed sheets to their (school, class, section, term) with one
+    query per model for the whole workbook. Returns the tuple, or the
+    reason it could not be matched, for each sheet.
+    """
+    school_keys = {normalize_school_name(sheet.school_name) for sheet in sheets}
+    grades = {
+        int(sheet.class_name) for sheet in sheets if sheet.class_name.isdigit()
+    }
+    schools = {
+        school.name_key: school
+        for school in School.objects.filter(name_key__in=school_keys)
+    }
+    classes = {
+        (c.school_id, c.grade): c
+        for c in Class.objects.filter(school__in=schools.values(), grade__in=grades)
+    }
+    sections = {
+        (s.class_obj_id, normalize_section_name(s.name)): s
+        for s in Section.objects.filter(class_obj__in=classes.values())
+    }
+    terms = {
+        (t.school_id, t.name.strip().casefold()): t
+        for t in ExamTerm.objects.filter(school__in=schools.values())
+    }
+
+    matches = []
+    for sheet in sheets:
+        school = schools.get(normalize_school_name(sheet.school_name))
+        class_obj = school and sheet.class_name.isdigit() and classes.get(
+            (school.id, int(sheet.class_name))
+        )
+        section = class_obj and sections.get(
+            (class_obj.id, normalize_section_name(sheet.section_name))
+        )
+        term = school and terms.get((school.id, sheet.term_name.casefold()))
+        if not school:
+            matches.append(f"School {sheet.school_name!r} not found")
+        elif not class_obj:
+            matches.append(f"Class {sheet.class_name!r} not found")
+        elif not section:
+            matches.append(f"Section {sheet.section_name!r} not found")
+        elif not term:
+            matches.append(f"Term {sheet.term_name!r} not found")
+        else:
+            matches.append((school, class_obj, section, term))
+    return matches
+
+
+class _Rollback(Exception):
+    pass
+
+
+def import_workbook(file, full_mark, pass_mark, atomic=True):
+    """
+    Import a workbook with one marksheet per sheet (e.g. every class and
+    section of a school) and return a report of each sheet.
+
+    Sheets are parsed in the workbook process pool and matched to the DB in
+    one batch, and every sheet is checked before any is saved so the report
+    lists all their errors at once. With `atomic`, the sheets are saved in
+    one transaction and any failing sheet rolls all of them back (nothing
+    is saved if a sheet fails its checks); otherwise each sheet is saved on
+    its own and failures are only reported. Empty sheets are skipped.
+    """
+    file.seek(0)
+    content = file.read()
+    file.seek(0)
+
+    parsed = [
+        (title, sheet)
+        for _, title, sheet in _parse_workbook(content)
+        if sheet.headers or sheet.rows or sheet.school_name
+    ]
+    matches = _resolve_sheets([sheet for _, sheet in parsed])
+
+    report = []
+    valid = []
+    for (title, sheet), match in zip(parsed, matches):
+        entry = {
+            "sheet": title,
+            "class": sheet.class_name,
+            "section": sheet.section_name,
+            "term": sheet.term_name,
+        }
+        report.append(entry)
+        try:
+            _check_metadata(sheet)
+            if isinstance(match, str):
+                raise MarksheetImportError(match)
+        except MarksheetImportError as e:
+            entry.update(status="failed", error=str(e))
+            continue
+        valid.append((entry, sheet, match))
+
+    written = []
+    try:
+        if atomic and len(valid) < len(report):
+            raise _Rollback
+        with transaction.atomic() if atomic else nullcontext():
+            for entry, sheet, match in valid:
+                try:
+                    with transaction.atomic():
+                        imported, changed = _save_sheet(
+                            sheet, *match, full_mark, pass_mark
+                        )
+                except Exception as e:
+                    entry.update(status="failed", error=str(e))
+                    continue
+
+                if changed:
+                    written.append(imported)
+                entry.update(
+                    status="imported" if changed else "unchanged",
+                    total_rows=imported.total_rows,
+                    imported_rows=imported.imported_rows,
+                    errors=imported.errors,
+                    result_file=imported.result_file.url,
+                )
+            # The other sheets were still saved to report their errors too
+            if atomic and any(entry["status"] == "failed" for entry in report):
+                raise _Rollback
+    except _Rollback:
+        # Nothing was saved: drop the result workbooks already stored
+        for imported in written:
+            imported.result_file.delete(save=False)
+        for entry in report:
+            if entry.get("status") != "failed":
+                entry.update(status="rolled_back")
+                entry.pop("result_file", None)
+
+    statuses = [entry["status"] for entry in report]
+    return {
+        "committed": not (atomic and "failed" in statuses),
+        "imported": statuses.count("imported"),
+        "unchanged": statuses.count("unchanged"),
+        "failed": statuses.count("failed"),
+        "sheets": report,
+    }
@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+from exam.utils.scoring import score_matrix
+
+# Scored result of one student row; `marks` follow the sheet's subject order
+StudentResult = namedtuple(
+    "StudentResult",
+    ["row", "marks", "total", "percentage", "grade", "passed", "rank"],
+)
+
+MarksheetResults = namedtuple("MarksheetResults", ["sheet", "scheme", "students"])
+
+
+def plain_number(value):
+    """Whole-number floats as int (80.0 -> 80), for JSON output."""
+    return int(value) if float(value).is_integer() else value
+
+
+def ordinal(n):
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def compute_marksheet_results(sheet, scheme):
+    """
+    Score a parsed marksheet once with a MarkingScheme of its subject
+    columns (see scoring.score_matrix): totals, percentage, grade,
+    pass/fail and rank for every student row that has a name and roll
+    number.
+    Both the DB writer and the result workbook consume the returned model.
+    Ties share a rank and the next rank is skipped (1, 2, 2, 4).
+    """
+    rows = [row for row in sheet.rows if row.name and row.roll_no]
+    scores = score_matrix([row.marks for row in rows], scheme)
+
+    students = [
+        StudentResult(
+            row=row,
+            marks=row.marks,
+            total=total,
+            percentage=percentage,
+            grade=grade,
+            passed=passed,
+            rank=rank,
+        )
+        for row, total, percentage, passed, grade, rank in zip(
+            rows,
+            scores.totals,
+            scores.percentages,
+            scores.passed,
+            scores.grades,
+            scores.ranks,
+        )
+    ]
+    return MarksheetResults(sheet=sheet, scheme=scheme, students=students)
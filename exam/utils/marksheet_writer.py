@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.utils import timezone
+
+from exam.utils.fingerprint import row_fingerprint
+from exam.utils.published_results import invalidate_published_results
+from students.models import Student, StudentMarks, StudentSubjectMarks
+from students.ranking import refresh_group_ranks
+from subject.models import Subject
+
+
+def save_marksheet_results(
+    school, class_obj, section, term, results, full_mark=None, pass_mark=None
+):
+    """
+    Save scored marksheet results (see marksheet_results) with a fixed
+    number of queries. `full_mark`/`pass_mark` are the upload's marks the
+    results were scored with, kept on the rows to score them again later.
+
+    Existing students, marks and subject marks for the class/section/term
+    are loaded up front and the writes are done with bulk inserts/updates
+    inside a single transaction, so the query count does not grow with the
+    number of rows. Rows whose marks fingerprint matches the stored one are
+    left untouched. Returns the number of rows that changed.
+    """
+    # Last row wins when a roll number is repeated in the sheet
+    rows_by_roll = {}
+    for result in results.students:
+        rows_by_roll[int(result.row.roll_no)] = result
+    if not rows_by_roll:
+        return 0
+
+    subjects = {
+        s.name.lower(): s
+        for s in Subject.objects.filter(class_obj=class_obj, section=section)
+    }
+    sheet_subjects = [
+        subjects.get(name.lower()) for name in results.sheet.subject_names
+    ]
+
+    with transaction.atomic():
+        # === Students: create the missing ones, keep existing as they are ===
+        Student.objects.bulk_create(
+            [
+                Student(
+                    school=school,
+                    class_obj=class_obj,
+                    section=section,
+                    roll_no=roll_no,
+                    name=result.row.name,
+                    otp=result.row.otp or "",
+                )
+                for roll_no, result in rows_by_roll.items()
+            ],
+            ignore_conflicts=True,
+        )
+        students = {
+            s.roll_no: s
+            for s in Student.objects.filter(
+                school=school,
+                class_obj=class_obj,
+                section=section,
+                roll_no__in=rows_by_roll,
+            )
+        }
+
+        # === Marks rows for this term ===
+        marks_by_student = {
+            sm.student_id: sm
+            for sm in StudentMarks.objects.filter(
+                term=term, student__in=students.values()
+            )
+        }
+        missing = [
+            StudentMarks(student=student, term=term)
+            for student in students.values()
+            if student.id not in marks_by_student
+        ]
+        if missing:
+            StudentMarks.objects.bulk_create(missing)
+            marks_by_student = {
+                sm.student_id: sm
+                for sm in StudentMarks.objects.filter(
+                    term=term, student__in=students.values()
+                )
+            }
+
+        now = timezone.now()
+        changed = []
+        subject_marks = []
+        for roll_no, result in rows_by_roll.items():
+            student_marks = marks_by_student[students[roll_no].id]
+
+            # Skip rows whose marks are the same as the last import
+            marks_hash = row_fingerprint(
+                results.sheet.subject_names, result.marks, results.scheme
+            )
+            if student_marks.marks_hash == marks_hash:
+                continue
+
+            for subj, mark in zip(sheet_subjects, result.marks):
+                if subj:
+                    subject_marks.append(
+                        StudentSubjectMarks(
+                            student_marks=student_marks,
+                            subject=subj,
+                            marks_obtained=mark,
+                        )
+                    )
+
+            student_marks.total_marks = result.total
+            student_marks.percentage = result.percentage
+            student_marks.grade = result.grade
+            student_marks.result = "Pass" if result.passed else "Fail"
+            student_marks.marks_hash = marks_hash
+            student_marks.full_mark = full_mark
+            student_marks.pass_mark = pass_mark
+            student_marks.updated_at = now
+            changed.append(student_marks)
+
+        StudentMarks.objects.bulk_update(
+            changed,
+            [
+                "total_marks",
+                "percentage",
+                "grade",
+                "result",
+                "marks_hash",
+                "full_mark",
+                "pass_mark",
+                "updated_at",
+            ],
+        )
+
+        # === Subject marks: upsert on (student_marks, subject) ===
+        if subject_marks:
+            StudentSubjectMarks.objects.bulk_create(
+                subject_marks,
+                update_conflicts=True,
+                unique_fields=["student_marks", "subject"],
+                update_fields=["marks_obtained"],
+            )
+
+        # === Ranks and published snapshot of the class/section/term group ===
+        if changed:
+            refresh_group_ranks(term, class_obj, section)
+            invalidate_published_results(term, class_obj, section)
+
+    return len(changed)
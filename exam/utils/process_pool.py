@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.MARKSHEET_WORKER_PROCESSES
+            )
+        return _executor
+
+
+def worker_count():
+    """Number of worker processes; 0 means work is done in the caller."""
+    return max(settings.MARKSHEET_WORKER_PROCESSES, 0)
+
+
+def submit(fn, *args):
+    """
+    Run `fn(*args)` in the shared workbook process pool and return its
+    Future, or run it right away when there are no worker processes.
+    `fn` and its arguments must be picklable: plain values, no model
+    instances or DB access.
+    """
+    if worker_count():
+        return _get_executor().submit(fn, *args)
+    future = Future()
+    future.set_result(fn(*args))
+    return future
@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
+
+from exam.models import PublishedResult
+from exam.utils.result_lookup import normalize_section_name, result_payload
+from students.models import StudentMarks, StudentSubjectMarks
+
+
+def publish_term(term):
+    """
+    Materialize the result of every student of `term` into PublishedResult
+    rows, replacing any earlier snapshot, and mark the term as published.
+    Returns the number of results published.
+    """
+    student_marks = (
+        StudentMarks.objects.filter(term=term)
+        .select_related(
+            "student__school", "student__class_obj", "student__section", "term"
+        )
+        .prefetch_related(
+            Prefetch(
+                "subject_marks",
+                queryset=StudentSubjectMarks.objects.select_related("subject"),
+            )
+        )
+    )
+
+    snapshots = []
+    for sm in student_marks:
+        student = sm.student
+        subject_marks = {s.subject.name: s.marks_obtained for s in sm.subject_marks.all()}
+        snapshots.append(
+            PublishedResult(
+                term=term,
+                class_obj_id=student.class_obj_id,
+                section_id=student.section_id,
+                student_marks=sm,
+                school_key=student.school.name_key,
+                grade=student.class_obj.grade,
+                section_key=normalize_section_name(student.section.name),
+                roll_no=student.roll_no,
+                otp=student.otp,
+                rank=sm.rank,
+                payload=result_payload(sm, subject_marks),
+            )
+        )
+
+    with transaction.atomic():
+        PublishedResult.objects.filter(term=term).delete()
+        PublishedResult.objects.bulk_create(snapshots, batch_size=500)
+        term.published_at = timezone.now()
+        term.save(update_fields=["published_at"])
+    return len(snapshots)
+
+
+def unpublish_term(term):
+    """Drop the snapshot of `term`; its results are computed live again."""
+    with transaction.atomic():
+        PublishedResult.objects.filter(term=term).delete()
+        term.published_at = None
+        term.save(update_fields=["published_at"])
+
+
+def invalidate_published_results(term, class_obj, section):
+    """
+    Drop the snapshot rows of one class/section/term group after its marks
+    changed (ranks are relative to the group, so the whole group goes).
+    The group is served live until the term is published again. Accepts
+    model instances or ids.
+    """
+    PublishedResult.objects.filter(
+        term=term, class_obj=class_obj, section=section
+    ).delete()
+
+
+def published_group_results(term, class_obj, section):
+    """Snapshot payloads of one group in rank order, empty if not published."""
+    if not term.published_at:
+        return []
+    return list(
+        PublishedResult.objects.filter(term=term, class_obj=class_obj, section=section)
+        .order_by(F("rank").asc(nulls_last=True), "roll_no")
+        .values_list("payload", flat=True)
+    )
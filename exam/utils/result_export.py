@@ -0,0 +1,105 @@
+import csv
+import json
+
+from django.db.models import F
+
+from exam.utils.result_lookup import result_payload
+from students.models import StudentMarks, StudentSubjectMarks
+from subject.models import Subject
+
+EXPORT_CHUNK_SIZE = 500
+
+CSV_COLUMNS = [
+    ("student", "Student"),
+    ("roll_no", "Roll No."),
+    ("class_name", "Class"),
+    ("section", "Section"),
+    ("term", "Term"),
+    ("total_marks", "Total"),
+    ("percentage", "Percentage"),
+    ("grade", "Grade"),
+    ("result", "Result"),
+    ("rank", "Rank"),
+]
+
+
+def iter_results(term, class_obj=None, section=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the result payload (see result_payload) of every student of a
+    term, optionally limited to a class and section, in class, section and
+    rank order.
+
+    Rows are read with `.iterator(chunk_size)` and the subject marks of
+    each chunk are fetched with one values query, so at most one chunk is
+    held in memory whatever the number of students.
+    """
+    student_marks = StudentMarks.objects.filter(term=term)
+    if class_obj is not None:
+        student_marks = student_marks.filter(student__class_obj=class_obj)
+    if section is not None:
+        student_marks = student_marks.filter(student__section=section)
+
+    student_marks = student_marks.select_related(
+        "student__school", "student__class_obj", "student__section", "term"
+    ).order_by(
+        "student__class_obj__grade",
+        "student__section_id",
+        F("rank").asc(nulls_last=True),
+        "student__roll_no",
+    )
+
+    chunk = []
+    for sm in student_marks.iterator(chunk_size=chunk_size):
+        chunk.append(sm)
+        if len(chunk) == chunk_size:
+            yield from _chunk_results(chunk)
+            chunk = []
+    yield from _chunk_results(chunk)
+
+
+def _chunk_results(chunk):
+    if not chunk:
+        return
+    subject_marks = {sm.id: {} for sm in chunk}
+    for student_marks_id, name, marks in StudentSubjectMarks.objects.filter(
+        student_marks__in=chunk
+    ).order_by("id").values_list("student_marks_id", "subject__name", "marks_obtained"):
+        subject_marks[student_marks_id][name] = marks
+    for sm in chunk:
+        yield result_payload(sm, subject_marks[sm.id])
+
+
+def export_subject_names(term, class_obj=None, section=None):
+    """Subject columns of a CSV export: every subject name of the selection."""
+    subjects = Subject.objects.filter(class_obj__school=term.school_id)
+    if class_obj is not None:
+        subjects = subjects.filter(class_obj=class_obj)
+    if section is not None:
+        subjects = subjects.filter(section=section)
+    return list(
+        subjects.order_by("name").values_list("name", flat=True).distinct()
+    )
+
+
+def ndjson_lines(results):
+    """One JSON document per result, newline delimited."""
+    for result in results:
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(results, subject_names):
+    """CSV rows of the results: the fixed columns, then one per subject."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([title for _, title in CSV_COLUMNS] + subject_names)
+    for result in results:
+        yield writer.writerow(
+            [result[key] for key, _ in CSV_COLUMNS]
+            + [result["subjects"].get(name, "") for name in subject_names]
+        )
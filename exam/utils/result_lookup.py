@@ -0,0 +1,92 @@
+from exam.models import PublishedResult
+from school.models import School, normalize_school_name
+from students.models import Student, StudentMarks, StudentSubjectMarks
+
+
+def normalize_section_name(name):
+    """Case-insensitive form of a section name, see PublishedResult.section_key."""
+    return str(name).strip().casefold()
+
+
+def result_payload(student_marks, subject_marks):
+    """
+    Result of one student as the result endpoints return it.
+    `student_marks` needs its student, school, class, section and term loaded;
+    `subject_marks` maps subject name to marks obtained.
+    """
+    student = student_marks.student
+    return {
+        "student": student.name,
+        "roll_no": student.roll_no,
+        "school": student.school.name,
+        "class_name": student.class_obj.grade,
+        "section": student.section.name,
+        "term": student_marks.term.name,
+        "total_marks": student_marks.total_marks,
+        "percentage": student_marks.percentage,
+        "grade": student_marks.grade if student_marks.result == "Pass" else "-",
+        "result": student_marks.result,
+        "rank": student_marks.rank,
+        "subjects": subject_marks,
+    }
+
+
+def lookup_student_result(school_name, grade, section_name, roll_no, otp):
+    """
+    Find one student's result for the public result search.
+
+    Results of a published term are one indexed query on the PublishedResult
+    snapshot. Otherwise a hit costs two more indexed queries: the marks row
+    joined to its student, school, class, section and term (school by
+    School.name_key, student by the (school, class, section, roll_no, otp)
+    index), then the subject marks. The stored StudentMarks.rank is used as
+    is. Misses fall through to extra queries only to tell which part was
+    wrong; they raise School.DoesNotExist, Student.DoesNotExist or
+    StudentMarks.DoesNotExist.
+    """
+    name_key = normalize_school_name(school_name)
+
+    published = (
+        PublishedResult.objects.filter(
+            school_key=name_key,
+            grade=grade,
+            section_key=normalize_section_name(section_name),
+            roll_no=roll_no,
+            otp=str(otp),
+        )
+        .order_by("student_marks_id")
+        .values_list("payload", flat=True)
+        .first()
+    )
+    if published is not None:
+        return published
+
+    student_filter = {
+        "school__name_key": name_key,
+        "class_obj__grade": grade,
+        "section__name__iexact": str(section_name).strip(),
+        "roll_no": roll_no,
+        "otp": otp,
+    }
+
+    student_marks = (
+        StudentMarks.objects.select_related(
+            "student__school", "student__class_obj", "student__section", "term"
+        )
+        .filter(**{f"student__{k}": v for k, v in student_filter.items()})
+        .order_by("id")
+        .first()
+    )
+    if student_marks is None:
+        if not School.objects.filter(name_key=name_key).exists():
+            raise School.DoesNotExist
+        if not Student.objects.filter(**student_filter).exists():
+            raise Student.DoesNotExist
+        raise StudentMarks.DoesNotExist
+
+    subject_marks = dict(
+        StudentSubjectMarks.objects.filter(student_marks=student_marks).values_list(
+            "subject__name", "marks_obtained"
+        )
+    )
+    return result_payload(student_marks, subject_marks)
@@ -0,0 +1,189 @@
+import tempfile
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from exam.utils.marksheet_results import ordinal
+
+HEADER_ROW = 4
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+
+def _fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def _named_styles():
+    """
+    The styles of a result sheet, registered once per workbook; cells only
+    reference them by name.
+    """
+    center = Alignment(horizontal="center", vertical="center")
+    left = Alignment(horizontal="left", vertical="center")
+    side = Side(style="thin")
+    border = Border(left=side, right=side, top=side, bottom=side)
+    pass_fill = _fill("C6EFCE")
+    fail_fill = _fill("FFC7CE")
+
+    styles = [
+        NamedStyle("result_title", font=Font(bold=True, size=18, color="4F81BD"), alignment=center),
+        NamedStyle("result_subtitle", font=Font(bold=True, size=12, color="4F81BD"), alignment=center),
+        NamedStyle(
+            "result_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=_fill("4F81BD"),
+            alignment=center,
+            border=border,
+        ),
+        NamedStyle("result_cell", alignment=center, border=border),
+        NamedStyle("result_cell_left", alignment=left, border=border),
+        NamedStyle("result_mark_pass", fill=pass_fill, alignment=center, border=border),
+        NamedStyle("result_mark_fail", fill=fail_fill, alignment=center, border=border),
+        NamedStyle(
+            "result_pass", font=Font(bold=True), fill=pass_fill, alignment=center, border=border
+        ),
+        NamedStyle(
+            "result_fail", font=Font(bold=True), fill=fail_fill, alignment=center, border=border
+        ),
+    ]
+    # Student columns alternate their fill by row
+    for parity, color in (("odd", "F2F2F2"), ("even", "FFFFFF")):
+        styles.append(
+            NamedStyle(f"result_base_{parity}", fill=_fill(color), alignment=center, border=border)
+        )
+        styles.append(
+            NamedStyle(f"result_name_{parity}", fill=_fill(color), alignment=left, border=border)
+        )
+    return styles
+
+
+def _width(value):
+    return len(str(value)) if value not in (None, "") else 0
+
+
+def write_results_workbook(
+    results, file, school=None, class_obj=None, section=None, term=None
+):
+    """
+    Write the styled result sheet of scored marksheet results (see
+    marksheet_results) to `file` (a path or binary file object).
+
+    The workbook is built in write-only mode: rows are serialized as they
+    are appended, cells reference named styles, and column widths come from
+    the result values rather than from a scan of the written cells.
+    """
+    sheet = results.sheet
+
+    # Prefer model attributes, fallback to Excel
+    school_name = getattr(school, "name", None) or sheet.school_name or "-"
+    class_grade = (
+        getattr(class_obj, "grade", getattr(class_obj, "name", None))
+        or sheet.class_name
+        or "-"
+    )
+    section_name = getattr(section, "name", "-") if section else "-"
+    term_name = getattr(term, "name", "-")
+
+    has_otp = [h.upper() for h in sheet.headers[3:4]] == ["OTP"]
+    base_headers = sheet.headers[: 4 if has_otp else 3]
+    headers = (
+        base_headers
+        + sheet.subject_names
+        + ["Total", "Percentage", "Grade", "Result", "Rank"]
+    )
+
+    # One row of values per student, also the source of the column widths
+    rows = []
+    for student in results.students:
+        row = student.row
+        rows.append(
+            [row.sn, row.name, row.roll_no, row.otp][: len(base_headers)]
+            + list(student.marks)
+            + [
+                student.total,
+                student.percentage,
+                student.grade,
+                "PASS" if student.passed else "FAIL",
+                ordinal(student.rank),
+            ]
+        )
+
+    wb = openpyxl.Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet("Marksheet")
+
+    # Sheet settings must be in place before the first row is written
+    widths = [_width(h) for h in headers]
+    for values in rows:
+        widths = [max(w, _width(v)) for w, v in zip(widths, values)]
+    for col_idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width + 2
+    # Adjust SN and Name width
+    ws.column_dimensions["A"].width = 5
+    ws.column_dimensions["B"].width = 25
+    ws.freeze_panes = f"A{HEADER_ROW + 1}"
+
+    last_col = get_column_letter(len(headers))
+    ws.merged_cells.add(f"A1:{last_col}1")
+    ws.merged_cells.add(f"A2:{last_col}2")
+
+    def cell(value, style):
+        c = WriteOnlyCell(ws, value=value)
+        c.style = style
+        return c
+
+    ws.append([cell(f"School: {school_name}", "result_title")])
+    ws.append(
+        [
+            cell(
+                f"Class: {class_grade} | Section: {section_name} | Term: {term_name}",
+                "result_subtitle",
+            )
+        ]
+    )
+    ws.append([])  # spacing row
+    ws.append([cell(h, "result_header") for h in headers])
+
+    num_base = len(base_headers)
+    num_subjects = len(sheet.subject_names)
+    for row_idx, (student, values) in enumerate(
+        zip(results.students, rows), start=HEADER_ROW + 1
+    ):
+        parity = "odd" if row_idx % 2 else "even"
+        out = [
+            cell(v, f"result_name_{parity}" if col == 1 else f"result_base_{parity}")
+            for col, v in enumerate(values[:num_base])
+        ]
+        out += [
+            cell(mark, "result_mark_fail" if mark < pass_mark else "result_mark_pass")
+            for mark, pass_mark in zip(
+                values[num_base : num_base + num_subjects], results.scheme.pass_marks
+            )
+        ]
+        total, percentage, grade, result, rank = values[num_base + num_subjects :]
+        out += [
+            cell(total, "result_cell"),
+            cell(percentage, "result_cell_left"),
+            cell(grade, "result_cell"),
+            cell(result, "result_pass" if student.passed else "result_fail"),
+            cell(rank, "result_cell"),
+        ]
+        ws.append(out)
+
+    wb.save(file)
+
+
+def results_workbook_file(results, school=None, class_obj=None, section=None, term=None):
+    """
+    The result sheet in an anonymous temporary file, positioned at the
+    start, ready to be streamed or stored without an in-memory copy.
+    """
+    file = tempfile.TemporaryFile()
+    write_results_workbook(results, file, school, class_obj, section, term)
+    file.seek(0)
+    return file
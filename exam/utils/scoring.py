@@ -0,0 +1,86 @@
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import repeat
+from operator import ge
+
+# Lowest percentage of each grade, ascending; below the first one is "F"
+GRADE_THRESHOLDS = (33, 40, 50, 60, 70, 80, 90)
+GRADE_LABELS = ("F", "D", "C", "C+", "B", "B+", "A", "A+")
+
+# A compiled grading scale: `labels` has one more entry than `thresholds`,
+# for percentages below the first threshold
+GradeScale = namedtuple("GradeScale", ["thresholds", "labels"])
+DEFAULT_SCALE = GradeScale(GRADE_THRESHOLDS, GRADE_LABELS)
+
+# How a sheet is marked: full and pass marks per subject column, and the
+# grade scale
+MarkingScheme = namedtuple("MarkingScheme", ["full_marks", "pass_marks", "scale"])
+
+# Column-wise scores of a marks matrix, one entry per student row
+Scores = namedtuple("Scores", ["totals", "percentages", "passed", "grades", "ranks"])
+
+
+def uniform_scheme(num_subjects, full_mark, pass_mark, scale=DEFAULT_SCALE):
+    """A MarkingScheme with the same full and pass marks for every subject."""
+    return MarkingScheme(
+        full_marks=(full_mark,) * num_subjects,
+        pass_marks=(pass_mark,) * num_subjects,
+        scale=scale,
+    )
+
+
+def grade_for(percentage, scale=DEFAULT_SCALE):
+    """Grade of a percentage: the label of the highest threshold it reaches."""
+    return scale.labels[bisect_right(scale.thresholds, percentage)]
+
+
+def competition_ranks(totals):
+    """
+    Rank of each total, highest first. Ties share a rank and the next one
+    is skipped (1, 2, 2, 4): a rank is the first position of its total in
+    the totals sorted in descending order.
+    """
+    first_position = {}
+    for position, total in enumerate(sorted(totals, reverse=True), start=1):
+        first_position.setdefault(total, position)
+    return list(map(first_position.__getitem__, totals))
+
+
+def score_matrix(marks, scheme):
+    """
+    Score a students x subjects marks matrix (a sequence of rows of floats,
+    one column per subject of the MarkingScheme) and return its Scores.
+
+    Each score is computed for the whole matrix in one pass: totals,
+    percentages of the summed full marks, pass flags (every subject at
+    least its pass mark), grades by binary search in the sorted thresholds
+    ("-" for a fail) and tie-aware ranks by total. Every result path scores
+    marks through here.
+    """
+    max_total = sum(scheme.full_marks)
+    pass_marks = scheme.pass_marks
+    thresholds, labels = scheme.scale
+
+    # Row-wise reductions run through map() so the loops stay in C
+    totals = list(map(float, map(sum, marks)))
+    percentages = (
+        [round((total / max_total) * 100, 2) for total in totals]
+        if max_total
+        else [0] * len(totals)
+    )
+    if not pass_marks:
+        passed = [True] * len(totals)
+    elif len(set(pass_marks)) == 1:
+        pass_mark = pass_marks[0]
+        passed = [lowest >= pass_mark for lowest in map(min, marks)]
+    else:
+        passed = [all(map(ge, row, pass_marks)) for row in marks]
+    buckets = map(bisect_right, repeat(thresholds), percentages)
+    grades = [labels[bucket] if ok else "-" for bucket, ok in zip(buckets, passed)]
+    return Scores(
+        totals=totals,
+        percentages=percentages,
+        passed=passed,
+        grades=grades,
+        ranks=competition_ranks(totals),
+    )
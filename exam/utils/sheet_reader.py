@@ -0,0 +1,234 @@
+import codecs
+import csv
+import io
+import os
+from collections import namedtuple
+
+import openpyxl
+
+HEADER_ROW = 4
+XLSX_MAGIC = b"PK\x03\x04"
+DELIMITERS = ",\t;"
+NON_SUBJECT_HEADERS = ["OTP", "TOTAL", "PERCENTAGE", "GRADE", "RESULT", "RANK"]
+
+# One student row of a marksheet: marks follow the order of `subject_names`
+MarksheetRow = namedtuple("MarksheetRow", ["sn", "name", "roll_no", "otp", "marks"])
+
+Marksheet = namedtuple(
+    "Marksheet",
+    [
+        "school_name",
+        "class_name",
+        "section_name",
+        "term_name",
+        "headers",
+        "subject_names",
+        "rows",
+        "errors",
+    ],
+)
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ""
+
+
+def _parse_metadata(title_row, info_row):
+    """
+    Read school, class, section and term from the two title rows.
+    Row 2 is either one merged "Class: x | Section: y | Term: z" cell or
+    the three parts in separate cells.
+    """
+    school_name = _text(title_row[0] if title_row else None).replace("School:", "")
+    class_name = section_name = term_name = ""
+
+    parts = " | ".join(_text(v) for v in info_row if _text(v)).split("|")
+    for part in (p.strip() for p in parts):
+        if part.startswith("Class:"):
+            class_name = part.replace("Class:", "").strip()
+        elif part.startswith("Section:"):
+            section_name = part.replace("Section:", "").strip()
+        elif part.startswith("Term:"):
+            term_name = part.replace("Term:", "").strip()
+
+    return school_name.strip(), class_name, section_name, term_name
+
+
+def iter_marksheet_rows(rows, headers, errors=None, first_row=HEADER_ROW + 1):
+    """
+    Yield a MarksheetRow for every student row of `rows` (value tuples
+    following the header row). Column layout: S.N., Name, Roll No., OTP,
+    then subjects. Rows without a name are skipped; problems with a row
+    (missing/invalid roll number, unreadable marks) are appended to
+    `errors` as {"row": <sheet row>, "error": <message>}, with
+    "skipped": True when the row could not be imported at all.
+    """
+    if errors is None:
+        errors = []
+    has_otp = len(headers) > 3 and headers[3].upper() == "OTP"
+    subject_idx = [
+        idx
+        for idx, header in enumerate(headers[3:], start=3)
+        if header and header.upper() not in NON_SUBJECT_HEADERS
+    ]
+
+    for row_number, values in enumerate(rows, start=first_row):
+        values = tuple(values) + (None,) * (len(headers) - len(values))
+        name = values[1] if len(values) > 1 else None
+        if name in [None, ""]:
+            continue
+
+        try:
+            roll_no = int(values[2])
+        except (TypeError, ValueError):
+            errors.append(
+                {
+                    "row": row_number,
+                    "error": f"Invalid roll number {values[2]!r}, row skipped",
+                    "skipped": True,
+                }
+            )
+            continue
+
+        marks = []
+        for idx in subject_idx:
+            try:
+                marks.append(float(values[idx] or 0))
+            except (TypeError, ValueError):
+                errors.append(
+                    {
+                        "row": row_number,
+                        "error": f"Invalid mark {values[idx]!r} for {headers[idx]}, using 0",
+                    }
+                )
+                marks.append(0.0)
+
+        yield MarksheetRow(
+            sn=values[0],
+            name=name,
+            roll_no=roll_no,
+            otp=values[3] if has_otp else None,
+            marks=tuple(marks),
+        )
+
+
+def _read_rows(rows):
+    """Build a Marksheet from an iterator of row value tuples, title rows first."""
+    rows = iter(rows)
+
+    top = []
+    for values in rows:
+        top.append(values)
+        if len(top) == HEADER_ROW:
+            break
+    top += [()] * (HEADER_ROW - len(top))
+
+    school_name, class_name, section_name, term_name = _parse_metadata(
+        top[0], top[1]
+    )
+    headers = [_text(v) for v in top[HEADER_ROW - 1]]
+    while headers and not headers[-1]:
+        headers.pop()
+
+    subject_names = [
+        header
+        for header in headers[3:]
+        if header and header.upper() not in NON_SUBJECT_HEADERS
+    ]
+
+    errors = []
+    return Marksheet(
+        school_name=school_name,
+        class_name=class_name,
+        section_name=section_name,
+        term_name=term_name,
+        headers=headers,
+        subject_names=subject_names,
+        rows=list(iter_marksheet_rows(rows, headers, errors)),
+        errors=errors,
+    )
+
+
+def _read_worksheet(ws):
+    return _read_rows(ws.iter_rows(values_only=True))
+
+
+def is_xlsx(file):
+    """True if `file` (path or binary file object) is an xlsx (zip) file."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return f.read(4) == XLSX_MAGIC
+    file.seek(0)
+    magic = file.read(4)
+    file.seek(0)
+    return magic == XLSX_MAGIC
+
+
+def _delimiter(sample, name):
+    if name.lower().endswith((".tsv", ".tab")):
+        return "\t"
+    # The title rows are usually single cells, so sniff from the header row
+    table = "\n".join(sample.splitlines()[HEADER_ROW - 1 :])
+    try:
+        return csv.Sniffer().sniff(table, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        return max(DELIMITERS, key=table.count)
+
+
+def read_delimited_marksheet(file):
+    """
+    Parse a CSV or TSV marksheet (UTF-8, same layout as the Excel sheet:
+    title rows, then the header row) from a binary file object.
+
+    Lines are decoded and parsed as they are read, and rows go through the
+    same header and subject column detection as the Excel reader. The
+    delimiter comes from the file extension (.tsv) or is sniffed.
+    """
+    file.seek(0)
+    sample = file.read(8192).decode("utf-8-sig", errors="ignore")
+    file.seek(0)
+    delimiter = _delimiter(sample, getattr(file, "name", None) or "")
+
+    lines = codecs.iterdecode(iter(file), "utf-8-sig")
+    try:
+        return _read_rows(csv.reader(lines, delimiter=delimiter))
+    finally:
+        file.seek(0)
+
+
+def read_marksheet(file):
+    """
+    Parse a marksheet upload and return a Marksheet of its active sheet.
+    CSV/TSV uploads are read by read_delimited_marksheet.
+
+    Workbooks are opened in read-only mode and only cell values are
+    streamed (`iter_rows(values_only=True)`), so no cell object graph is
+    built and memory stays bounded by the rows kept.
+    """
+    if not is_xlsx(file):
+        return read_delimited_marksheet(file)
+
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        return _read_worksheet(wb.active)
+    finally:
+        wb.close()
+
+
+def read_workbook_sheets(content, start=0, step=1):
+    """
+    Parse every `step`-th worksheet of a workbook, from index `start`, and
+    return (index, title, Marksheet) tuples.
+
+    Takes the workbook bytes, so disjoint slices of one upload can be
+    parsed in separate processes, each opening the workbook once.
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        return [
+            (index, ws.title, _read_worksheet(ws))
+            for index, ws in enumerate(wb.worksheets)
+            if index >= start and (index - start) % step == 0
+        ]
+    finally:
+        wb.close()
@@ -6,9 +6,13 @@ from rest_framework.permissions import IsAuthenticated
 
 import openpyxl
 from openpyxl.utils import get_column_letter
+from django.db import transaction
+from django.db.models import F, Prefetch
 from django.shortcuts import get_object_or_404
+from djangoauthapi.cache import cached_for_owner, cached_for_school
+from djangoauthapi.ownership import owns_school
 from exam.utils.all_marksheet import get_all_students_marksheet_data
-from exam.utils.marksheet_generator import generate_blank_marksheet
+from exam.utils.marksheet_generator import XLSX_CONTENT_TYPE, blank_marksheet_template
 from rest_framework.parsers import MultiPartParser
 
 from exam.utils.single_marksheet import get_single_student_marksheet_data
@@ -17,12 +21,37 @@ from students.models import Student, StudentMarks, StudentSubjectMarks
 from subject.models import Subject
 from classes.models import Class
 from section.models import Section
-from django.http import HttpResponse
-from .models import ExamTerm
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .jobs import enqueue_import_job
+from .models import ExamTerm, GradeBand, GradingScale, MarksheetImportJob
 
 from .serializers import ExamTermSerializer
+from .serializers import GradingScaleSerializer
 from .serializers import MarksheetImportSerializer
-from .utils.marksheet_importer import generate_marksheet_with_results
+from .serializers import MarksheetImportJobSerializer
+from .serializers import MarksheetWorkbookImportSerializer
+from .utils.bulk_marksheets import (
+    blank_marksheet_groups,
+    bulk_entry_name,
+    iter_blank_marksheets,
+    zip_stream,
+)
+from .utils.grading import grading_scale
+from .utils.marksheet_importer import import_marksheet, import_workbook
+from .utils.published_results import (
+    publish_term,
+    published_group_results,
+    unpublish_term,
+)
+from .utils.result_export import (
+    csv_lines,
+    export_subject_names,
+    iter_results,
+    ndjson_lines,
+)
+from .utils.result_lookup import lookup_student_result, result_payload
 
 
 class ExamTermCreateView(APIView):
@@ -40,7 +69,7 @@ class ExamTermCreateView(APIView):
             )
 
         # Ownership check
-        if school.owner != request.user:
+        if not owns_school(request.user, school.id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -62,15 +91,22 @@ class ExamTermListByUserView(APIView):
 
     def get(self, request):
         # Get all terms linked to schools owned by the logged-in user
-        terms = ExamTerm.objects.filter(school__owner=request.user).select_related(
-            "school"
+        terms = cached_for_owner(
+            "term-list",
+            request.user.id,
+            lambda: list(
+                ExamTermSerializer(
+                    ExamTerm.objects.filter(school__owner=request.user.id).select_related(
+                        "school"
+                    ),
+                    many=True,
+                ).data
+            ),
         )
-
-        serializer = ExamTermSerializer(terms, many=True)
         return Response(
             {
                 "msg": "Exam terms retrieved successfully",
-                "terms": serializer.data,
+                "terms": terms,
             },
             status=status.HTTP_200_OK,
         )
@@ -81,7 +117,7 @@ class ExamTermListView(APIView):
 
     def get(self, request):
         # Fetch only terms for schools owned by logged-in user
-        terms = ExamTerm.objects.filter(school__owner=request.user)
+        terms = ExamTerm.objects.filter(school__owner=request.user.id)
         serializer = ExamTermSerializer(terms, many=True)
         return Response(
             {"msg": "Exam terms retrieved successfully", "terms": serializer.data},
@@ -94,22 +130,127 @@ class ExamTermListBySchoolView(APIView):
 
     def get(self, request, school_id):
         # Verify school ownership
-        try:
-            school = School.objects.get(id=school_id, owner=request.user)
-        except School.DoesNotExist:
+        if not owns_school(request.user, school_id):
             return Response(
                 {"error": "School not found or you do not own this school"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         # Fetch terms for this school
-        terms = ExamTerm.objects.filter(school=school)
-        serializer = ExamTermSerializer(terms, many=True)
+        terms = cached_for_school(
+            "term-list",
+            school_id,
+            lambda: list(
+                ExamTermSerializer(
+                    ExamTerm.objects.filter(school=school_id).select_related("school"),
+                    many=True,
+                ).data
+            ),
+        )
         return Response(
-            {"msg": "Exam terms retrieved successfully", "terms": serializer.data},
+            {"msg": "Exam terms retrieved successfully", "terms": terms},
+            status=status.HTTP_200_OK,
+        )
+
+
+class ExamTermPublishView(APIView):
+    """
+    POST: publish a term's results (snapshot them for the result endpoints).
+    DELETE: unpublish, results are computed live again.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_term(self, request, term_id):
+        return get_object_or_404(ExamTerm, id=term_id, school__owner=request.user.id)
+
+    def post(self, request, term_id):
+        term = self.get_term(request, term_id)
+        published = publish_term(term)
+        return Response(
+            {
+                "msg": f"{published} results published",
+                "term": ExamTermSerializer(term).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def delete(self, request, term_id):
+        term = self.get_term(request, term_id)
+        unpublish_term(term)
+        return Response(
+            {"msg": "Results unpublished", "term": ExamTermSerializer(term).data},
+            status=status.HTTP_200_OK,
+        )
+
+
+class GradingScaleView(APIView):
+    """
+    GET: the grading scale used for a school (query param term: the scale
+    of that term); falls back to the school's scale, then the default.
+    PUT: replace the bands of the school's scale, or of a term's scale.
+    DELETE: remove the school's scale (query param term: the term's scale).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_school(self, request, school_id):
+        return get_object_or_404(School, id=school_id, owner=request.user.id)
+
+    def get_term_id(self, request, school):
+        term_id = request.query_params.get("term")
+        if not term_id:
+            return None
+        return get_object_or_404(ExamTerm, id=term_id, school=school).id
+
+    def get(self, request, school_id):
+        school = self.get_school(request, school_id)
+        term_id = self.get_term_id(request, school)
+        scale = grading_scale(school.id, term_id)
+        bands = [
+            {"label": label, "min_percentage": minimum}
+            for label, minimum in zip(scale.labels, (0, *scale.thresholds))
+        ]
+        return Response(
+            {"school": school.id, "term": term_id, "bands": bands},
+            status=status.HTTP_200_OK,
+        )
+
+    def put(self, request, school_id):
+        school = self.get_school(request, school_id)
+        serializer = GradingScaleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        term = serializer.validated_data.get("term")
+        if term is not None and term.school_id != school.id:
+            return Response(
+                {"error": "Term does not belong to this school"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            scale, _ = GradingScale.objects.get_or_create(school=school, term=term)
+            scale.bands.all().delete()
+            GradeBand.objects.bulk_create(
+                GradeBand(scale=scale, **band)
+                for band in serializer.validated_data["bands"]
+            )
+            # Bulk writes send no signals; saving the scale invalidates it
+            scale.save()
+
+        return Response(
+            {"msg": "Grading scale saved", "bands": serializer.data["bands"]},
             status=status.HTTP_200_OK,
         )
 
+    def delete(self, request, school_id):
+        school = self.get_school(request, school_id)
+        term_id = self.get_term_id(request, school)
+        for scale in GradingScale.objects.filter(school=school, term_id=term_id):
+            scale.delete()
+        return Response({"msg": "Grading scale removed"}, status=status.HTTP_200_OK)
+
 
 class MarksheetExportView(APIView):
     """
@@ -136,7 +277,7 @@ class MarksheetExportView(APIView):
 
             # Fetch school and check ownership
             school = get_object_or_404(School, id=school_id)
-            if school.owner != request.user:
+            if not owns_school(request.user, school.id):
                 return Response(
                     {"error": "You do not own this school"},
                     status=status.HTTP_403_FORBIDDEN,
@@ -151,24 +292,48 @@ class MarksheetExportView(APIView):
             if section_id:
                 section_obj = get_object_or_404(Section, id=section_id, school=school)
 
-            # Fetch subjects according to class and section
-            subjects = Subject.objects.filter(class_obj=class_obj)
-            if section_obj:
-                subjects = subjects.filter(section=section_obj)
-            else:
-                subjects = subjects.filter(section__isnull=True)
+            # Subjects according to class and section, cached per school
+            # (dropped whenever a subject of the school changes)
+            def load_subject_names():
+                subjects = Subject.objects.filter(class_obj=class_obj)
+                if section_obj:
+                    subjects = subjects.filter(section=section_obj)
+                else:
+                    subjects = subjects.filter(section__isnull=True)
+                return list(subjects.order_by("id").values_list("name", flat=True))
+
+            subject_names = cached_for_school(
+                f"blank-marksheet-subjects:{class_obj.id}:{section_id or ''}",
+                school.id,
+                load_subject_names,
+            )
 
             # Check if subjects exist
-            if not subjects.exists():
+            if not subject_names:
                 return Response(
                     {"error": "No subjects found for the selected class/section"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # Generate Excel file
-            return generate_blank_marksheet(
-                school, class_obj, section_obj, term, subjects
+            # Cached Excel file; repeat downloads are answered with 304
+            template = blank_marksheet_template(
+                school, class_obj, section_obj, term, subject_names
             )
+            not_modified = get_conditional_response(
+                request,
+                etag=template.etag,
+                last_modified=int(template.last_modified.timestamp()),
+            )
+            if not_modified is not None:
+                return not_modified
+
+            response = HttpResponse(template.content, content_type=XLSX_CONTENT_TYPE)
+            response["Content-Disposition"] = (
+                f'attachment; filename="{template.filename}"'
+            )
+            response["ETag"] = template.etag
+            response["Last-Modified"] = http_date(template.last_modified.timestamp())
+            return response
 
         except Exception as e:
             # Catch any unexpected error
@@ -187,7 +352,7 @@ class ExamMarksheetGenerateView(APIView):
 
     def get(self, request, term_id, class_id, section_id=None):
         # Fetch exam term, ensuring it belongs to logged-in user's school
-        term = get_object_or_404(ExamTerm, id=term_id, school__owner=request.user)
+        term = get_object_or_404(ExamTerm, id=term_id, school__owner=request.user.id)
 
         # Fetch class and optional section
         class_obj = get_object_or_404(Class, id=class_id, school=term.school)
@@ -246,118 +411,123 @@ class MarksheetImportView(APIView):
         pass_mark = serializer.validated_data.get("pass_mark", 35)
 
         try:
-            import openpyxl
-
-            wb = openpyxl.load_workbook(file)
-            ws = wb.active
-
-            # Read metadata
-            school_name = (
-                str(ws.cell(row=1, column=1).value or "").replace("School:", "").strip()
-            )
-            class_row_value = str(ws.cell(row=2, column=1).value or "")
-            parts = [p.strip() for p in class_row_value.split("|")]
-            class_name = section_name = term_name = None
-            for part in parts:
-                if part.startswith("Class:"):
-                    class_name = part.replace("Class:", "").strip()
-                elif part.startswith("Section:"):
-                    section_name = part.replace("Section:", "").strip()
-                elif part.startswith("Term:"):
-                    term_name = part.replace("Term:", "").strip()
-
-            if not all([school_name, class_name, section_name, term_name]):
-                return Response(
-                    {"error": "School, Class, Section, or Term not found in Excel."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            imported = import_marksheet(file, full_mark, pass_mark)
+
+            # Styled Excel with results & ranks
+            return FileResponse(
+                imported.result_file.open("rb"),
+                as_attachment=True,
+                filename="marksheet_result.xlsx",
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
 
-            # Fetch DB objects
-            school = School.objects.get(name__iexact=school_name)
-            grade_int = int(class_name)
-            class_obj = Class.objects.get(grade=grade_int, school=school)
-            section = Section.objects.get(
-                name__iexact=section_name, class_obj=class_obj
-            )
-            term = ExamTerm.objects.get(name__iexact=term_name, school=school)
-
-            # Read headers and subjects
-            header_row = 4
-            headers = [cell.value for cell in ws[header_row]]
-            ignore_columns = ["OTP", "TOTAL", "PERCENTAGE", "GRADE", "RESULT", "RANK"]
-            subject_cols = []
-            subject_names = []
-
-            for idx, header in enumerate(headers[3:], start=4):
-                if str(header).strip().upper() not in ignore_columns:
-                    subject_cols.append(idx)
-                    subject_names.append(str(header).strip())
-
-            subjects = {
-                s.name.lower(): s
-                for s in Subject.objects.filter(class_obj=class_obj, section=section)
-            }
-
-            # Save student marks to DB
-            for row_idx in range(header_row + 1, ws.max_row + 1):
-                name = ws.cell(row=row_idx, column=2).value
-                roll_no = ws.cell(row=row_idx, column=3).value
-                otp = ws.cell(row=row_idx, column=4).value if "OTP" in headers else None
-                if not name or not roll_no:
-                    continue
-
-                student, _ = Student.objects.get_or_create(
-                    school=school,
-                    class_obj=class_obj,
-                    section=section,
-                    roll_no=roll_no,
-                    defaults={"name": name, "otp": otp},
-                )
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-                student_marks, _ = StudentMarks.objects.get_or_create(
-                    student=student, defaults={"term": term}
-                )
 
-                total = 0
-                count = 0
-                overall_pass = True
-                for col_idx, subj_name in zip(subject_cols, subject_names):
-                    mark = ws.cell(row=row_idx, column=col_idx).value
-                    try:
-                        mark = float(mark)
-                    except:
-                        mark = 0
-                    subj = subjects.get(subj_name.lower())
-                    if subj:
-                        StudentSubjectMarks.objects.update_or_create(
-                            student_marks=student_marks,
-                            subject=subj,
-                            defaults={"marks_obtained": mark},
-                        )
-                    total += mark
-                    count += 1
-                    if mark < pass_mark:
-                        overall_pass = False
-
-                percentage = (total / (full_mark * count)) * 100 if count else 0
-                student_marks.total_marks = total
-                student_marks.percentage = round(percentage, 2)
-                student_marks.grade = (
-                    student_marks.calculate_grade()
-                    if hasattr(student_marks, "calculate_grade") and overall_pass
-                    else "-"
-                )
-                student_marks.result = "Pass" if overall_pass else "Fail"
-                student_marks.save()
+class MarksheetWorkbookImportView(APIView):
+    """
+    Import a workbook with one marksheet per sheet (every class/section of a
+    school in one upload) and return a report of each sheet.
+    """
 
-            # Generate styled Excel
-            return generate_marksheet_with_results(
-                file, full_mark, pass_mark, school, class_obj, section, term
-            )
+    def post(self, request):
+        serializer = MarksheetWorkbookImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            report = import_workbook(
+                serializer.validated_data["file"],
+                serializer.validated_data.get("full_mark", 100),
+                serializer.validated_data.get("pass_mark", 33),
+                atomic=serializer.validated_data.get("atomic", True),
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        return Response(
+            report,
+            status=status.HTTP_200_OK
+            if report["committed"]
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class MarksheetImportJobCreateView(APIView):
+    """
+    Queue an Excel marksheet import and return the job id immediately.
+    The job is processed by the local worker pool; poll its status below.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = MarksheetImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        job = MarksheetImportJob.objects.create(
+            file=serializer.validated_data["file"],
+            full_mark=serializer.validated_data.get("full_mark", 100),
+            pass_mark=serializer.validated_data.get("pass_mark", 33),
+            created_by_id=request.user.id,
+        )
+        enqueue_import_job(job)
+
+        return Response(
+            {
+                "msg": "Marksheet import queued",
+                "job": MarksheetImportJobSerializer(
+                    job, context={"request": request}
+                ).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class MarksheetImportJobStatusView(APIView):
+    """
+    Status, row counts and per-row errors of a marksheet import job.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        # Only the user who queued the job sees it
+        job = get_object_or_404(
+            MarksheetImportJob, id=job_id, created_by=request.user.id
+        )
+        return Response(
+            MarksheetImportJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class MarksheetImportJobDownloadView(APIView):
+    """
+    Download the styled result workbook of a finished import job.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(
+            MarksheetImportJob, id=job_id, created_by=request.user.id
+        )
+        if job.status != MarksheetImportJob.SUCCEEDED or not job.result_file:
+            return Response(
+                {"error": f"Import job is {job.status}, no result available"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return FileResponse(
+            job.result_file.open("rb"),
+            as_attachment=True,
+            filename="marksheet_result.xlsx",
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
 
 # For fetching all students marksheet
 class StudentMarksRetrieveView(APIView):
@@ -388,47 +558,44 @@ class StudentMarksRetrieveView(APIView):
             )
             term = ExamTerm.objects.get(id=term_id, school=school)
 
-            # Fetch students marks
-            student_marks_qs = StudentMarks.objects.filter(
-                student__class_obj=class_obj, student__section=section, term=term
-            ).order_by("-total_marks")
-
-            # Calculate rank
-            rank_dict = {
-                sm.student_id: idx + 1 for idx, sm in enumerate(student_marks_qs)
-            }
-
-            # Build response data
-            data = []
-            for sm in student_marks_qs:
-                # Get subject marks
-                try:
-                    subject_marks = {
-                        s.subject.name: s.marks_obtained for s in sm.subject_marks.all()
-                    }
-                except AttributeError:
-                    subject_marks = {
-                        s.subject.name: s.marks_obtained
-                        for s in sm.studentsubjectmarks_set.all()
-                    }
-
-                data.append(
-                    {
-                        "student": sm.student.name,
-                        "roll_no": sm.student.roll_no,
-                        "school": school.name,
-                        "class_name": class_obj.grade,
-                        "section": section.name,
-                        "term": term.name,
-                        "total_marks": sm.total_marks,
-                        "percentage": sm.percentage,
-                        "grade": sm.grade if sm.result == "Pass" else "-",
-                        "result": sm.result,
-                        "rank": rank_dict.get(sm.student_id),
-                        "subjects": subject_marks,
-                    }
+            # Published terms are served from their snapshot
+            data = published_group_results(term, class_obj, section)
+
+            if not data:
+                # Fetch students marks (ranked by their stored rank) and
+                # subject marks in a fixed number of queries
+                student_marks_qs = (
+                    StudentMarks.objects.filter(
+                        student__class_obj=class_obj,
+                        student__section=section,
+                        term=term,
+                    )
+                    .select_related(
+                        "student__school",
+                        "student__class_obj",
+                        "student__section",
+                        "term",
+                    )
+                    .prefetch_related(
+                        Prefetch(
+                            "subject_marks",
+                            queryset=StudentSubjectMarks.objects.select_related(
+                                "subject"
+                            ),
+                        )
+                    )
+                    .order_by(F("rank").asc(nulls_last=True), "student__roll_no")
                 )
 
+                # Build response data
+                data = [
+                    result_payload(
+                        sm,
+                        {s.subject.name: s.marks_obtained for s in sm.subject_marks.all()},
+                    )
+                    for sm in student_marks_qs
+                ]
+
             return Response(
                 {
                     "msg": f"{len(data)} students processed successfully",
@@ -457,6 +624,117 @@ class StudentMarksRetrieveView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkMarksheetExportView(APIView):
+    """
+    Export the blank marksheets of every class/section of a school as a ZIP,
+    streamed while the sheets are generated.
+    Query params: school (id), term (id)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        school_id = request.query_params.get("school")
+        term_id = request.query_params.get("term")
+
+        if not school_id or not term_id:
+            return Response(
+                {"error": "school and term are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        school = get_object_or_404(School, id=school_id)
+        if not owns_school(request.user, school.id):
+            return Response(
+                {"error": "You do not own this school"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        term = get_object_or_404(ExamTerm, id=term_id, school=school)
+
+        groups = blank_marksheet_groups(school)
+        if not groups:
+            return Response(
+                {"error": "No subjects found for this school"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        entries = (
+            (bulk_entry_name(class_obj, section, term), template.content)
+            for class_obj, section, template in iter_blank_marksheets(school, term, groups)
+        )
+        response = StreamingHttpResponse(
+            zip_stream(entries), content_type="application/zip"
+        )
+        filename = f"marksheets_{term.name}.zip"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class StudentMarksExportView(APIView):
+    """
+    Stream the results of a school's term as NDJSON (default) or CSV.
+    Query params: school (id), term (id), class (id, optional),
+    section (id, optional), output ("ndjson" or "csv")
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        school_id = request.query_params.get("school")
+        term_id = request.query_params.get("term")
+        class_id = request.query_params.get("class")
+        section_id = request.query_params.get("section")
+        output = request.query_params.get("output", "ndjson").lower()
+
+        if not school_id or not term_id:
+            return Response(
+                {"error": "school and term are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if output not in ("ndjson", "csv"):
+            return Response(
+                {"error": "output must be ndjson or csv"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        school = get_object_or_404(School, id=school_id)
+        if not owns_school(request.user, school.id):
+            return Response(
+                {"error": "You do not own this school"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        term = get_object_or_404(ExamTerm, id=term_id, school=school)
+        class_obj = (
+            get_object_or_404(Class, id=class_id, school=school) if class_id else None
+        )
+        section = (
+            get_object_or_404(Section, id=section_id, school=school)
+            if section_id
+            else None
+        )
+
+        results = iter_results(term, class_obj, section)
+        filename = f"results_{term.name}"
+        if class_obj:
+            filename += f"_{class_obj.grade}"
+        if section:
+            filename += f"_{section.name}"
+
+        if output == "csv":
+            subject_names = export_subject_names(term, class_obj, section)
+            response = StreamingHttpResponse(
+                csv_lines(results, subject_names), content_type="text/csv"
+            )
+            filename += ".csv"
+        else:
+            response = StreamingHttpResponse(
+                ndjson_lines(results), content_type="application/x-ndjson"
+            )
+            filename += ".ndjson"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
 # For single student marksheet
 class SingleStudentMarksRetrieveView(APIView):
     """
@@ -479,65 +757,9 @@ class SingleStudentMarksRetrieveView(APIView):
             )
 
         try:
-            # Find school by name (created by anyone)
-            school = School.objects.get(name__iexact=school_name.strip())
-
-            # Find student matching all details
-            student = Student.objects.get(
-                school=school,
-                class_obj__grade=grade,
-                section__name__iexact=section_name.strip(),
-                roll_no=roll_no,
-                otp=otp,
+            data = lookup_student_result(
+                school_name, grade, section_name, roll_no, otp
             )
-
-            # Get student marks
-            student_marks = StudentMarks.objects.filter(student=student).first()
-            if not student_marks:
-                return Response(
-                    {"error": "Marks not found for this student"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-
-            # Calculate rank among peers in same school, class, section, and term
-            peer_marks = StudentMarks.objects.filter(
-                student__school=school,
-                student__class_obj=student.class_obj,
-                student__section=student.section,
-                term=student_marks.term,
-            ).order_by("-total_marks")
-            rank_dict = {sm.student_id: idx + 1 for idx, sm in enumerate(peer_marks)}
-            student_rank = rank_dict.get(student.id)
-
-            # Subject-wise marks
-            try:
-                subject_marks = {
-                    sm.subject.name: sm.marks_obtained
-                    for sm in student_marks.subject_marks.all()
-                }
-            except AttributeError:
-                subject_marks = {
-                    sm.subject.name: sm.marks_obtained
-                    for sm in StudentSubjectMarks.objects.filter(
-                        student_marks=student_marks
-                    )
-                }
-
-            data = {
-                "student": student.name,
-                "roll_no": student.roll_no,
-                "school": student.school.name if student.school else None,
-                "class_name": student.class_obj.grade if student.class_obj else None,
-                "section": student.section.name if student.section else None,
-                "term": student_marks.term.name if student_marks.term else None,
-                "total_marks": student_marks.total_marks,
-                "percentage": student_marks.percentage,
-                "grade": student_marks.grade if student_marks.result == "Pass" else "-",
-                "result": student_marks.result,
-                "rank": student_rank,
-                "subjects": subject_marks,
-            }
-
             return Response(data, status=status.HTTP_200_OK)
 
         except School.DoesNotExist:
@@ -549,6 +771,11 @@ class SingleStudentMarksRetrieveView(APIView):
                 {"error": "No student found with provided details"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        except StudentMarks.DoesNotExist:
+            return Response(
+                {"error": "Marks not found for this student"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -0,0 +1,34 @@
+from school.models import School, normalize_school_name
+
+# Suggestions returned when the request does not ask for fewer
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+def prefix_range(prefix):
+    """
+    Half-open range [prefix, upper) of the strings starting with `prefix`:
+    the upper bound is the prefix with its last character incremented.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def autocomplete_schools(query, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Up to `limit` schools ({"id", "name"} dicts) whose name starts with
+    `query`, ignoring case and extra whitespace, in name order.
+
+    The prefix becomes a range on the indexed School.name_key, so the
+    database walks the index from the first match and stops after `limit`
+    rows instead of scanning every name.
+    """
+    schools = School.objects.all()
+    prefix = normalize_school_name(query)
+    if prefix:
+        low, high = prefix_range(prefix)
+        # The range selects on the index; startswith keeps it exact under
+        # any collation
+        schools = schools.filter(
+            name_key__gte=low, name_key__lt=high, name_key__startswith=prefix
+        )
+    return list(schools.order_by("name_key", "id").values("id", "name")[:limit])
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def populate_name_key(apps, schema_editor):
+    School = apps.get_model("school", "School")
+    schools = list(School.objects.only("id", "name"))
+    for school in schools:
+        school.name_key = " ".join(school.name.split()).casefold()
+    School.objects.bulk_update(schools, ["name_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='school',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_name_key, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,26 @@
 from django.db import models
 from accounts.models import User
 
+
+def normalize_school_name(name):
+    """Case- and whitespace-insensitive form of a school name, see School.name_key."""
+    return " ".join(str(name).split()).casefold()
+
+
 class School(models.Model):
     name = models.CharField(max_length=255)
+    # Normalized name for exact indexed lookups (public result search, imports)
+    name_key = models.CharField(max_length=255, db_index=True, editable=False)
     address = models.TextField(blank=True, null=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='schools')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        self.name_key = normalize_school_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "name_key"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
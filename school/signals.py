@@ -0,0 +1,69 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from classes.models import Class
+from djangoauthapi.cache import invalidate_owner, invalidate_school
+from exam.models import ExamTerm
+from school.models import School
+from section.models import Section
+from subject.models import Subject
+
+# Cached list endpoints (see djangoauthapi/cache.py) show a school's
+# reference data; any change to it drops the school's and its owner's
+# cached entries.
+
+
+def _invalidate(school_id):
+    owner_id = (
+        School.objects.filter(id=school_id).values_list("owner_id", flat=True).first()
+    )
+    invalidate_school(school_id, owner_id)
+
+
+def _invalidate_class_school(class_id):
+    school_id = (
+        Class.objects.filter(id=class_id).values_list("school_id", flat=True).first()
+    )
+    if school_id:
+        _invalidate(school_id)
+
+
+@receiver(pre_save, sender=School)
+def invalidate_previous_owner(sender, instance, **kwargs):
+    # A school handed to another user leaves its previous owner's entries
+    if instance.pk is None:
+        return
+    previous_owner_id = (
+        School.objects.filter(pk=instance.pk).values_list("owner_id", flat=True).first()
+    )
+    if previous_owner_id and previous_owner_id != instance.owner_id:
+        invalidate_owner(previous_owner_id)
+
+
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+def invalidate_on_school_change(sender, instance, **kwargs):
+    invalidate_school(instance.id, instance.owner_id)
+
+
+@receiver(post_save, sender=Class)
+@receiver(post_delete, sender=Class)
+@receiver(post_save, sender=ExamTerm)
+@receiver(post_delete, sender=ExamTerm)
+def invalidate_on_school_data_change(sender, instance, **kwargs):
+    _invalidate(instance.school_id)
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def invalidate_on_section_change(sender, instance, **kwargs):
+    if instance.school_id:
+        _invalidate(instance.school_id)
+    elif instance.class_obj_id:
+        _invalidate_class_school(instance.class_obj_id)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_on_subject_change(sender, instance, **kwargs):
+    _invalidate_class_school(instance.class_obj_id)
@@ -1,3 +1,246 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from classes.models import Class
+from djangoauthapi import renderers
+from djangoauthapi.renderers import UserRenderer
+from exam.models import ExamTerm
+from school.models import School
+from section.models import Section
+from subject.models import Subject
+
+
+class CachedListEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", name="Owner", tc=True, password="pass"
+        )
+        cls.other = User.objects.create_user(
+            email="other@example.com", name="Other", tc=True, password="pass"
+        )
+        cls.school = School.objects.create(name="Cache School", owner=cls.owner)
+        cls.class_obj = Class.objects.create(school=cls.school, grade=4)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def get(self, url):
+        return self.client.get(url).data
+
+    def test_lists_are_served_from_cache(self):
+        urls = ["/schools/list/", "/classes/list/", "/sections/all/", "/subjects/all/", "/exams/terms/"]
+        first = [self.get(url) for url in urls]
+        with self.assertNumQueries(0):
+            again = [self.get(url) for url in urls]
+        self.assertEqual(first, again)
+
+    def test_changes_invalidate_owner_entries(self):
+        self.assertEqual(self.get("/classes/list/")["classes"][0]["sections"], [])
+
+        section = Section.objects.create(
+            name="B", class_obj=self.class_obj, school=self.school
+        )
+        self.assertEqual(len(self.get("/sections/all/")["sections"]), 1)
+
+        Subject.objects.create(name="Art", class_obj=self.class_obj, section=section)
+        self.assertEqual(len(self.get("/subjects/all/")["subjects"]), 1)
+
+        ExamTerm.objects.create(school=self.school, name="Mid")
+        self.assertEqual(len(self.get("/exams/terms/")["terms"]), 1)
+        self.assertEqual(len(self.get(f"/exams/terms/{self.school.id}/")["terms"]), 1)
+
+        self.school.name = "Renamed School"
+        self.school.save()
+        self.assertEqual(self.get("/schools/list/")["schools"][0]["name"], "Renamed School")
+
+    def test_entries_are_per_owner(self):
+        self.assertEqual(len(self.get("/schools/list/")["schools"]), 1)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.get("/schools/list/")["schools"], [])
+
+
+class UserRendererTests(TestCase):
+    def render(self, data, status_code=200):
+        context = {"response": Response(status=status_code)}
+        return UserRenderer().render(data, "application/json", context)
+
+    def test_errors_are_wrapped(self):
+        errors = {"name": [ErrorDetail("This field is required.", code="required")]}
+        self.assertEqual(
+            json.loads(self.render(errors, 400)),
+            {"errors": {"name": ["This field is required."]}},
+        )
+        self.assertEqual(
+            json.loads(self.render({"error": "School not found"}, 404)),
+            {"error": "School not found"},
+        )
+
+    def test_success_payload_is_not_inspected(self):
+        with mock.patch.object(renderers, "contains_error_detail") as check:
+            self.render({"schools": [{"id": 1}]})
+        check.assert_not_called()
+
+    def test_output_matches_drf_encoder(self):
+        data = {
+            "at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2025, 1, 2),
+            "id": uuid.UUID(int=1),
+            "amount": Decimal("1.50"),
+            "name": "विद्यालय \u2028",
+            "marks": {1: 90.5},
+        }
+        expected = JSONRenderer().render(data)
+        self.assertEqual(self.render(data), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(self.render(data), expected)
+
+    def test_api_validation_error(self):
+        owner = User.objects.create_user(
+            email="r@example.com", name="R", tc=True, password="pass"
+        )
+        client = APIClient()
+        client.force_authenticate(owner)
+        response = client.post("/schools/create/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("name", json.loads(response.content)["errors"])
+
+
+class OwnershipCheckTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email="owns@example.com", name="Owner", tc=True, password="pass"
+        )
+        cls.other = User.objects.create_user(
+            email="intruder@example.com", name="Other", tc=True, password="pass"
+        )
+        cls.school = School.objects.create(name="Owned School", owner=cls.owner)
+        cls.class_obj = Class.objects.create(school=cls.school, grade=6)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, user):
+        # A fresh user object per request, as token authentication gives
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+
+    def test_owned_school_ids_are_cached(self):
+        from djangoauthapi.ownership import owned_school_ids, owns_school
+
+        user = User.objects.get(pk=self.owner.pk)
+        self.assertEqual(owned_school_ids(user), {self.school.id})
+        with self.assertNumQueries(0):
+            self.assertTrue(owns_school(user, str(self.school.id)))
+            self.assertFalse(owns_school(user, "abc"))
+            self.assertFalse(owns_school(user, None))
+
+    def test_retrieve_does_not_load_the_owner(self):
+        self.login(self.owner)
+        self.client.get(f"/classes/retrieve/{self.class_obj.id}/")
+        self.login(self.owner)
+        # The class (with its school) and the sections it lists
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/classes/retrieve/{self.class_obj.id}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_non_owner_is_refused(self):
+        self.login(self.other)
+        self.assertEqual(
+            self.client.get(f"/classes/retrieve/{self.class_obj.id}/").status_code, 403
+        )
+        self.assertEqual(
+            self.client.delete(f"/classes/delete/{self.class_obj.id}/").status_code, 403
+        )
+        self.assertEqual(
+            self.client.get(f"/exams/terms/{self.school.id}/").status_code, 404
+        )
+        self.assertTrue(Class.objects.filter(pk=self.class_obj.pk).exists())
+
+    def test_new_and_transferred_schools_are_seen(self):
+        self.login(self.other)
+        self.assertEqual(self.client.get(f"/exams/terms/{self.school.id}/").status_code, 404)
+
+        school = School.objects.create(name="Second School", owner=self.other)
+        self.login(self.other)
+        self.assertEqual(self.client.get(f"/exams/terms/{school.id}/").status_code, 200)
+
+        self.school.owner = self.other
+        self.school.save()
+        self.login(self.other)
+        self.assertEqual(self.client.get(f"/exams/terms/{self.school.id}/").status_code, 200)
+        self.login(self.owner)
+        self.assertEqual(self.client.get(f"/exams/terms/{self.school.id}/").status_code, 404)
+
+
+class SchoolAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(
+            email="names@example.com", name="Names", tc=True, password="pass"
+        )
+        for name in [
+            "Everest Academy",
+            "everest  Boarding School",
+            "Everton High",
+            "Shree Everest School",
+            "Zenith School",
+        ]:
+            School.objects.create(name=name, owner=owner)
+
+    def search(self, **params):
+        response = APIClient().get("/schools/school-list/", params)
+        self.assertEqual(response.status_code, 200)
+        return [school["name"] for school in response.data]
+
+    def test_prefix_matches_ignore_case_and_spacing(self):
+        self.assertEqual(
+            self.search(q="  EVEREST "), ["Everest Academy", "everest  Boarding School"]
+        )
+        self.assertEqual(
+            self.search(q="ever"),
+            ["Everest Academy", "everest  Boarding School", "Everton High"],
+        )
+        self.assertEqual(self.search(q="everest  b"), ["everest  Boarding School"])
+        self.assertEqual(self.search(q="academy"), [])
+
+    def test_results_are_limited(self):
+        self.assertEqual(len(self.search()), 5)
+        self.assertEqual(
+            self.search(q="e", limit=2), ["Everest Academy", "everest  Boarding School"]
+        )
+        self.assertEqual(len(self.search(limit=1000)), 5)
+        self.assertEqual(len(self.search(limit="x")), 5)
+
+    def test_prefix_range(self):
+        from school.autocomplete import prefix_range
+
+        self.assertEqual(prefix_range("abc"), ("abc", "abd"))
+        self.assertEqual(prefix_range("z"), ("z", "{"))
+
+    def test_lookup_uses_the_name_index(self):
+        from school.autocomplete import prefix_range
 
-# Create your tests here.
+        low, high = prefix_range("ever")
+        plan = (
+            School.objects.filter(name_key__gte=low, name_key__lt=high)
+            .order_by("name_key", "id")
+            .values("id", "name")[:10]
+            .explain()
+        )
+        self.assertIn("name_key", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -2,10 +2,16 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from school.autocomplete import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+    autocomplete_schools,
+)
 from school.models import School
 
 from school.renderers import UserRenderer
 from school.serializers import SchoolSerializer
+from djangoauthapi.cache import cached_for_owner
 
 
 class SchoolCreateView(APIView):
@@ -15,7 +21,7 @@ class SchoolCreateView(APIView):
     def post(self, request, format=None):
         serializer = SchoolSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(owner=request.user)
+        serializer.save(owner_id=request.user.id)
         return Response(
             {"msg": "School created successfully", "school": serializer.data},
             status=status.HTTP_201_CREATED,
@@ -25,17 +31,19 @@ class SchoolCreateView(APIView):
 # For fetching list of schools logged in or not
 class SchoolListAPIView(APIView):
     """
-    Returns a list of schools filtered by a search query (for autocomplete).
+    Returns the schools whose name starts with a search query (for
+    autocomplete), at most `limit` of them.
     """
 
     def get(self, request):
-        query = request.query_params.get("q", "").strip()  # search query
-        if query:
-            schools = School.objects.filter(name__icontains=query).order_by("name")
-        else:
-            schools = School.objects.all().order_by("name")
+        query = request.query_params.get("q", "")  # search query
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
 
-        data = [{"id": school.id, "name": school.name} for school in schools]
+        data = autocomplete_schools(query, limit)
         return Response(data, status=status.HTTP_200_OK)
 
 
@@ -45,9 +53,14 @@ class SchoolListView(APIView):
 
     def get(self, request, format=None):
         # Get all schools owned by the logged-in user
-        schools = School.objects.filter(owner=request.user)
-        serializer = SchoolSerializer(schools, many=True)
+        schools = cached_for_owner(
+            "school-list",
+            request.user.id,
+            lambda: list(
+                SchoolSerializer(School.objects.filter(owner=request.user.id), many=True).data
+            ),
+        )
         return Response(
-            {"msg": "Schools retrieved successfully", "schools": serializer.data},
+            {"msg": "Schools retrieved successfully", "schools": schools},
             status=status.HTTP_200_OK,
         )
@@ -2,11 +2,12 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from school.models import School
 from section.models import Section
 from section.renderers import UserRenderer
 from section.serializers import SectionSerializer
 from classes.models import Class
+from djangoauthapi.cache import cached_for_owner
+from djangoauthapi.ownership import owns_school
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -15,7 +16,6 @@ from rest_framework import status
 from section.models import Section
 from section.serializers import SectionSerializer
 from classes.models import Class
-from school.models import School
 
 
 # Create a Section
@@ -31,11 +31,11 @@ class SectionCreateView(APIView):
             return Response({"error": "Class is required"}, status=400)
 
         # Ensure ownership via class → school
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response({"error": "You do not own this school"}, status=403)
 
         # Save section with school inferred from class
-        section = serializer.save(school=class_obj.school)
+        section = serializer.save(school_id=class_obj.school_id)
         return Response(
             {
                 "msg": "Section created successfully",
@@ -50,21 +50,21 @@ class SectionListBySchoolClassView(APIView):
 
     def get(self, request, school_id, class_id, format=None):
         # Verify school ownership
-        try:
-            school = School.objects.get(id=school_id, owner=request.user)
-        except School.DoesNotExist:
+        if not owns_school(request.user, school_id):
             return Response(
                 {"error": "School not found or you do not own this school"}, status=404
             )
 
         # Verify class belongs to this school
         try:
-            class_obj = Class.objects.get(id=class_id, school=school)
+            class_obj = Class.objects.get(id=class_id, school_id=school_id)
         except Class.DoesNotExist:
             return Response({"error": "Class not found in this school"}, status=404)
 
         # Fetch sections
-        sections = Section.objects.filter(school=school, class_obj=class_obj)
+        sections = Section.objects.filter(
+            school_id=school_id, class_obj=class_obj
+        ).select_related("class_obj", "school")
         serializer = SectionSerializer(sections, many=True)
         return Response(
             {"msg": "Sections retrieved successfully", "sections": serializer.data},
@@ -77,10 +77,20 @@ class SectionListAllView(APIView):
 
     def get(self, request, format=None):
         # Fetch all sections for schools owned by the user
-        sections = Section.objects.filter(class_obj__school__owner=request.user).select_related("class_obj")
-        serializer = SectionSerializer(sections, many=True)
+        sections = cached_for_owner(
+            "section-list",
+            request.user.id,
+            lambda: list(
+                SectionSerializer(
+                    Section.objects.filter(
+                        class_obj__school__owner=request.user.id
+                    ).select_related("class_obj"),
+                    many=True,
+                ).data
+            ),
+        )
         return Response(
-            {"msg": "Sections with classes retrieved successfully", "sections": serializer.data},
+            {"msg": "Sections with classes retrieved successfully", "sections": sections},
             status=status.HTTP_200_OK,
         )
     
@@ -92,7 +102,7 @@ class SectionListByClassView(APIView):
         # Get class and verify ownership
         try:
             class_obj = Class.objects.get(
-                id=class_id, school__id=school_id, school__owner=request.user
+                id=class_id, school__id=school_id, school__owner=request.user.id
             )
         except Class.DoesNotExist:
             return Response(
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_alter_student_unique_together_studentmarks_term_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentmarks',
+            name='marks_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
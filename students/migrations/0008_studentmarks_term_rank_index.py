@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:01
+
+from django.db import migrations, models
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+
+def populate_ranks(apps, schema_editor):
+    StudentMarks = apps.get_model("students", "StudentMarks")
+    groups = StudentMarks.objects.values_list(
+        "term_id", "student__class_obj_id", "student__section_id"
+    ).distinct()
+    for term_id, class_id, section_id in groups:
+        ranked = StudentMarks.objects.filter(
+            term_id=term_id,
+            student__class_obj_id=class_id,
+            student__section_id=section_id,
+        ).annotate(
+            new_rank=Window(
+                expression=Rank(), order_by=F("total_marks").desc(nulls_last=True)
+            )
+        )
+        for student_marks in ranked:
+            student_marks.rank = student_marks.new_rank
+        StudentMarks.objects.bulk_update(ranked, ["rank"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0007_importedmarksheet'),
+        ('students', '0007_studentmarks_marks_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentmarks',
+            index=models.Index(fields=['term', 'rank'], name='students_st_term_id_288faa_idx'),
+        ),
+        migrations.RunPython(populate_ranks, migrations.RunPython.noop),
+    ]
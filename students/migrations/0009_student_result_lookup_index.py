@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0005_alter_class_options'),
+        ('school', '0002_school_name_key'),
+        ('section', '0007_alter_section_unique_together_section_class_obj_and_more'),
+        ('students', '0008_studentmarks_term_rank_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'class_obj', 'section', 'roll_no', 'otp'], name='students_st_school__11f5d8_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0009_student_result_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentmarks',
+            name='full_mark',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentmarks',
+            name='pass_mark',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
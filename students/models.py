@@ -5,6 +5,8 @@ from classes.models import Class as ClassModel
 from section.models import Section
 from subject.models import Subject
 from exam.models import ExamTerm
+from exam.utils.grading import grading_scale
+from exam.utils.scoring import grade_for
 from school.models import School
 
 
@@ -29,6 +31,10 @@ class Student(models.Model):
     class Meta:
         ordering = ["class_obj", "section", "roll_no"]
         unique_together = ("school", "class_obj", "section", "roll_no")
+        # Public result lookup (see exam.utils.result_lookup)
+        indexes = [
+            models.Index(fields=["school", "class_obj", "section", "roll_no", "otp"])
+        ]
 
     def __str__(self):
         return f"{self.name} (Roll {self.roll_no})"
@@ -51,27 +57,30 @@ class StudentMarks(models.Model):
         max_length=10, choices=[("Pass", "Pass"), ("Fail", "Fail")], blank=True, null=True
     )
     rank = models.IntegerField(blank=True, null=True)
+    # Fingerprint of the imported marks, unchanged rows are skipped on re-import
+    marks_hash = models.CharField(max_length=64, blank=True, default="")
+    # Full and pass marks of the upload the row was scored with, for subjects
+    # without their own (see exam.utils.grading.marking_scheme)
+    full_mark = models.FloatField(blank=True, null=True)
+    pass_mark = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        # Rank lookups within a term (see students.ranking)
+        indexes = [models.Index(fields=["term", "rank"])]
 
     def __str__(self):
         return f"{self.student.name} - {self.term.name} Marks"
 
     def calculate_grade(self):
-        """Example grade calculation, adjust thresholds as needed."""
+        """
+        Grade of the stored percentage on the grading scale of the student's
+        school and this term, as the result sheets grade it.
+        """
         if self.percentage is None:
             return None
-        if self.percentage >= 90:
-            return "A+"
-        elif self.percentage >= 80:
-            return "A"
-        elif self.percentage >= 70:
-            return "B+"
-        elif self.percentage >= 60:
-            return "B"
-        elif self.percentage >= 50:
-            return "C"
-        elif self.percentage >= 40:
-            return "D"
-        return "F"
+        return grade_for(
+            self.percentage, grading_scale(self.student.school_id, self.term_id)
+        )
 
 
 class StudentSubjectMarks(models.Model):
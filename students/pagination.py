@@ -0,0 +1,92 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StudentKeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination over students in their Meta.ordering:
+    class (by grade), section, roll number. Ordering by class_obj follows
+    Class.Meta.ordering, so the key is (class grade, section id, roll_no),
+    which is unique because a section belongs to one class.
+
+    The cursor holds the key of the last row of the page, and the next page
+    is read with a range filter on that key instead of an OFFSET, so pages
+    stay stable while students are added or removed. The exact total is
+    only counted with `?count=true`.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    max_page_size = 500
+    ordering = ("class_obj__grade", "section_id", "roll_no")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, ""))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            grade, section_id, roll_no = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+            return int(grade), int(section_id), int(roll_no)
+        except (TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor"})
+
+    def encode_cursor(self, key):
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count = None
+        if request.query_params.get("count", "").lower() in ("1", "true", "yes"):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering)
+        key = self.decode_cursor(request)
+        if key is not None:
+            grade, section_id, roll_no = key
+            queryset = queryset.filter(
+                Q(class_obj__grade__gt=grade)
+                | Q(class_obj__grade=grade, section_id__gt=section_id)
+                | Q(class_obj__grade=grade, section_id=section_id, roll_no__gt=roll_no)
+            )
+
+        # One extra row tells whether there is a next page
+        page_size = self.get_page_size(request)
+        page = list(queryset[: page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+
+        self.next_key = None
+        if self.has_next:
+            last = page[-1]
+            self.next_key = [last.class_obj.grade, last.section_id, last.roll_no]
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "count")
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_key)
+        )
+
+    def get_paginated_response(self, data, results_key="students"):
+        return Response(
+            {"count": self.count, "next": self.get_next_link(), results_key: data}
+        )
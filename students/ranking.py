@@ -0,0 +1,99 @@
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+from exam.models import ImportedMarksheet
+from exam.utils.grading import marking_scheme
+from exam.utils.scoring import score_matrix
+from students.models import StudentMarks
+
+
+def refresh_group_ranks(term, class_obj, section):
+    """
+    Recompute StudentMarks.rank for one class/section/term group.
+
+    Ranks follow total_marks (highest first); ties share a rank and the next
+    one is skipped (1, 2, 2, 4), like the result sheet. Only rows whose
+    rank changed are written. Accepts model instances or ids.
+    """
+    ranked = (
+        StudentMarks.objects.filter(
+            term=term, student__class_obj=class_obj, student__section=section
+        )
+        .annotate(
+            new_rank=Window(
+                expression=Rank(), order_by=F("total_marks").desc(nulls_last=True)
+            )
+        )
+        .only("id", "rank")
+    )
+
+    changed = []
+    for student_marks in ranked:
+        if student_marks.rank != student_marks.new_rank:
+            student_marks.rank = student_marks.new_rank
+            changed.append(student_marks)
+
+    StudentMarks.objects.bulk_update(changed, ["rank"])
+    return len(changed)
+
+
+def refresh_ranks_for(student_marks):
+    """Recompute ranks of every group the given StudentMarks rows belong to."""
+    groups = {
+        (sm.term_id, sm.student.class_obj_id, sm.student.section_id)
+        for sm in student_marks
+    }
+    for term_id, class_id, section_id in groups:
+        refresh_group_ranks(term_id, class_id, section_id)
+
+
+def rescore_student_marks(student_marks):
+    """
+    Score one StudentMarks row again from its saved subject marks, with the
+    shared scoring engine and the marking of its class/section/term, and
+    save its total, percentage, grade and result.
+
+    The row no longer matches any imported sheet, so its marks fingerprint
+    and the group's imported-sheet record are dropped: re-uploading the
+    same sheet then writes its marks again instead of being skipped.
+    """
+    student = student_marks.student
+    names, marks = [], []
+    for name, mark in student_marks.subject_marks.order_by("subject_id").values_list(
+        "subject__name", "marks_obtained"
+    ):
+        names.append(name)
+        marks.append(mark)
+
+    # Subjects without their own marks use the upload's, as when imported
+    scheme = marking_scheme(
+        student.school,
+        student.class_obj,
+        student.section,
+        student_marks.term,
+        names,
+        student_marks.full_mark,
+        student_marks.pass_mark,
+    )
+    scores = score_matrix([marks], scheme)
+    student_marks.total_marks = scores.totals[0]
+    student_marks.percentage = scores.percentages[0]
+    student_marks.grade = scores.grades[0]
+    student_marks.result = "Pass" if scores.passed[0] else "Fail"
+    student_marks.marks_hash = ""
+    student_marks.save(
+        update_fields=[
+            "total_marks",
+            "percentage",
+            "grade",
+            "result",
+            "marks_hash",
+            "updated_at",
+        ]
+    )
+
+    ImportedMarksheet.objects.filter(
+        term=student_marks.term_id,
+        class_obj=student.class_obj_id,
+        section=student.section_id,
+    ).delete()
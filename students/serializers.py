@@ -65,6 +65,7 @@ class StudentMarksSerializer(serializers.ModelSerializer):
             "id",
             "student",
             "student_name",
+            "term",
             "total_marks",
             "percentage",
             "grade",
@@ -74,13 +75,13 @@ class StudentMarksSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["rank"]
 
 
 class StudentSerializer(serializers.ModelSerializer):
     school_name = serializers.ReadOnlyField(source="school.name")
     class_grade = serializers.ReadOnlyField(source="class_obj.grade")
     section_name = serializers.ReadOnlyField(source="section.name")
-    term_name = serializers.ReadOnlyField(source="term.name")
     marks = StudentMarksSerializer(many=True, read_only=True)
 
     class Meta:
@@ -93,8 +94,6 @@ class StudentSerializer(serializers.ModelSerializer):
             "class_grade",
             "section",
             "section_name",
-            "term",
-            "term_name",
             "name",
             "roll_no",
             "otp",
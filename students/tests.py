@@ -1,3 +1,80 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from classes.models import Class
+from exam.models import ExamTerm
+from school.models import School
+from section.models import Section
+from students.models import Student, StudentMarks, StudentSubjectMarks
+from subject.models import Subject
+
+
+class StudentListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(
+            email="owner@example.com", name="Owner", tc=True, password="pass"
+        )
+        school = School.objects.create(name="Paging School", owner=owner)
+        term = ExamTerm.objects.create(school=school, name="First")
+        # Grade 6 created first, so ids and grades disagree on the order
+        for grade in (6, 5):
+            class_obj = Class.objects.create(school=school, grade=grade)
+            for name in ("A", "B"):
+                section = Section.objects.create(
+                    name=name, class_obj=class_obj, school=school
+                )
+                subject = Subject.objects.create(
+                    name="Math", class_obj=class_obj, section=section
+                )
+                for roll_no in (2, 1, 3):
+                    student = Student.objects.create(
+                        school=school,
+                        class_obj=class_obj,
+                        section=section,
+                        name=f"{grade}{name}{roll_no}",
+                        roll_no=roll_no,
+                    )
+                    marks = StudentMarks.objects.create(student=student, term=term)
+                    StudentSubjectMarks.objects.create(
+                        student_marks=marks, subject=subject, marks_obtained=roll_no
+                    )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_pages_follow_model_ordering(self):
+        names = []
+        url = "/students/list/?page_size=5"
+        while url:
+            data = self.client.get(url).data
+            self.assertIsNone(data["count"])
+            names += [s["name"] for s in data["students"]]
+            url = data["next"]
+
+        expected = [s.name for s in Student.objects.all()]
+        self.assertEqual(names, expected)
+        self.assertEqual(names[:4], ["5A1", "5A2", "5A3", "5B1"])
+
+    def test_page_queries_do_not_grow_with_page_size(self):
+        # page, marks, subject marks
+        with self.assertNumQueries(3):
+            small = self.client.get("/students/create/?page_size=2").data
+        with self.assertNumQueries(3):
+            large = self.client.get("/students/create/?page_size=12").data
+
+        self.assertEqual(len(large["students"]), 12)
+        self.assertIsNone(large["next"])
+        self.assertEqual(
+            small["students"][0]["marks"][0]["subject_marks"][0]["subject_name"], "Math"
+        )
+
+    def test_count_is_optional(self):
+        data = self.client.get("/students/list/?count=true&page_size=1").data
+        self.assertEqual(data["count"], 12)
+        self.assertNotIn("count=", data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/students/list/?cursor=nope")
+        self.assertEqual(response.status_code, 400)
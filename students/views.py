@@ -1,8 +1,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Prefetch, prefetch_related_objects
 
 from students.models import Student, StudentMarks, StudentSubjectMarks
+from students.pagination import StudentKeysetPagination
+from students.ranking import refresh_ranks_for, rescore_student_marks
 from students.serializers import (
     StudentSerializer,
     StudentMarksSerializer,
@@ -10,6 +13,26 @@ from students.serializers import (
 )
 
 
+def list_students(request):
+    """One keyset page of students with their marks and subject marks."""
+    paginator = StudentKeysetPagination()
+    page = paginator.paginate_queryset(
+        Student.objects.select_related("school", "class_obj", "section"), request
+    )
+    # Nested marks for this page only: one query per level, bounded by the
+    # page size
+    prefetch_related_objects(
+        page,
+        Prefetch("marks", queryset=StudentMarks.objects.order_by("term_id")),
+        Prefetch(
+            "marks__subject_marks",
+            queryset=StudentSubjectMarks.objects.select_related("subject"),
+        ),
+    )
+    serializer = StudentSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
 class StudentListCreateView(APIView):
     """
     GET: List all students
@@ -17,12 +40,7 @@ class StudentListCreateView(APIView):
     """
 
     def get(self, request, *args, **kwargs):
-        queryset = Student.objects.all().order_by("class_obj", "section", "roll_no")
-        serializer = StudentSerializer(queryset, many=True)
-        return Response(
-            {"count": queryset.count(), "students": serializer.data},
-            status=status.HTTP_200_OK,
-        )
+        return list_students(request)
 
     def post(self, request, *args, **kwargs):
         serializer = StudentSerializer(data=request.data)
@@ -44,12 +62,7 @@ class StudentListView(APIView):
     """
 
     def get(self, request, *args, **kwargs):
-        queryset = Student.objects.all().order_by("class_obj", "section", "roll_no")
-        serializer = StudentSerializer(queryset, many=True)
-        return Response(
-            {"count": queryset.count(), "students": serializer.data},
-            status=status.HTTP_200_OK,
-        )
+        return list_students(request)
 
 
 class StudentMarksListCreateView(APIView):
@@ -72,6 +85,8 @@ class StudentMarksListCreateView(APIView):
         serializer = StudentMarksSerializer(data=request.data)
         if serializer.is_valid():
             student_marks = serializer.save()
+            refresh_ranks_for([student_marks])
+            student_marks.refresh_from_db(fields=["rank"])
             return Response(
                 {
                     "message": "Student marks created successfully",
@@ -104,6 +119,9 @@ class StudentSubjectMarksListCreateView(APIView):
         serializer = StudentSubjectMarksSerializer(data=request.data)
         if serializer.is_valid():
             subject_mark = serializer.save()
+            # Keep the scores and the group's ranks in step with the new mark
+            rescore_student_marks(subject_mark.student_marks)
+            refresh_ranks_for([subject_mark.student_marks])
             return Response(
                 {
                     "message": "Student subject marks created successfully",
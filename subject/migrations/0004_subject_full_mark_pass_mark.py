@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subject', '0003_subject_section'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='full_mark',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='pass_mark',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
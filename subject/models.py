@@ -16,6 +16,10 @@ class Subject(models.Model):
         blank=True,  # allow subjects without section
     )
 
+    # Marking of the subject; empty uses the marks given with the import
+    full_mark = models.FloatField(blank=True, null=True)
+    pass_mark = models.FloatField(blank=True, null=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
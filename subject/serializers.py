@@ -27,6 +27,8 @@ class SubjectSerializer(serializers.ModelSerializer):
             "section",
             "section_name",
             "school_name",
+            "full_mark",
+            "pass_mark",
             "created_at"
         ]
         read_only_fields = ["id", "class_name", "section_name", "school_name", "created_at"]
@@ -48,6 +50,13 @@ class SubjectSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 "section": "Section does not belong to the same class as the selected class."
             })
+
+        full_mark = data.get("full_mark")
+        pass_mark = data.get("pass_mark")
+        if full_mark is not None and pass_mark is not None and pass_mark > full_mark:
+            raise serializers.ValidationError({
+                "pass_mark": "Pass mark cannot be higher than the full mark."
+            })
         return data
 
     def create(self, validated_data):
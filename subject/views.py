@@ -8,6 +8,9 @@ from django.shortcuts import get_object_or_404
 from subject.models import Subject
 from classes.models import Class
 from .renderers import UserRenderer
+from django.db.models import F
+from djangoauthapi.cache import cached_for_owner
+from djangoauthapi.ownership import owns_school
 
 
 class SubjectCreateView(APIView):
@@ -19,7 +22,7 @@ class SubjectCreateView(APIView):
         serializer.is_valid(raise_exception=True)
 
         class_obj = serializer.validated_data["class_obj"]
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {
                     "error": f"You do not own the school for class({class_obj.school.name})"
@@ -45,7 +48,7 @@ class SubjectListView(APIView):
         class_obj = get_object_or_404(Class, pk=class_id)
 
         # ✅ ownership check
-        if class_obj.school.owner != request.user:
+        if not owns_school(request.user, class_obj.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -76,13 +79,22 @@ class SubjectListByUserView(APIView):
 
     def get(self, request, format=None):
         # Fetch all subjects under schools owned by the logged-in user
-        subjects = Subject.objects.filter(class_obj__school__owner=request.user) \
-                                  .select_related("class_obj", "section", "class_obj__school")
-        serializer = SubjectSerializer(subjects, many=True)
+        subjects = cached_for_owner(
+            "subject-list",
+            request.user.id,
+            lambda: list(
+                SubjectSerializer(
+                    Subject.objects.filter(
+                        class_obj__school__owner=request.user.id
+                    ).select_related("class_obj", "section", "class_obj__school"),
+                    many=True,
+                ).data
+            ),
+        )
         return Response(
             {
                 "msg": "Subjects retrieved successfully",
-                "subjects": serializer.data,
+                "subjects": subjects,
             },
             status=status.HTTP_200_OK,
         )
@@ -94,13 +106,16 @@ class SubjectDeleteView(APIView):
 
     def delete(self, request, pk, format=None):
         try:
-            subject = Subject.objects.get(pk=pk)
+            # The school id comes with the subject, for the ownership check
+            subject = Subject.objects.annotate(
+                school_id=F("class_obj__school_id")
+            ).get(pk=pk)
         except Subject.DoesNotExist:
             return Response(
                 {"error": "Subject not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        if subject.class_obj.school.owner != request.user:
+        if not owns_school(request.user, subject.school_id):
             return Response(
                 {"error": "You do not own this school"},
                 status=status.HTTP_403_FORBIDDEN,